@@ -0,0 +1,53 @@
+# anim_curves.py
+"""预先算好的动画曲线表
+
+- 周期曲线（正弦浮动、收集时的左右晃动、无敌闪烁）：一个周期采样成固定格数的表，
+  相位就是“第几格”，按整数相位取值，超出一个周期自动取模
+- 一次性曲线（淡出、缓动）：从起点到终点采样 steps + 1 个点，按进度 [0, 1] 取最近的点
+
+表在导入时算好，每帧取值只是一次下标，不再调用 math.sin 或 random。
+"""
+import math
+
+# 正弦表一个周期的格数：振幅 5 像素时取整误差不到 0.03 像素
+SINE_STEPS = 1024
+# 一次性曲线的采样段数（能被收集动画的 10 帧和飘字的 30 帧整除，逐帧取值正好落在采样点上）
+RAMP_STEPS = 60
+
+
+class PeriodicCurve:
+    """周期曲线：func(t) 在 t ∈ [0, 1) 上均匀采样 steps 格"""
+
+    def __init__(self, func, steps):
+        self.steps = steps
+        self.values = tuple(func(i / steps) for i in range(steps))
+
+    def sample(self, phase):
+        """按相位取值（浮点相位截成整数格）"""
+        return self.values[int(phase) % self.steps]
+
+
+class RampCurve:
+    """一次性曲线：func(t) 在 t ∈ [0, 1] 上均匀采样 steps + 1 个点"""
+
+    def __init__(self, func, steps=RAMP_STEPS):
+        self.steps = steps
+        self.values = tuple(func(i / steps) for i in range(steps + 1))
+
+    def at(self, progress):
+        """按进度取值，超出 [0, 1] 的取两端"""
+        index = round(progress * self.steps)
+        return self.values[min(max(index, 0), self.steps)]
+
+
+# 一个周期的正弦（金币上下浮动）
+SINE = PeriodicCurve(lambda t: math.sin(2 * math.pi * t), SINE_STEPS)
+# 收集动画的左右晃动：每帧 -1/0/1 像素，一个周期 8 帧
+COIN_WOBBLE = PeriodicCurve(lambda t: round(math.sin(2 * math.pi * t)), 8)
+# 无敌闪烁：每 10 帧里前 5 帧不画
+INVINCIBLE_HIDDEN = PeriodicCurve(lambda t: t < 0.5, 10)
+
+# 1 淡到 0（收集动画、飘字的透明度）
+FADE_OUT = RampCurve(lambda t: 1.0 - t)
+# 先快后慢（飘字上升）
+EASE_OUT = RampCurve(lambda t: 1.0 - (1.0 - t) ** 2)
@@ -0,0 +1,146 @@
+# asset_manager.py
+"""图片资源管理器
+
+所有模块通过同一个 AssetManager 加载图片：
+- 解码、转换为显示格式、缩放后的 Surface 按 (路径, 尺寸, 是否透明) 缓存
+  （原图很大，只保留缩放后的结果）
+- 挂载纹理图集后，图集里有的 (路径, 尺寸) 直接返回图集的子 Surface
+- 目录列表、文件是否存在的结果也会缓存
+- 启动时按 PRELOAD_ASSETS 预加载，游戏进行中不再读盘
+
+disk_reads 统计真正访问磁盘的次数，gameplay_reads 统计其中发生在游戏帧内的次数
+（正常情况下应该一直是 0）。
+"""
+import fnmatch
+import os
+
+import pygame
+
+# 启动时预加载的资源：(路径, 尺寸或 None, 是否保留透明通道)
+PRELOAD_ASSETS = [
+    # 菜单角色图标
+    ('gif/nick.png', (80, 80), True),
+    ('gif/judy.png', (80, 80), True),
+    # 玩家
+    ('gif/nick.png', (50, 50), True),
+    ('gif/judy.png', (50, 50), True),
+    ('image/player_shoot.png', (50, 50), True),
+    # 障碍物（生成时再从 90x90 缩放到实际尺寸）
+    ('image/ob1.png', (90, 90), True),
+    ('image/ob2.png', (90, 90), True),
+    ('image/ob3.png', (90, 90), True),
+]
+
+# 启动时预先读取的目录列表
+PRELOAD_FOLDERS = ['gif']
+
+
+class AssetManager:
+    def __init__(self):
+        self.surfaces = {}    # (path, size, alpha) -> 缩放后的图
+        self.atlas = None
+        self.listings = {}    # folder -> 文件名列表
+        self.existence = {}   # path -> bool
+        self.missing = []
+
+        # 统计
+        self.disk_reads = 0
+        self.gameplay_reads = 0
+        self.cache_hits = 0
+        self.in_gameplay = False
+
+    # ==================== 文件系统 ====================
+    def _record_read(self):
+        self.disk_reads += 1
+        if self.in_gameplay:
+            self.gameplay_reads += 1
+
+    def exists(self, path):
+        """os.path.exists 的缓存版本"""
+        result = self.existence.get(path)
+        if result is None:
+            self._record_read()
+            result = os.path.exists(path)
+            self.existence[path] = result
+        return result
+
+    def listdir(self, folder):
+        """os.listdir 的缓存版本（文件夹不存在时返回空列表）"""
+        files = self.listings.get(folder)
+        if files is None:
+            self._record_read()
+            files = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+            self.listings[folder] = files
+        return list(files)
+
+    def glob(self, folder, pattern):
+        """在缓存的目录列表中按通配符查找文件，返回完整路径"""
+        return [os.path.join(folder, name) for name in self.listdir(folder)
+                if fnmatch.fnmatch(name, pattern)]
+
+    # ==================== 图片 ====================
+    def load(self, path, size=None, alpha=True):
+        """加载图片（带缓存），失败时抛出异常，与 pygame.image.load 一致"""
+        size = tuple(size) if size else None
+        if self.atlas is not None and alpha:
+            surface = self.atlas.find(path, size)
+            if surface is not None:
+                self.cache_hits += 1
+                return surface
+
+        key = (path, size, alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.cache_hits += 1
+            return surface
+
+        surface = self.decode(path, size, alpha)
+        self.surfaces[key] = surface
+        return surface
+
+    def try_load(self, path, size=None, alpha=True):
+        """加载图片，文件不存在或加载失败时返回 None"""
+        if not path or not self.exists(path):
+            return None
+        try:
+            return self.load(path, size, alpha)
+        except (pygame.error, OSError) as e:
+            print(f"加载图片失败 {path}: {e}")
+            return None
+
+    def decode(self, path, size=None, alpha=True):
+        """从磁盘读取图片并缩放（不经过缓存）"""
+        self._record_read()
+        surface = pygame.image.load(path)
+        self.existence[path] = True
+        if size:
+            surface = pygame.transform.scale(surface, size)
+        # 没有显示窗口时（例如无界面模拟）无法转换格式，直接使用原图
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface
+
+    def attach_atlas(self, atlas):
+        """挂载纹理图集，之后图集中有的资源都从图集取"""
+        self.atlas = atlas
+
+    # ==================== 预加载与统计 ====================
+    def preload(self, entries=PRELOAD_ASSETS, folders=PRELOAD_FOLDERS):
+        """预加载资源列表，缺失的文件记录在 missing 中"""
+        for folder in folders:
+            self.listdir(folder)
+        for path, size, alpha in entries:
+            if self.try_load(path, size, alpha) is None and path not in self.missing:
+                self.missing.append(path)
+
+    def stats(self):
+        return {
+            "surfaces": len(self.surfaces),
+            "disk_reads": self.disk_reads,
+            "gameplay_reads": self.gameplay_reads,
+            "cache_hits": self.cache_hits,
+        }
+
+
+# 全局共享实例
+asset_manager = AssetManager()
@@ -0,0 +1,168 @@
+# background.py
+"""滚动背景图层
+
+背景图层加载后按行分析透明度，切成横向条带：
+- 整行完全透明的条带直接丢掉，不参与绘制
+- 整行完全不透明的条带用 convert() 转成不带透明通道的格式，按普通拷贝绘制
+- 其余条带保留 convert_alpha()，只有这部分需要逐像素混合
+
+整张图完全不透明的图层（例如远景）只剩一条不透明条带，绘制时不再做任何混合。
+
+ParallaxBackground 把任意多层叠成视差背景：每层的速度是滚动速度的一个比例，
+偏移量用浮点数累加（慢速层不会因为取整而跳格），绘制时每个条带按可见的
+每一段各做一次带 area 裁剪的 blit。
+"""
+import pygame
+
+from asset_manager import asset_manager
+
+# 高度小于这个值的条带并入相邻的混合条带，避免切出太多很窄的条带
+MIN_STRIP_HEIGHT = 8
+
+STRIP_EMPTY = "empty"
+STRIP_OPAQUE = "opaque"
+STRIP_ALPHA = "alpha"
+
+
+class BackgroundLayer:
+    """切好条带的一层背景"""
+
+    def __init__(self, surface):
+        self.width, self.height = surface.get_size()
+        # [(条带 Surface, 条带顶部 y, 条带类型)]
+        self.strips = []
+        for kind, top, bottom in self._find_bands(surface):
+            if kind == STRIP_EMPTY:
+                continue
+            strip = surface.subsurface((0, top, self.width, bottom - top)).copy()
+            if pygame.display.get_surface() is not None:
+                strip = strip.convert() if kind == STRIP_OPAQUE else strip.convert_alpha()
+            self.strips.append((strip, top, kind))
+
+        # 整层不透明且铺满时，绘制前不需要清屏
+        self.opaque = (len(self.strips) == 1 and self.strips[0][2] == STRIP_OPAQUE
+                       and self.strips[0][0].get_height() == self.height)
+
+    @staticmethod
+    def _classify_rows(surface):
+        """逐行判断：完全透明 / 完全不透明 / 需要混合"""
+        width, height = surface.get_size()
+        if not surface.get_flags() & pygame.SRCALPHA:
+            return [STRIP_OPAQUE] * height
+
+        visible = pygame.mask.from_surface(surface, 0)
+        opaque = pygame.mask.from_surface(surface, 254)
+        row = pygame.mask.Mask((width, 1), fill=True)
+        kinds = []
+        for y in range(height):
+            if visible.overlap_area(row, (0, y)) == 0:
+                kinds.append(STRIP_EMPTY)
+            elif opaque.overlap_area(row, (0, y)) == width:
+                kinds.append(STRIP_OPAQUE)
+            else:
+                kinds.append(STRIP_ALPHA)
+        return kinds
+
+    @classmethod
+    def _find_bands(cls, surface):
+        """把连续的同类行合并成条带，过窄的条带并入混合条带"""
+        bands = []
+        for y, kind in enumerate(cls._classify_rows(surface)):
+            if bands and bands[-1][0] == kind:
+                bands[-1][2] = y + 1
+            else:
+                bands.append([kind, y, y + 1])
+
+        # 只有一条时保持原样（例如整张不透明）
+        if len(bands) > 1:
+            for band in bands:
+                if band[2] - band[1] < MIN_STRIP_HEIGHT:
+                    band[0] = STRIP_ALPHA
+
+        merged = []
+        for band in bands:
+            if merged and merged[-1][0] == band[0]:
+                merged[-1][2] = band[2]
+            else:
+                merged.append(band)
+        return merged
+
+    def blended_pixels(self):
+        """每次绘制需要逐像素混合的像素数"""
+        return sum(s.get_width() * s.get_height() for s, _, kind in self.strips if kind == STRIP_ALPHA)
+
+    def copied_pixels(self):
+        """每次绘制直接拷贝的像素数"""
+        return sum(s.get_width() * s.get_height() for s, _, kind in self.strips if kind == STRIP_OPAQUE)
+
+    def draw(self, screen, x):
+        """把整层画在横坐标 x 处"""
+        for strip, top, _ in self.strips:
+            screen.blit(strip, (x, top))
+
+    def draw_scrolled(self, screen, offset, view_width):
+        """横向循环平铺绘制：offset 是图层向左滚过的像素数，只画屏幕内可见的部分"""
+        start_x = int(offset) % self.width
+        for strip, top, _ in self.strips:
+            height = strip.get_height()
+            dest_x, src_x = 0, start_x
+            while dest_x < view_width:
+                width = min(self.width - src_x, view_width - dest_x)
+                screen.blit(strip, (dest_x, top), (src_x, 0, width, height))
+                dest_x += width
+                src_x = 0
+
+
+class ParallaxLayer:
+    """视差背景中的一层"""
+
+    def __init__(self, name, layer, speed_factor):
+        self.name = name
+        self.layer = layer
+        self.speed_factor = speed_factor  # 相对滚动速度的比例，1.0 与地面同速
+        self.offset = 0.0
+        self.prev_offset = 0.0  # 上一步的偏移，绘制时插值
+
+
+class ParallaxBackground:
+    """多层视差背景，先添加的层在最底下"""
+
+    def __init__(self, view_width=800, clear_color=(0, 0, 0)):
+        self.view_width = view_width
+        self.clear_color = clear_color
+        self.layers = []
+
+    def add_layer(self, name, layer, speed_factor):
+        self.layers.append(ParallaxLayer(name, layer, speed_factor))
+
+    def reset(self):
+        for parallax_layer in self.layers:
+            parallax_layer.offset = parallax_layer.prev_offset = 0.0
+
+    def update(self, scroll_speed, dt=1.0):
+        """按滚动速度推进每一层（dt 以 60 帧/秒的一帧为单位）"""
+        for parallax_layer in self.layers:
+            parallax_layer.prev_offset = parallax_layer.offset
+            step = scroll_speed * parallax_layer.speed_factor * dt
+            parallax_layer.offset = (parallax_layer.offset + step) % parallax_layer.layer.width
+
+    def draw(self, screen, only=None, alpha=1.0):
+        """绘制所有层；only 给出层名时只画这些层（例如战斗界面只画静止的近景）
+
+        alpha 是上一步到当前位置之间的插值系数。
+        """
+        layers = [l for l in self.layers if only is None or l.name in only]
+        # 最底层不透明且铺满时会整屏覆盖，不用清屏
+        if not layers or not layers[0].layer.opaque:
+            screen.fill(self.clear_color)
+        for parallax_layer in layers:
+            # 偏移在图层宽度处回绕，按回绕后的差值插值
+            width = parallax_layer.layer.width
+            step = (parallax_layer.offset - parallax_layer.prev_offset) % width
+            offset = parallax_layer.prev_offset + step * alpha
+            parallax_layer.layer.draw_scrolled(screen, offset, self.view_width)
+
+
+def load_background_layer(path, size, alpha=True):
+    """加载一层背景并切成条带"""
+    return BackgroundLayer(asset_manager.load(path, size, alpha=alpha))
@@ -1,36 +1,79 @@
 import pygame
 
+from pool import ObjectPool
+from render_queue import LAYER_BULLETS, LAYER_ENEMIES
+from timestep import lerp
+
 
 class BattleBullet:
+    __slots__ = ("rect", "x", "prev_x", "speed", "direction", "image", "damage", "active")
+
     def __init__(self, x, y, speed, direction="right", image=None, damage=1):
         self.rect = pygame.Rect(x, y, 20, 10)
+        self.reset(x, y, speed, direction, image, damage)
+
+    def reset(self, x, y, speed, direction="right", image=None, damage=1):
+        """原地重新初始化（对象池复用时调用，见 pool.py）"""
+        self.rect.update(x, y, 20, 10)
+        # 浮点横坐标和上一步的横坐标（绘制时插值）
+        self.x = self.prev_x = float(x)
         self.speed = speed
         self.direction = direction
         self.image = image
         self.damage = damage
         self.active = True
 
-    def update(self):
+    def update(self, dt=1.0):
+        self.prev_x = self.x
         if self.direction == "right":
-            self.rect.x += self.speed
+            self.x += self.speed * dt
         else:
-            self.rect.x -= self.speed
+            self.x -= self.speed * dt
+        self.rect.x = round(self.x)
 
-        if self.rect.right < -50 or self.rect.left > 850:
+        # 飞出范围后再留一步：连续碰撞检测还要用这一步的移动过程（见 collision.py）
+        prev_x = round(self.prev_x)
+        if prev_x + self.rect.width < -50 or prev_x > 850:
             self.active = False
 
-    def draw(self, screen):
+    def prev_rect(self):
+        """上一步的矩形（连续碰撞检测用，见 collision.py）"""
+        return self.rect.move(round(self.prev_x) - self.rect.x, 0)
+
+    def draw_rect(self, alpha=1.0):
+        """在上一步和当前位置之间插值的绘制矩形"""
+        return self.rect.move(round(lerp(self.prev_x, self.x, alpha)) - self.rect.x, 0)
+
+    def draw(self, screen, alpha=1.0):
         if not self.active:
             return
         if self.image:
-            screen.blit(self.image, self.rect)
+            screen.blit(self.image, self.draw_rect(alpha))
         else:
-            color = (255, 230, 120) if self.direction == "right" else (255, 120, 120)
-            pygame.draw.rect(screen, color, self.rect)
+            self._draw_fallback(screen, self.draw_rect(alpha))
 
+    def enqueue(self, render_queue, layer=LAYER_BULLETS, alpha=1.0):
+        if not self.active:
+            return
+        rect = self.draw_rect(alpha)
+        if self.image:
+            render_queue.push(layer, self.image, rect.topleft)
+        else:
+            render_queue.push_draw(layer, lambda screen: self._draw_fallback(screen, rect))
+
+    def _draw_fallback(self, screen, rect):
+        color = (255, 230, 120) if self.direction == "right" else (255, 120, 120)
+        pygame.draw.rect(screen, color, rect)
+
+
+
+# 打怪子弹对象池（双方的子弹共用）
+battle_bullet_pool = ObjectPool(BattleBullet)
 
 
 class BattleMonster:
+    __slots__ = ("rect", "image", "health", "max_health", "fire_cooldown")
+
     def __init__(self, x, y, image=None, health=20):
         self.rect = pygame.Rect(x, y, 80, 80)
         self.image = image
@@ -42,9 +85,9 @@ class BattleMonster:
     def alive(self):
         return self.health > 0
 
-    def update(self):
+    def update(self, dt=1.0):
         if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1
+            self.fire_cooldown -= dt
 
     def take_hit(self, damage=1):
         self.health = max(0, self.health - damage)
@@ -60,7 +103,16 @@ class BattleMonster:
             screen.blit(self.image, self.rect)
         else:
             pygame.draw.rect(screen, (200, 100, 100), self.rect)
+        self._draw_health_bar(screen)
+
+    def enqueue(self, render_queue, layer=LAYER_ENEMIES):
+        if self.image:
+            render_queue.push(layer, self.image, self.rect.topleft)
+        else:
+            render_queue.push_draw(layer, lambda screen: pygame.draw.rect(screen, (200, 100, 100), self.rect))
+        render_queue.push_draw(layer, self._draw_health_bar)
 
+    def _draw_health_bar(self, screen):
         # health bar
         bar_width = self.rect.width
         health_ratio = self.health / self.max_health if self.max_health else 0
@@ -0,0 +1,6 @@
+"""性能基准脚本。
+
+在游戏目录（main.py 所在目录）下运行，例如::
+
+    python -m benchmarks.bench_coin_draw
+"""
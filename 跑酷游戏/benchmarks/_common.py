@@ -0,0 +1,35 @@
+"""基准脚本共用的初始化和计时工具。"""
+import os
+import time
+
+# 基准测试不需要真实窗口和声卡
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def init_headless(size=(800, 600)):
+    """切换到游戏目录（资源都是相对路径），初始化 pygame 并创建屏幕"""
+    os.chdir(GAME_DIR)
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+def time_per_call(func, repeat=200):
+    """返回 func 平均每次调用的耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def print_table(headers, rows):
+    """以固定宽度打印结果表格"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
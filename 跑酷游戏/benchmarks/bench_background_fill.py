@@ -0,0 +1,49 @@
+"""背景填充率基准：对比整张 convert_alpha() 图层和切成条带后的图层每帧绘制耗时。"""
+from benchmarks._common import init_headless, time_per_call, print_table
+
+from asset_manager import asset_manager
+from background import BackgroundLayer
+
+BG_PATHS = [
+    ("bg1", 'image/像素背景_远层.png'),
+    ("bg2", 'image/像素背景_中层.png'),
+    ("bg3", 'image/像素背景.png'),
+]
+SIZE = (800, 600)
+
+
+def main():
+    screen = init_headless()
+    full = {name: asset_manager.load(path, SIZE, alpha=True) for name, path in BG_PATHS}
+    layers = {name: BackgroundLayer(surface) for name, surface in full.items()}
+
+    rows = []
+    for name, _ in BG_PATHS:
+        layer = layers[name]
+        # 和游戏里一样，每层画两份
+        before_ms = time_per_call(lambda: (screen.blit(full[name], (-300, 0)), screen.blit(full[name], (500, 0))))
+        after_ms = time_per_call(lambda: (layer.draw(screen, -300), layer.draw(screen, 500)))
+        rows.append((name, len(layer.strips), layer.copied_pixels(), layer.blended_pixels(),
+                     f"{before_ms:.3f}", f"{after_ms:.3f}", f"{before_ms / after_ms:.1f}x"))
+
+    def draw_before():
+        screen.fill((0, 0, 0))
+        for name, _ in BG_PATHS:
+            screen.blit(full[name], (-300, 0))
+            screen.blit(full[name], (500, 0))
+
+    def draw_after():
+        if not layers["bg1"].opaque:
+            screen.fill((0, 0, 0))
+        for name, _ in BG_PATHS:
+            layers[name].draw(screen, -300)
+            layers[name].draw(screen, 500)
+
+    before_ms = time_per_call(draw_before)
+    after_ms = time_per_call(draw_after)
+    rows.append(("all", "", "", "", f"{before_ms:.3f}", f"{after_ms:.3f}", f"{before_ms / after_ms:.1f}x"))
+    print_table(("layer", "strips", "copied px", "blended px", "full alpha ms", "strips ms", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
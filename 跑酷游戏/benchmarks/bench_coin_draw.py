@@ -0,0 +1,40 @@
+"""金币绘制基准：对比每个金币每帧重新生成贴图（旧做法）和使用共享贴图缓存的单帧耗时。"""
+from benchmarks._common import init_headless, time_per_call, print_table
+
+from coin import Coin, CoinManager, CoinSpriteCache
+
+
+def build_manager(count):
+    manager = CoinManager()
+    for i in range(count):
+        coin = Coin(40 + i * 35 % 760, 220 + (i % 5) * 30, is_ground_coin=i % 2 == 0)
+        if i % 7 == 0:
+            coin.collect()
+            coin.collect_animation = i % coin.max_collect_animation
+        manager.coins.append(coin)
+    return manager
+
+
+def draw_rebuilding(manager, screen):
+    """旧做法：每个金币每帧都重新画一遍贴图"""
+    for coin in manager.coins:
+        sprite = CoinSpriteCache()._build_sprite(coin.size, coin.is_ground_coin, False)
+        screen.blit(sprite, coin.rect)
+
+
+def main():
+    screen = init_headless()
+    rows = []
+    for count in (0, 5, 10, 20, 40, 80):
+        manager = build_manager(count)
+        manager.draw(screen)  # 预热缓存
+
+        rebuild_ms = time_per_call(lambda: draw_rebuilding(manager, screen))
+        cached_ms = time_per_call(lambda: manager.draw(screen))
+        speedup = f"{rebuild_ms / cached_ms:.1f}x" if count else "-"
+        rows.append((count, f"{rebuild_ms:.3f}", f"{cached_ms:.3f}", speedup))
+    print_table(("coins", "rebuild ms/frame", "cached ms/frame", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""碰撞查询压力测试：几百个障碍物、金币、绵羊和子弹时，对比逐个扫描和按横坐标二分查询的单步耗时。
+
+spatial 的查询只给出候选，两种做法最后都要逐个做同样的精确判断。
+第二张表找 LINEAR_SCAN_MAX：每种实体多少个时二分开始比直接扫描快。
+"""
+from benchmarks._common import init_headless, time_per_call, print_table
+
+import pygame
+
+from coin import Coin, CoinManager
+from enemy import Bullet, EnemyManager, Monster
+from obstacle import Obstacle, ObstacleManager
+import spatial
+from spatial import query_rect, query_span
+
+PLAYER = pygame.Rect(100, 350, 50, 50)
+
+
+def build(count):
+    """每种实体 count 个，按横坐标从左到右铺开（和游戏里一样有序）"""
+    obstacles = ObstacleManager()
+    coins = CoinManager(obstacles)
+    enemies = EnemyManager()
+    for i in range(count):
+        obstacles.obstacles.append(Obstacle(i * 150, 330, 40 + i % 50, 70, 8, "image/ob1.png"))
+        coins.coins.append(Coin(i * 30, 220 + i % 5 * 30, is_ground_coin=i % 2 == 0))
+        enemies.monsters.append(Monster(i * 90, 340, "sheep"))
+        # 子弹飞在绵羊之间的空隙里：大部分子弹这一步不会命中，逐个扫描时每颗都要扫完所有绵羊
+        enemies.player_bullets.append(Bullet(i * 90 + 65, 370))
+    obstacles.max_width = max(o.rect.width for o in obstacles.obstacles)
+    coins.max_width = 25
+    coins.order_slack = 90
+    enemies.max_width = 60
+    enemies.max_attack_range = 40
+    return obstacles, coins, enemies
+
+
+def linear(obstacles, coins, enemies):
+    """原来的做法：每个查询都扫一遍整个列表"""
+    any(o.rect.colliderect(PLAYER) for o in obstacles.obstacles)
+    [c for c in coins.coins if not c.is_collected and c.check_collision(PLAYER)]
+    for bullet in enemies.player_bullets:
+        for monster in enemies.monsters:
+            if bullet.rect.colliderect(monster.rect) and monster.is_alive:
+                break
+    [m for m in enemies.monsters if abs(m.rect.centerx - PLAYER.centerx) <= m.attack_range]
+
+
+def ordered(obstacles, coins, enemies):
+    """按横坐标二分，只检查和查询区间重叠的实体"""
+    any(o.rect.colliderect(PLAYER) for o in query_rect(obstacles.obstacles, PLAYER, obstacles.max_width))
+    [c for c in query_rect(coins.coins, PLAYER, coins.max_width, coins.order_slack)
+     if not c.is_collected and c.check_collision(PLAYER)]
+    for bullet in enemies.player_bullets:
+        for monster in query_rect(enemies.monsters, bullet.rect, enemies.max_width):
+            if bullet.rect.colliderect(monster.rect) and monster.is_alive:
+                break
+    reach = enemies.max_attack_range
+    [m for m in query_span(enemies.monsters, PLAYER.centerx - reach, PLAYER.centerx + reach + 1,
+                           enemies.max_width)
+     if abs(m.rect.centerx - PLAYER.centerx) <= m.attack_range]
+
+
+def best_ms(func, repeat):
+    # 取几次里最快的一次，减少机器抖动的影响
+    return min(time_per_call(func, repeat=repeat) for _ in range(5))
+
+
+def ordered_with_threshold(managers, threshold, repeat):
+    """LINEAR_SCAN_MAX 临时换成 threshold 时 ordered 的耗时"""
+    saved = spatial.LINEAR_SCAN_MAX
+    spatial.LINEAR_SCAN_MAX = threshold
+    try:
+        return best_ms(lambda: ordered(*managers), repeat)
+    finally:
+        spatial.LINEAR_SCAN_MAX = saved
+
+
+def main():
+    init_headless()
+    rows = []
+    for count in (10, 50, 100, 250, 500, 1000):
+        managers = build(count)
+        repeat = max(5, 2000 // count)
+        linear_ms = best_ms(lambda: linear(*managers), repeat)
+        ordered_ms = best_ms(lambda: ordered(*managers), repeat)
+        rows.append((count, f"{linear_ms * 1000:.1f}", f"{ordered_ms * 1000:.1f}", f"{linear_ms / ordered_ms:.2f}x"))
+    print_table(("entities each", "linear us/tick", "ordered us/tick", "speedup"), rows)
+    print()
+
+    rows = []
+    for count in (4, 8, 12, 16, 20, 24, 28, 32, 40, 48, 64):
+        managers = build(count)
+        repeat = max(20, 4000 // count)
+        scan_ms = ordered_with_threshold(managers, count, repeat)
+        bisect_ms = ordered_with_threshold(managers, -1, repeat)
+        rows.append((count, f"{scan_ms * 1000:.1f}", f"{bisect_ms * 1000:.1f}", "bisect" if bisect_ms < scan_ms else "scan"))
+    print_table(("entities each", "scan us/tick", "bisect us/tick", "faster"), rows)
+    print(f"LINEAR_SCAN_MAX = {spatial.LINEAR_SCAN_MAX}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""实体过期基准：对比 list[:] 复制 + list.remove 和现在的 spatial.drop_expired 在不同实体数量下每帧的耗时。
+
+现在的做法和 ObstacleManager.step / CoinManager.step / EnemyManager.drop_monsters 相同：
+移动时收集过期的实体，有过期的才交给 drop_expired 原地去掉。
+
+每帧所有实体左移 step 格、队尾补上同样数量的新实体，队头正好有 step 个滚出去：
+- front：每帧 1 个从队头过期（障碍物、绵羊、子弹的常见情况）
+- +middle：另有 1 个中间的实体过期（相当于收集动画播完的金币）
+- burst：每帧 5% 的实体同时从队头过期（大量实体同时滚出屏幕）
+表中是平摊到每个实体的纳秒数：过期开销不随实体数量增长时，这一列应该基本不变。
+"""
+from benchmarks._common import time_per_call, print_table
+
+from spatial import drop_expired, is_active
+
+COUNTS = (50, 100, 250, 500, 1000, 2000, 5000, 10000)
+
+
+class Dot:
+    def __init__(self, x):
+        self.x = x
+        self.is_active = True
+
+    def move(self, step):
+        self.x -= step
+        if self.x < 0:
+            self.is_active = False
+
+
+def spawn(entities, count, step, middle):
+    for i in range(step):
+        entities.append(Dot(count - step + i))
+    if middle:
+        entities[len(entities) // 2].is_active = False
+        entities.append(Dot(count))
+
+
+def remove_frame(entities, count, step, middle):
+    """旧做法：复制一份再逐个 list.remove"""
+    spawn(entities, count, step, middle)
+    for entity in entities[:]:
+        entity.move(step)
+        if not entity.is_active:
+            entities.remove(entity)
+
+
+def drop_frame(entities, count, step, middle):
+    """现在的做法"""
+    spawn(entities, count, step, middle)
+    expired = []
+    for entity in entities:
+        entity.move(step)
+        if not entity.is_active:
+            expired.append(entity)
+    if expired:
+        drop_expired(entities, expired, is_active)
+
+
+def ns_per_entity(frame, count, step, middle):
+    entities = [Dot(x) for x in range(count)]
+    repeat = max(20, 200000 // count)
+    # 取几次里最快的一次，减少机器抖动的影响
+    best = min(time_per_call(lambda: frame(entities, count, step, middle), repeat=repeat) for _ in range(3))
+    return best * 1e6 / count
+
+
+def main():
+    rows = []
+    for count in COUNTS:
+        row = [count]
+        for step, middle in ((1, False), (1, True), (max(1, count // 20), False)):
+            row += [f"{ns_per_entity(remove_frame, count, step, middle):.0f}",
+                    f"{ns_per_entity(drop_frame, count, step, middle):.0f}"]
+        rows.append(row)
+    print_table(("entities", "front remove ns", "front drop ns", "+middle remove ns", "+middle drop ns",
+                 "burst remove ns", "burst drop ns"), rows)
+
+
+if __name__ == "__main__":
+    main()
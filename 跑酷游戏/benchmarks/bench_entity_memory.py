@@ -0,0 +1,87 @@
+"""实体内存基准：用 tracemalloc 对比 __slots__ 和普通 __dict__ 实体每个实例占的字节数，以及读写属性的速度。
+
+"dict" 一列是把同一个类的方法原样复制到一个没有 __slots__ 的类上（也就是加 __slots__ 之前的样子）。
+每个实例的字节数包括它的 pygame.Rect。
+"""
+import tracemalloc
+
+from benchmarks._common import time_per_call, print_table
+
+import pygame
+
+from battle_system import BattleBullet, BattleMonster
+from coin import Coin
+from enemy import Bullet, Monster
+from obstacle import Obstacle
+
+COUNT = 2000
+
+SHEEP = pygame.Surface((60, 60))
+ENTITIES = (
+    (Coin, lambda cls, i: cls(i, 220, is_ground_coin=i % 2 == 0)),
+    (Obstacle, lambda cls, i: cls(i, 330, 50, 70, 8, "image/ob1.png")),
+    (Monster, lambda cls, i: cls(i, 340, "sheep", SHEEP)),
+    (Bullet, lambda cls, i: cls(i, 370)),
+    (BattleBullet, lambda cls, i: cls(i, 370, 12)),
+    (BattleMonster, lambda cls, i: cls(i, 320)),
+)
+
+
+def unslotted(cls):
+    """同样的方法、不带 __slots__ 的类（实例用 __dict__ 存属性）"""
+    slots = set(cls.__slots__)
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in slots and name not in ("__slots__", "__dict__", "__weakref__")}
+    return type(cls.__name__ + "Dict", cls.__bases__, namespace)
+
+
+def bytes_per_entity(cls, make):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = [make(cls, i) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # 扣掉存放实体的列表本身
+    return (size - entities.__sizeof__()) / COUNT
+
+
+def touch(entities):
+    """跑酷里最常见的访问：读写坐标"""
+    for entity in entities:
+        entity.prev_x = entity.x
+        entity.x = entity.x - 1.0
+
+
+def touch_health(entities):
+    """BattleMonster 没有浮点坐标，读写血量"""
+    for entity in entities:
+        entity.fire_cooldown = entity.health
+        entity.health = entity.health - 1
+
+
+def main():
+    rows = []
+    for cls, make in ENTITIES:
+        dict_cls = unslotted(cls)
+        dict_bytes = bytes_per_entity(dict_cls, make)
+        slot_bytes = bytes_per_entity(cls, make)
+
+        dict_entities = [make(dict_cls, i) for i in range(COUNT)]
+        slot_entities = [make(cls, i) for i in range(COUNT)]
+        access = touch if "x" in cls.__slots__ else touch_health
+        # 交替测几轮取最快的一次，减少机器抖动的影响
+        dict_ms = slot_ms = float("inf")
+        for _ in range(5):
+            dict_ms = min(dict_ms, time_per_call(lambda: access(dict_entities), repeat=50))
+            slot_ms = min(slot_ms, time_per_call(lambda: access(slot_entities), repeat=50))
+
+        rows.append((cls.__name__, len(cls.__slots__), f"{dict_bytes:.0f}", f"{slot_bytes:.0f}",
+                     f"{1 - slot_bytes / dict_bytes:.0%}",
+                     f"{dict_ms * 1e6 / COUNT:.0f}", f"{slot_ms * 1e6 / COUNT:.0f}"))
+    print_table(("entity", "attrs", "dict bytes", "slots bytes", "saved",
+                 "dict ns/touch", "slots ns/touch"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""数组存储基准：对比逐个对象和 entity_store 的整列计算在不同实体数量下每步的耗时。
+
+- step：障碍物/金币移动一步（金币一半是浮动的空中金币）
+- query：和玩家矩形的碰撞查询（对象版用 spatial.query_rect 的二分）
+表中是平摊到每个实体的纳秒数。整列计算每次调用有几微秒的固定开销，实体少时反而更慢。
+"""
+import random
+
+from benchmarks._common import time_per_call, print_table
+
+import pygame
+
+from coin import Coin
+from entity_store import CoinStore, ObstacleStore
+from obstacle import Obstacle
+from spatial import query_rect
+
+# 实体从很靠右的地方开始，测量期间不会有实体滚出屏幕被去掉
+OFFSET = 1000000
+PLAYER = pygame.Rect(OFFSET + 300, 250, 50, 50)
+
+
+def make_obstacles(count):
+    return [Obstacle(OFFSET + i * 40, 330, 40, 70) for i in range(count)]
+
+
+def make_coins(count):
+    rng = random.Random(0)
+    return [Coin(OFFSET + i * 30, 220 if i % 2 else 350, is_ground_coin=i % 2 == 0, rng=rng) for i in range(count)]
+
+
+def object_step(entities):
+    for entity in entities:
+        entity.move(1, 1.0)
+
+
+def ns_per_entity(func, count):
+    repeat = max(20, 100000 // count)
+    # 取几次里最快的一次，减少机器抖动的影响
+    return min(time_per_call(func, repeat=repeat) for _ in range(3)) * 1e6 / count
+
+
+def main():
+    rows = []
+    for count in (25, 50, 100, 250, 1000, 5000):
+        row = [count]
+        for make, store_class, max_width in ((make_obstacles, ObstacleStore, 40), (make_coins, CoinStore, 25)):
+            entities = make(count)
+            store = store_class()
+            store.extend(make(count))
+            row += [f"{ns_per_entity(lambda: object_step(entities), count):.0f}",
+                    f"{ns_per_entity(lambda: store.step(1, 1.0), count):.0f}"]
+            if store_class is CoinStore:
+                row += [f"{ns_per_entity(lambda: query_rect(entities, PLAYER, max_width), count):.0f}",
+                        f"{ns_per_entity(lambda: store.overlapping(PLAYER.left, PLAYER.right, PLAYER.top, PLAYER.bottom), count):.0f}"]
+        rows.append(row)
+    print_table(("entities", "obstacle obj ns", "obstacle store ns", "coin obj ns", "coin store ns",
+                 "query obj ns", "query store ns"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""HUD 合成基准：游戏里的 HUD 布局下，全部区域重绘和只有分数变化时每帧的耗时与重绘区域数。
+
+区域按 hud.game_hud_layout 排开（和 Game.create_hud 相同的字体），每个区域画一段文字。
+先检查布局里没有互相重叠的区域，再确认只改分数时 dirty_count 一直是 1，不满足时退出码非 0。
+"""
+import sys
+
+from benchmarks._common import init_headless, time_per_call, print_table
+
+from font_cache import get_font, render_text
+from hud import HudCompositor, game_hud_layout
+
+FRAMES = 300
+
+
+def build_hud():
+    medium_font, small_font, ui_font = get_font(36), get_font(24), get_font(28)
+    layout = game_hud_layout(medium_font.get_height(), small_font.get_height(), ui_font.get_height())
+    hud = HudCompositor((800, max(bounds.bottom for _, bounds in layout)))
+    for name, bounds in layout:
+        hud.add_region(name, bounds)
+    fonts = {"score": medium_font, "high_score": medium_font, "health": small_font,
+             "coins": ui_font, "effects": small_font}
+    return hud, fonts
+
+
+def submit(hud, fonts, values):
+    for name, value in values.items():
+        font = fonts[name]
+        hud.update(name, value,
+                   lambda surface, bounds, font=font, value=value:
+                   surface.blit(render_text(font, f"{value}", (0, 0, 0)), bounds))
+
+
+def overlapping_pairs(hud):
+    regions = hud.regions
+    return [(a.name, b.name) for i, a in enumerate(regions) for b in regions[i + 1:]
+            if a.bounds.colliderect(b.bounds)]
+
+
+def main():
+    screen = init_headless()
+    hud, fonts = build_hud()
+    values = {"score": 0, "high_score": 1234, "health": (100, 100), "coins": 0, "effects": ()}
+
+    overlaps = overlapping_pairs(hud)
+    print("regions:", ", ".join(f"{r.name}{tuple(r.bounds)}" for r in hud.regions))
+    print("overlapping pairs:", overlaps or "none")
+
+    submit(hud, fonts, values)
+    hud.draw(screen)
+
+    def full_redraw():
+        hud.invalidate()
+        hud.draw(screen)
+
+    dirty_counts = set()
+
+    def score_only():
+        values["score"] += 1
+        submit(hud, fonts, values)
+        hud.draw(screen)
+        dirty_counts.add(hud.dirty_count)
+
+    rows = [("all regions", f"{time_per_call(full_redraw, FRAMES):.3f}", len(hud.regions)),
+            ("score only", f"{time_per_call(score_only, FRAMES):.3f}", "/".join(map(str, sorted(dirty_counts))))]
+    print_table(("change", "ms/frame", "dirty_count"), rows)
+
+    if overlaps or dirty_counts != {1}:
+        sys.exit("HUD regions overlap or a score-only change redrew more than one region")
+
+
+if __name__ == "__main__":
+    main()
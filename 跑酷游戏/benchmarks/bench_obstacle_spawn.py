@@ -0,0 +1,51 @@
+"""障碍物生成延迟基准：对比冷缓存（读盘解码+缩放）、只缩放、热缓存三种情况。"""
+import random
+import time
+
+from benchmarks._common import init_headless, print_table
+
+from asset_manager import asset_manager
+from obstacle import ObstacleManager, obstacle_surface_cache
+
+
+def measure(manager, before_spawn, repeat=300):
+    """返回 (平均, 最大) 单次生成并取到贴图的耗时（微秒）"""
+    samples = []
+    for _ in range(repeat):
+        before_spawn()
+        start = time.perf_counter()
+        obstacle = manager.spawn_obstacle()
+        if obstacle:
+            obstacle.image  # 贴图在第一次绘制时才取，这里一并计入
+        samples.append((time.perf_counter() - start) * 1e6)
+    return sum(samples) / len(samples), max(samples)
+
+
+def clear_all():
+    asset_manager.surfaces.clear()
+    obstacle_surface_cache.clear()
+
+
+def main():
+    init_headless()
+    rows = []
+    for step in (1, 5, 10):
+        manager = ObstacleManager(size_step=step, rng=random.Random(0))
+        cold = measure(manager, clear_all)
+        scale = measure(manager, obstacle_surface_cache.clear)
+
+        # 热缓存：先把这个步长下可能出现的尺寸都生成一遍
+        obstacle_surface_cache.hits = obstacle_surface_cache.misses = 0
+        for _ in range(3000):
+            manager.spawn_obstacle().image
+        warm = measure(manager, lambda: None)
+        rows.append((step, len(obstacle_surface_cache.surfaces),
+                     f"{cold[0]:.1f}/{cold[1]:.1f}", f"{scale[0]:.1f}/{scale[1]:.1f}",
+                     f"{warm[0]:.1f}/{warm[1]:.1f}"))
+        obstacle_surface_cache.clear()
+    print("每次生成耗时 平均/最大（微秒）")
+    print_table(("size_step", "cached sizes", "cold (decode)", "scale only", "warm"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""粒子基准：对比旧的字典列表星星（逐个更新、每帧新建 Surface）和粒子系统在不同粒子数下的单帧耗时。"""
+import random
+
+from benchmarks._common import init_headless, time_per_call, print_table
+
+import pygame
+
+from particles import ParticleSystem, STAR_COLORS
+
+
+def make_stars(count):
+    return [{
+        'x': random.randint(0, 800), 'y': random.randint(0, 600),
+        'size': random.randint(3, 8), 'speed': random.uniform(1.0, 3.0),
+        'alpha': random.randint(6, 255), 'color': random.choice(STAR_COLORS),
+    } for _ in range(count)]
+
+
+def dict_frame(stars, screen):
+    """旧做法：update_star_effect + draw_star_effect"""
+    for star in stars[:]:
+        star['x'] -= star['speed']
+        star['alpha'] -= 5
+        if star['alpha'] <= 0:
+            stars.remove(star)
+    for star in stars:
+        star_surface = pygame.Surface((star['size'] * 2, star['size'] * 2), pygame.SRCALPHA)
+        pygame.draw.circle(star_surface, (*star['color'], star['alpha']),
+                           (star['size'], star['size']), star['size'])
+        screen.blit(star_surface, (star['x'], star['y']))
+
+
+def fill_system(system, stars):
+    system.clear()
+    system.emit([s['x'] for s in stars], [s['y'] for s in stars], [-s['speed'] for s in stars], 0.0,
+                [s['size'] for s in stars], [s['color'] for s in stars])
+    system.alpha[:len(stars)] = [s['alpha'] for s in stars]
+
+
+def main():
+    screen = init_headless()
+    rows = []
+    for count in (10, 50, 100, 250, 500, 1000):
+        random.seed(count)
+        stars = make_stars(count)
+
+        # 每次计时前恢复同样的粒子，避免淡出后数量越来越少
+        def old():
+            dict_frame([dict(s) for s in stars], screen)
+
+        system = ParticleSystem(capacity=1024)
+
+        def new():
+            fill_system(system, stars)
+            system.update()
+            system.draw(screen)
+
+        new()  # 预热贴图缓存
+        copy_ms = time_per_call(lambda: [dict(s) for s in stars], repeat=50)
+        fill_ms = time_per_call(lambda: fill_system(system, stars), repeat=50)
+        old_ms = time_per_call(old, repeat=50) - copy_ms
+        new_ms = time_per_call(new, repeat=50) - fill_ms
+        rows.append((count, f"{old_ms:.3f}", f"{new_ms:.3f}", f"{old_ms / new_ms:.1f}x"))
+    print_table(("particles", "dict list ms/frame", "particle system ms/frame", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
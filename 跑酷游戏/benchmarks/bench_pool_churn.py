@@ -0,0 +1,61 @@
+"""对象池统计：连着玩几局长局，每局结束后打印各个对象池的 stats()。
+
+每局新建一个 World（生命上限调高，一局不会提前结束），每 JUMP_EVERY 帧起跳一次、一直按着射击，
+跑完 TICKS 步后 release。对象池是所有 World 共用的，第一局之后 created 应该基本不再增长
+（新实体都从池里复用），也就是分配的对象数不随游戏时长增长；in_use 在每局 release 之后应该是 0。
+不满足时退出码非 0。
+"""
+import sys
+import time
+
+from benchmarks._common import init_headless, print_table
+
+from battle_system import battle_bullet_pool
+from coin import coin_pool
+from enemy import bullet_pool
+from obstacle import obstacle_pool
+from world import TickInput, World
+
+SESSIONS = 3
+TICKS = 60000
+JUMP_EVERY = 40
+POOLS = (("obstacle_pool", obstacle_pool), ("coin_pool", coin_pool), ("bullet_pool", bullet_pool),
+         ("battle_bullet_pool", battle_bullet_pool))
+
+JUMP = TickInput(jump=True, shoot=True)
+SHOOT = TickInput(shoot=True)
+
+
+def play_session(seed):
+    world = World(seed=seed, max_health=10 ** 6)
+    for tick in range(TICKS):
+        world.step(JUMP if tick % JUMP_EVERY == 0 else SHOOT)
+    world.release()
+
+
+def main():
+    init_headless()
+    rows = []
+    first_created = None
+    failed = False
+    for session in range(SESSIONS):
+        start = time.perf_counter()
+        play_session(session)
+        seconds = time.perf_counter() - start
+        for name, pool in POOLS:
+            stats = pool.stats()
+            rows.append((session + 1, f"{(session + 1) * TICKS}", f"{seconds:.1f}", name, stats["created"],
+                         stats["reused"], stats["in_use"], stats["free"]))
+            failed |= stats["in_use"] != 0
+        created = [pool.created for _, pool in POOLS]
+        if first_created is None:
+            first_created = created
+        failed |= created != first_created
+    print_table(("session", "total ticks", "seconds", "pool", "created", "reused", "in_use", "free"), rows)
+
+    if failed:
+        sys.exit("pools kept allocating after the first session or objects were not released")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""步频一致性检查：同样的局面分别按 60/120/240Hz 模拟，结果应该完全相同，不同时退出码非 0。
+
+- obstacle damage：玩家站在地上，一个障碍物从右边滚过去（不生成别的实体），
+  统计扣掉的血量和受击事件数；每种宽度单独跑一次
+- full run：同一个种子正常玩一局（每 JUMP_EVERY 帧起跳一次、一直按着射击，
+  战斗分数线调低好让每局都打到怪），比较受击次数、扣血、金币和存活到第几帧
+"""
+import math
+import sys
+
+from benchmarks._common import init_headless, print_table
+
+from obstacle import Obstacle
+from timestep import BASE_TICK_RATE
+from world import TickInput, World
+
+TICK_RATES = (60, 120, 240)
+WIDTHS = (10, 40, 50, 54, 65, 90)
+IDLE = TickInput()
+
+SEEDS = range(8)
+RUN_FRAMES = 3600
+JUMP_EVERY = 40
+BATTLE_THRESHOLDS = [150, 400, 800]
+
+
+def obstacle_damage(width, rate):
+    """width 宽的障碍物滚过站着的玩家，返回 (扣血, 受击事件数)"""
+    world = World(seed=0)
+    world.obstacle_manager.spawn_interval = math.inf
+    world.coin_manager.spawn_interval = math.inf
+    world.enemy_manager.spawn_interval = math.inf
+    world.obstacle_manager.obstacles.append(Obstacle(800, 330, width, 70))
+    world.obstacle_manager.max_width = width
+
+    dt = BASE_TICK_RATE / rate
+    hits = 0
+    # 障碍物 8 像素/帧，150 帧后早已滚出屏幕
+    for _ in range(150 * rate // BASE_TICK_RATE):
+        hits += sum(event[0] == "hit" for event in world.step(IDLE, dt))
+    return world.max_health - world.player_health, hits
+
+
+def full_run(seed, rate):
+    """按 rate 的步频玩 RUN_FRAMES 帧，返回 (受击次数, 扣血, 金币, 存活帧数)"""
+    world = World(seed=seed)
+    world.battle_thresholds = list(BATTLE_THRESHOLDS)
+    ticks_per_frame = rate // BASE_TICK_RATE
+    dt = BASE_TICK_RATE / rate
+    for tick in range(RUN_FRAMES * ticks_per_frame):
+        frame, phase = divmod(tick, ticks_per_frame)
+        # 起跳只在一帧的第一步按下，和 60Hz 下按一次的效果相同
+        world.step(TickInput(jump=phase == 0 and frame % JUMP_EVERY == 0, shoot=True), dt)
+        if world.state == "game_over":
+            break
+    return (world.hits_taken, world.max_health - world.player_health, world.current_game_coins,
+            round(world.time))
+
+
+def main():
+    init_headless()
+    rows = []
+    failed = False
+    for width in WIDTHS:
+        results = [obstacle_damage(width, rate) for rate in TICK_RATES]
+        same = len(set(results)) == 1
+        failed |= not same
+        rows.append((width, *(f"{damage} HP / {hits} hits" for damage, hits in results), "ok" if same else "MISMATCH"))
+    print_table(("obstacle width", *(f"{rate} Hz" for rate in TICK_RATES), "result"), rows)
+    print()
+
+    rows = []
+    for seed in SEEDS:
+        results = [full_run(seed, rate) for rate in TICK_RATES]
+        same = len(set(results)) == 1
+        failed |= not same
+        rows.append((seed, *(f"{hits} hits / {lost} HP / {coins} coins / {frames} f" for hits, lost, coins, frames in results),
+                     "ok" if same else "MISMATCH"))
+    print_table(("seed", *(f"{rate} Hz" for rate in TICK_RATES), "result"), rows)
+
+    if failed:
+        sys.exit("gameplay outcome depends on the tick rate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""穿透测试矩阵：不同速度和步频下，离散检测和连续检测（collision.py）漏掉碰撞的比例。
+
+- obstacle：10 像素宽的薄障碍物滚过站在地上的玩家（ObstacleManager.check_collisions，
+  不给 / 给出玩家上一步的矩形）
+- bullet：玩家子弹迎面飞向滚动过来的绵羊（Bullet/Monster 的 colliderect 和 swept_hit）
+每种组合从 PHASES 个不同的起点各跑一次（起点错开不到一步的距离），统计没有检测到碰撞的次数，
+连续检测漏掉任何一次时退出码非 0。最后一张表是单次检测的耗时。
+不同步频下整局结果是否一致见 benchmarks/bench_tick_rates.py。
+"""
+import math
+import sys
+
+from benchmarks._common import init_headless, time_per_call, print_table
+
+import pygame
+
+from collision import swept_hit
+from enemy import Bullet, Monster
+from obstacle import Obstacle, ObstacleManager
+
+PHASES = 20
+SPEEDS = (8, 16, 32, 64)
+TICK_RATES = (60, 30, 15, 10)
+
+PLAYER = pygame.Rect(100, 350, 50, 50)  # 站在地上的玩家（地面 y=400）
+SHEEP = pygame.Surface((60, 60))
+
+
+def obstacle_pass(speed, dt, offset, swept):
+    """薄障碍物从右边滚过玩家，返回是否检测到碰撞"""
+    manager = ObstacleManager()
+    manager.spawn_interval = math.inf  # 不生成别的障碍物
+    manager.obstacles.append(Obstacle(400 + offset, 330, 10, 70))
+    while manager.obstacles:
+        manager.update(speed, None, dt)
+        if manager.check_collisions(PLAYER, PLAYER if swept else None):
+            return True
+    return False
+
+
+def bullet_pass(speed, dt, offset, swept):
+    """子弹以 speed 向右飞、绵羊以滚动速度 8 向左来，返回是否检测到碰撞"""
+    bullet = Bullet(PLAYER.right, PLAYER.centery)
+    bullet.speed = speed
+    monster = Monster(600 + offset, 340, "sheep", SHEEP)
+    while bullet.is_active and monster.rect.right > 0:
+        bullet.update(dt)
+        monster.update(8, dt)
+        if swept:
+            hit = swept_hit(bullet.prev_rect(), bullet.rect, monster.prev_rect(), monster.rect)
+        else:
+            hit = bullet.rect.colliderect(monster.rect)
+        if hit:
+            return True
+    return False
+
+
+def missed(scenario, speed, dt, swept):
+    """PHASES 个起点里漏掉碰撞的次数"""
+    step = speed * dt
+    return sum(not scenario(speed, dt, step * phase / PHASES, swept) for phase in range(PHASES))
+
+
+def main():
+    init_headless()
+    rows = []
+    swept_missed = 0
+    for name, scenario in (("obstacle", obstacle_pass), ("bullet", bullet_pass)):
+        for speed in SPEEDS:
+            for rate in TICK_RATES:
+                dt = 60 / rate
+                swept = missed(scenario, speed, dt, True)
+                swept_missed += swept
+                rows.append((name, speed, f"{rate} Hz", f"{speed * dt:.0f}",
+                             f"{missed(scenario, speed, dt, False)}/{PHASES}", f"{swept}/{PHASES}"))
+    print_table(("scenario", "speed", "tick rate", "px/step", "discrete missed", "swept missed"), rows)
+    print()
+
+    obstacle = Obstacle(120, 330, 10, 70)
+    obstacle.move(8)
+    obstacle_prev = obstacle.prev_rect()
+    rows = [("colliderect", f"{time_per_call(lambda: PLAYER.colliderect(obstacle.rect), 100000) * 1e6:.0f}"),
+            ("swept_hit", f"{time_per_call(lambda: swept_hit(PLAYER, PLAYER, obstacle_prev, obstacle.rect), 100000) * 1e6:.0f}")]
+    print_table(("check", "ns/call"), rows)
+
+    if swept_missed:
+        sys.exit(f"swept collision missed {swept_missed} passes")
+
+
+if __name__ == "__main__":
+    main()
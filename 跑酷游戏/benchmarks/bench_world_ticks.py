@@ -0,0 +1,40 @@
+"""无界面模拟基准：不创建窗口、不初始化声卡，测量 World 每秒能推进多少步。"""
+import os
+import time
+
+from benchmarks._common import GAME_DIR, print_table
+
+from timestep import TICK_DT
+from world import TickInput, World
+
+JUMP = TickInput(jump=True, shoot=True)
+RUN = TickInput(shoot=True)
+
+
+def run(ticks, dt, seed=0):
+    """按固定的输入节奏推进 ticks 步（死亡后用下一个种子重开一局），返回 (耗时秒, 局数)"""
+    world = World(seed=seed)
+    rounds = 1
+    start = time.perf_counter()
+    for tick in range(ticks):
+        world.step(JUMP if tick % 40 == 0 else RUN, dt)
+        if world.state == "game_over":
+            world = World(seed=seed + rounds)
+            rounds += 1
+    return time.perf_counter() - start, rounds
+
+
+def main():
+    os.chdir(GAME_DIR)
+    rows = []
+    for dt, label in ((1.0, "60 Hz"), (TICK_DT, f"{round(60 / TICK_DT)} Hz")):
+        run(500, dt)  # 预热
+        ticks = 20000
+        elapsed, rounds = run(ticks, dt)
+        rows.append((label, ticks, rounds, f"{elapsed:.2f}", f"{ticks / elapsed:,.0f}",
+                     f"{ticks / elapsed * dt / 60:,.0f}x"))
+    print_table(("tick rate", "ticks", "rounds", "seconds", "ticks/s", "vs real time"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# checksum.py
+"""每步的世界状态校验和
+
+每推进一步，把各子系统的状态（位置、速度、计时器、分数、生命……）按固定顺序写进一个
+double 数组，算一次 CRC32。一局下来得到一串校验和，和录像放在一起（录像文件名 + ".sum"）。
+
+改了模拟代码（比如优化 ObstacleManager / CoinManager / EnemyManager）之后重放旧录像，
+逐步对比校验和，就能知道从哪一步、哪个子系统开始和原来不一样。
+
+文件格式（小端）：魔数 b"PKCS"、版本(u8)、子系统数(u8)、步数(u32)，
+之后每步每个子系统一个 u32。
+"""
+import struct
+import sys
+import zlib
+from array import array
+
+CHECKSUM_MAGIC = b"PKCS"
+CHECKSUM_VERSION = 1
+HEADER = struct.Struct("<4sBBI")
+
+# 子系统的顺序即文件里每步校验和的顺序
+SUBSYSTEMS = ("world", "player", "obstacles", "coins", "enemies", "battle")
+
+
+def _crc(values):
+    return zlib.crc32(array("d", values).tobytes())
+
+
+def _rect(rect):
+    return (rect.x, rect.y, rect.width, rect.height)
+
+
+def world_checksums(world):
+    """当前一步各子系统的校验和，顺序同 SUBSYSTEMS"""
+    player = world.player
+    obstacle_manager = world.obstacle_manager
+    coin_manager = world.coin_manager
+    enemy_manager = world.enemy_manager
+
+    state = ("playing", "battle", "game_over").index(world.state)
+    world_values = (world.tick, state, world.score, world.current_game_coins,
+                    world.player_health, world.player_shoot_cooldown, len(world.completed_battles))
+
+    player_values = (*_rect(player.rect), player.y, player.velocity_y, player.jump_count,
+                     player.on_ground, player.shoot_timer)
+
+    obstacle_values = [obstacle_manager.spawn_timer, obstacle_manager.spawn_interval]
+    for obstacle in obstacle_manager.obstacles:
+        obstacle_values += (obstacle.x, *_rect(obstacle.rect))
+
+    coin_values = [coin_manager.spawn_timer, coin_manager.spawn_interval]
+    for coin in coin_manager.coins:
+        coin_values += (coin.x, coin.y, coin.is_collected, coin.collect_animation)
+
+    enemy_values = [enemy_manager.spawn_timer, enemy_manager.spawn_interval]
+    for monster in enemy_manager.monsters:
+        enemy_values += (monster.x, monster.y, monster.health, monster.attack_cooldown)
+    for bullet in enemy_manager.player_bullets:
+        enemy_values += (bullet.x, bullet.rect.y)
+
+    battle_values = []
+    monster = world.battle_monster
+    if monster:
+        battle_values += (*_rect(monster.rect), monster.health, monster.fire_cooldown)
+    for bullet in world.player_bullets:
+        battle_values += (bullet.x, bullet.rect.y)
+    battle_values.append(-1)  # 分开双方的子弹
+    for bullet in world.monster_bullets:
+        battle_values += (bullet.x, bullet.rect.y)
+
+    return (_crc(world_values), _crc(player_values), _crc(obstacle_values),
+            _crc(coin_values), _crc(enemy_values), _crc(battle_values))
+
+
+def checksum_path(replay_path):
+    return replay_path + ".sum"
+
+
+class ChecksumLog:
+    """一局的校验和序列：第 i 行对应 world.tick == i + 1 那一步之后的状态"""
+
+    def __init__(self, subsystems=SUBSYSTEMS):
+        self.subsystems = subsystems
+        self.values = array("I")  # 按步、按子系统平铺
+
+    def __len__(self):
+        return len(self.values) // len(self.subsystems)
+
+    def append(self, world):
+        self.values.extend(world_checksums(world))
+
+    def row(self, index):
+        width = len(self.subsystems)
+        return tuple(self.values[index * width:(index + 1) * width])
+
+    def first_divergence(self, other):
+        """和另一份校验和对比，返回 (步数, [不一致的子系统]) ；完全一致返回 None
+
+        只比两边都有的步；一边更长时，在较短一边结束后的那一步报告 "length"。
+        """
+        width = len(self.subsystems)
+        for index in range(min(len(self), len(other))):
+            start = index * width
+            if self.values[start:start + width] != other.values[start:start + width]:
+                mine, theirs = self.row(index), other.row(index)
+                return index + 1, [name for name, a, b in zip(self.subsystems, mine, theirs) if a != b]
+        if len(self) != len(other):
+            return min(len(self), len(other)) + 1, ["length"]
+        return None
+
+    # ==================== 读写 ====================
+    def to_bytes(self):
+        values = array("I", self.values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return HEADER.pack(CHECKSUM_MAGIC, CHECKSUM_VERSION, len(self.subsystems), len(self)) + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, width, ticks = HEADER.unpack_from(data)
+        if magic != CHECKSUM_MAGIC:
+            raise ValueError("不是校验和文件")
+        if version != CHECKSUM_VERSION or width != len(SUBSYSTEMS):
+            raise ValueError(f"不支持的校验和版本: {version}（{width} 个子系统）")
+        log = cls()
+        log.values.frombytes(data[HEADER.size:HEADER.size + ticks * width * 4])
+        if sys.byteorder != "little":
+            log.values.byteswap()
+        if len(log) != ticks:
+            raise ValueError("校验和文件不完整")
+        return log
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
@@ -4,11 +4,122 @@ import random
 import math
 import os
 
+from anim_curves import COIN_WOBBLE, FADE_OUT, SINE, SINE_STEPS
+from collision import swept_hit, sweep_reach
+from pool import ObjectPool
+from render_queue import LAYER_COINS
+from spatial import drop_expired, is_active, query_rect, query_span
+from timestep import lerp
+
+# 浮动相位用正弦表的格数表示（见 anim_curves.py），每弧度对应的格数
+FLOAT_STEPS_PER_RADIAN = SINE_STEPS / (2 * math.pi)
+
+
+class CoinSpriteCache:
+    """金币贴图缓存
+
+    每种 (尺寸, 地面/空中, 发光) 组合只绘制一次，收集动画每一帧的透明度也预先生成，
+    每帧绘制金币只需要 blit，不再创建 Surface 和字体。
+    """
+
+    GLOW_PADDING = 2  # 发光贴图比金币每边大 2 像素
+
+    def __init__(self, collect_frames=10):
+        self.collect_frames = collect_frames
+        self.sprites = {}          # (size, is_ground_coin, glow) -> Surface
+        self.collect_sprites = {}  # (size, is_ground_coin) -> [Surface, ...]
+
+    def get(self, size, is_ground_coin, glow=False):
+        """获取金币贴图"""
+        key = (size, is_ground_coin, glow)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self._build_sprite(size, is_ground_coin, glow)
+            self.sprites[key] = sprite
+        return sprite
+
+    def get_collect_frame(self, size, is_ground_coin, frame):
+        """获取收集动画第 frame 帧的贴图"""
+        key = (size, is_ground_coin)
+        frames = self.collect_sprites.get(key)
+        if frames is None:
+            frames = self._build_collect_frames(size, is_ground_coin)
+            self.collect_sprites[key] = frames
+        return frames[min(max(frame, 0), len(frames) - 1)]
+
+    def clear(self):
+        """清空缓存"""
+        self.sprites.clear()
+        self.collect_sprites.clear()
+
+    def _build_sprite(self, size, is_ground_coin, glow):
+        """绘制单个金币图形"""
+        center = size // 2
+        radius = size // 2 - 2
+
+        coin_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+
+        # 绘制金币主体
+        for i in range(radius, 0, -1):
+            color_value = 200 + (radius - i) * 55 // radius
+            color = (color_value, color_value, 50)
+            pygame.draw.circle(coin_surface, color, (center, center), i)
+
+        # 绘制金币边框
+        pygame.draw.circle(coin_surface, (220, 220, 0), (center, center), radius, 2)
+
+        # 绘制金币符号
+        font = pygame.font.Font(None, size // 2)
+        coin_text = font.render("$", True, (255, 255, 200))
+        text_rect = coin_text.get_rect(center=(center, center))
+        coin_surface.blit(coin_text, text_rect)
+
+        if not glow:
+            return coin_surface
+
+        # 发光版本：在金币上叠加一层半透明光晕
+        glow_size = size + self.GLOW_PADDING * 2
+        glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+        glow_surface.blit(coin_surface, (self.GLOW_PADDING, self.GLOW_PADDING))
+        glow_layer = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+        glow_color = (255, 255, 180, 100) if is_ground_coin else (255, 255, 200, 80)
+        pygame.draw.circle(glow_layer, glow_color, (glow_size // 2, glow_size // 2), glow_size // 2)
+        glow_surface.blit(glow_layer, (0, 0))
+        return glow_surface
+
+    def _build_collect_frames(self, size, is_ground_coin):
+        """按收集动画帧数生成透明度递减的贴图"""
+        base = self.get(size, is_ground_coin, False)
+        frames = []
+        for frame in range(self.collect_frames + 1):
+            alpha = round(255 * FADE_OUT.at(frame / self.collect_frames))
+            sprite = base.copy()
+            sprite.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            frames.append(sprite)
+        return frames
+
+
+# 所有金币共用一份贴图缓存
+coin_sprite_cache = CoinSpriteCache()
+
 
 class Coin:
-    def __init__(self, x, y, size=25, is_ground_coin=False):
-        """初始化金币"""
+    # 同时存在的金币很多，用 __slots__ 省掉每个实例的 __dict__（见 benchmarks/bench_entity_memory.py）
+    __slots__ = ("rect", "x", "prev_x", "y", "prev_y", "size", "is_active", "is_collected",
+                 "collect_animation", "max_collect_animation", "is_ground_coin", "original_y",
+                 "float_timer", "float_speed", "float_amplitude")
+
+    def __init__(self, x, y, size=25, is_ground_coin=False, rng=random):
+        """初始化金币（rng 用于生成浮动参数）"""
         self.rect = pygame.Rect(x, y, size, size)
+        self.reset(x, y, size, is_ground_coin, rng)
+
+    def reset(self, x, y, size=25, is_ground_coin=False, rng=random):
+        """原地重新初始化（对象池复用时调用，见 pool.py）"""
+        self.rect.update(x, y, size, size)
+        # 浮点坐标和上一步的坐标（绘制时插值）
+        self.x = self.prev_x = float(x)
+        self.y = self.prev_y = float(y)
         self.size = size
         self.is_active = True
         self.is_collected = False
@@ -18,31 +129,34 @@ class Coin:
         self.is_ground_coin = is_ground_coin
         self.original_y = y  # 记录原始Y坐标
 
-        # 只有空中金币有浮动效果
+        # 只有空中金币有浮动效果（相位和速度以正弦表的格数计）
         if not is_ground_coin:
-            self.float_timer = random.uniform(0, math.pi * 2)
-            self.float_speed = random.uniform(0.02, 0.06)
-            self.float_amplitude = random.randint(2, 5)
+            self.float_timer = rng.uniform(0, SINE_STEPS)
+            self.float_speed = rng.uniform(0.02, 0.06) * FLOAT_STEPS_PER_RADIAN
+            self.float_amplitude = rng.randint(2, 5)
 
-    def move(self, scroll_speed=0):
+    def move(self, scroll_speed=0, dt=1.0):
         """移动金币"""
+        self.prev_x, self.prev_y = self.x, self.y
         if not self.is_collected:
             # 金币与背景同步滚动
-            self.rect.x -= scroll_speed
+            self.x -= scroll_speed * dt
 
             # 只有空中金币有浮动效果
             if not self.is_ground_coin:
-                self.float_timer += self.float_speed
-                self.rect.y = self.original_y + math.sin(self.float_timer) * self.float_amplitude
+                self.float_timer += self.float_speed * dt
+                self.y = self.original_y + SINE.sample(self.float_timer) * self.float_amplitude
+            self.rect.topleft = (round(self.x), round(self.y))
 
-            # 如果移出屏幕，标记为不活动
-            if self.rect.right < 0:
+            # 移出屏幕后再留一步才标记为不活动：连续碰撞检测还要用这一步的移动过程（见 collision.py）
+            if round(self.prev_x) + self.rect.width < 0:
                 self.is_active = False
         else:
             # 收集动画：金币向上飘并逐渐消失
-            self.collect_animation += 1
-            self.rect.y -= 2  # 向上飘
-            self.rect.x += random.randint(-1, 1)  # 轻微左右晃动
+            self.collect_animation += dt
+            self.y -= 2 * dt  # 向上飘
+            self.x += COIN_WOBBLE.sample(self.collect_animation) * dt  # 轻微左右晃动
+            self.rect.topleft = (round(self.x), round(self.y))
 
             # 动画结束后标记为不活动
             if self.collect_animation >= self.max_collect_animation:
@@ -55,62 +169,106 @@ class Coin:
             return True
         return False
 
-    def draw(self, screen):
+    def draw_pos(self, alpha=1.0):
+        """在上一步和当前位置之间插值的绘制位置"""
+        return round(lerp(self.prev_x, self.x, alpha)), round(lerp(self.prev_y, self.y, alpha))
+
+    def draw(self, screen, alpha=1.0):
         """绘制金币"""
         if self.is_active:
-            # 如果是收集动画，添加透明度效果
+            # 如果是收集动画，使用预先生成的透明度帧
             if self.is_collected:
-                alpha = 255 - (self.collect_animation * 255 // self.max_collect_animation)
-                temp_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-                self.draw_coin(temp_surface, (0, 0), alpha)
-                screen.blit(temp_surface, self.rect)
+                sprite = coin_sprite_cache.get_collect_frame(self.size, self.is_ground_coin,
+                                                             int(self.collect_animation))
+                screen.blit(sprite, self.draw_pos(alpha))
             else:
                 # 正常金币
-                self.draw_coin(screen, (self.rect.x, self.rect.y))
+                self.draw_coin(screen, self.draw_pos(alpha))
+
+    def enqueue(self, render_queue, alpha=1.0):
+        """把金币提交到渲染队列"""
+        if not self.is_active:
+            return
+        x, y = self.draw_pos(alpha)
+        if self.is_collected:
+            sprite = coin_sprite_cache.get_collect_frame(self.size, self.is_ground_coin,
+                                                         int(self.collect_animation))
+            render_queue.push(LAYER_COINS, sprite, (x, y))
+            return
+
+        # 添加金币发光效果（只影响画面，用全局 random，不占用模拟的随机数流）
+        glow = random.random() < (0.05 if self.is_ground_coin else 0.1)
+        sprite = coin_sprite_cache.get(self.size, self.is_ground_coin, glow)
+        if glow:
+            padding = CoinSpriteCache.GLOW_PADDING
+            render_queue.push(LAYER_COINS, sprite, (x - padding, y - padding))
+        else:
+            render_queue.push(LAYER_COINS, sprite, (x, y))
 
     def draw_coin(self, surface, pos, alpha=255):
-        """绘制单个金币图形"""
+        """绘制单个金币图形（从贴图缓存取图，只做 blit）"""
         x, y = pos
-        center = self.size // 2
-        radius = self.size // 2 - 2
 
-        # 绘制金币
-        coin_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        # 添加金币发光效果
+        glow = random.random() < (0.05 if self.is_ground_coin else 0.1)
+        sprite = coin_sprite_cache.get(self.size, self.is_ground_coin, glow)
+        if alpha < 255:
+            sprite = sprite.copy()
+            sprite.set_alpha(alpha)
+
+        if glow:
+            padding = CoinSpriteCache.GLOW_PADDING
+            surface.blit(sprite, (x - padding, y - padding))
+        else:
+            surface.blit(sprite, (x, y))
 
-        # 绘制金币主体
-        for i in range(radius, 0, -1):
-            color_value = 200 + (radius - i) * 55 // radius
-            color = (color_value, color_value, 50, alpha)
-            pygame.draw.circle(coin_surface, color, (center, center), i)
+    def check_collision(self, player_rect):
+        """检测与玩家的碰撞"""
+        return self.rect.colliderect(player_rect)
 
-        # 绘制金币边框
-        pygame.draw.circle(coin_surface, (220, 220, 0, alpha), (center, center), radius, 2)
+    def prev_rect(self):
+        """上一步的矩形（连续碰撞检测用，见 collision.py）"""
+        return self.rect.move(round(self.prev_x) - self.rect.x, round(self.prev_y) - self.rect.y)
 
-        # 绘制金币符号
-        font = pygame.font.Font(None, self.size // 2)
-        coin_text = font.render("$", True, (255, 255, 200, alpha))
-        text_rect = coin_text.get_rect(center=(center, center))
-        coin_surface.blit(coin_text, text_rect)
 
-        surface.blit(coin_surface, (x, y))
+# 金币对象池：滚出屏幕或收集动画播完的金币收回来给下一次生成用
+coin_pool = ObjectPool(Coin)
 
-        # 添加金币发光效果
-        if random.random() < (0.05 if self.is_ground_coin else 0.1):
-            glow_size = self.size + 4
-            glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-            glow_color = (255, 255, 180, 100) if self.is_ground_coin else (255, 255, 200, 80)
-            pygame.draw.circle(glow_surface, glow_color,
-                               (glow_size // 2, glow_size // 2), glow_size // 2)
-            surface.blit(glow_surface, (x - 2, y - 2))
 
-    def check_collision(self, player_rect):
-        """检测与玩家的碰撞"""
-        return self.rect.colliderect(player_rect)
+def load_collect_sound():
+    """加载金币收集音效（需要声卡，只在渲染端第一次播放时调用）"""
+    try:
+        # 检查是否有音效文件
+        sound_paths = [
+            'image/Super Mario Bros 3 - Coin Sound Effect.mp3',
+            'image/coin_sound.mp3',
+            'image/coin.wav'
+        ]
+
+        for path in sound_paths:
+            if os.path.exists(path):
+                collect_sound = pygame.mixer.Sound(path)
+                collect_sound.set_volume(0.3)  # 设置音量
+                print(f"成功加载音效: {path}")
+                return collect_sound
+
+        print("警告: 未找到音效文件，金币收集将没有声音")
+    except Exception as e:
+        print(f"加载音效失败: {e}")
+    return None
 
 
 class CoinManager:
-    def __init__(self, obstacle_manager=None):
-        self.coins = []
+    def __init__(self, obstacle_manager=None, rng=random, entity_store=False):
+        # 按生成顺序（也就是横坐标）排列，滚出左边的从列表里去掉；
+        # entity_store 为 True 时改用数组存储（见 entity_store.py）
+        self.entity_store = entity_store
+        if entity_store:
+            from entity_store import CoinStore
+            self.coins = CoinStore()
+        else:
+            self.coins = []
+        self.rng = rng  # 生成用的随机数流（默认全局 random），也用来生成每枚金币的浮动参数
         self.spawn_timer = 0
         self.spawn_interval = 35
         self.min_spacing = 80
@@ -122,32 +280,14 @@ class CoinManager:
         self.waiting_after_obstacle = False
         self.obstacle_manager = obstacle_manager
 
-        # 加载音效
-        self.collect_sound = None
-        self.load_sound()
-
-    def load_sound(self):
-        """加载金币收集音效"""
-        try:
-            # 检查是否有音效文件
-            sound_paths = [
-                'image/Super Mario Bros 3 - Coin Sound Effect.mp3',
-                'image/coin_sound.mp3',
-                'image/coin.wav'
-            ]
-
-            for path in sound_paths:
-                if os.path.exists(path):
-                    self.collect_sound = pygame.mixer.Sound(path)
-                    self.collect_sound.set_volume(0.3)  # 设置音量
-                    print(f"成功加载音效: {path}")
-                    break
-
-            if not self.collect_sound:
-                print("警告: 未找到音效文件，金币收集将没有声音")
-        except Exception as e:
-            print(f"加载音效失败: {e}")
-            self.collect_sound = None
+        # 按横坐标查询碰撞用：出现过的最大金币尺寸，和列表顺序可能偏离的像素数
+        self.max_width = 0
+        self.order_slack = 0
+        # 金币上一步向左滚动的距离（连续碰撞检测时往左多查这么远）
+        self.shift = 0
+
+        # 收集事件 ("coin_pickup", 位置)，由 World 取走（音效和粒子在渲染端处理）
+        self.events = []
 
     def obstacle_too_close(self, min_gap):
         if not self.obstacle_manager:
@@ -163,15 +303,15 @@ class CoinManager:
         coins = []
 
         if is_ground_group:
-            count = random.randint(*self.ground_coin_count_range)
+            count = self.rng.randint(*self.ground_coin_count_range)
             base_y = 350
 
             for i in range(count):
                 coin_x = x + i * self.ground_coin_spacing
-                coin = Coin(coin_x, base_y, is_ground_coin=True)
+                coin = coin_pool.acquire(coin_x, base_y, is_ground_coin=True, rng=self.rng)
                 coins.append(coin)
         else:
-            spawn_y = random.randint(220, 260)
+            spawn_y = self.rng.randint(220, 260)
 
             # 如果地面被障碍物挡住，把金币放到障碍物上方
             if self.obstacle_manager:
@@ -180,7 +320,7 @@ class CoinManager:
                         spawn_y = ob.rect.top - 40
                         break
 
-            coin = Coin(x, spawn_y, is_ground_coin=False)
+            coin = coin_pool.acquire(x, spawn_y, is_ground_coin=False, rng=self.rng)
             coins.append(coin)
 
         return coins
@@ -208,7 +348,7 @@ class CoinManager:
             else:
                 self.waiting_after_obstacle = False
 
-        spawn_ground_group = random.random() < 0.7
+        spawn_ground_group = self.rng.random() < 0.7
 
         if spawn_ground_group and self.has_upcoming_obstacle(spawn_x):
             spawn_ground_group = False
@@ -221,48 +361,98 @@ class CoinManager:
         coins = self.spawn_coins_group(spawn_x, is_ground_group=spawn_ground_group)
         return coins if coins else None
 
-    def update(self, scroll_speed=0):
-        """更新金币状态"""
-        self.spawn_timer += 1
+    def update(self, scroll_speed=0, dt=1.0):
+        """更新金币状态：生成并移动一步（World 按帧调用 tick_spawner、每步调用 step）"""
+        self.tick_spawner(dt)
+        self.step(scroll_speed, dt)
+
+    def tick_spawner(self, frames):
+        """生成计时推进 frames 帧，到时间就在右边生成金币"""
+        self.spawn_timer += frames
         if self.spawn_timer >= self.spawn_interval:
             new_coins = self.spawn_coin()
             if new_coins:
+                self.max_width = max(self.max_width, max(coin.rect.width for coin in new_coins))
+                last_is_ground = hasattr(new_coins[0], 'is_ground_coin') and new_coins[0].is_ground_coin
+                # 新金币总在最右边，列表保持按横坐标有序
                 self.coins.extend(new_coins)
 
-                last_is_ground = hasattr(new_coins[0], 'is_ground_coin') and new_coins[0].is_ground_coin
                 if last_is_ground:
-                    self.spawn_interval = random.randint(50, 100)
+                    self.spawn_interval = self.rng.randint(50, 100)
                 else:
-                    self.spawn_interval = random.randint(30, 60)
+                    self.spawn_interval = self.rng.randint(30, 60)
                 self.spawn_timer = 0
 
-        # 更新所有金币位置
-        for coin in self.coins[:]:
-            coin.move(scroll_speed)
+    def step(self, scroll_speed=0, dt=1.0):
+        """移动金币、推进收集动画，去掉过期的"""
+        # 收集动画中的金币停止滚动（最多 10 帧，另有左右晃动），会偏离列表的顺序
+        self.order_slack = (scroll_speed + 1) * 10
+        self.shift = scroll_speed * dt
 
+        # 更新所有金币位置
+        if self.entity_store:
+            self.coins.step(scroll_speed, dt)
+            return
+        expired = []
+        for coin in self.coins:
+            coin.move(scroll_speed, dt)
             if not coin.is_active:
-                self.coins.remove(coin)
+                expired.append(coin)
 
-    def check_collections(self, player_rect, coin_multiplier=1):
-        """检测玩家与所有金币的碰撞，支持金币翻倍效果"""
+        # 滚出左边的和收集动画播完的一次去掉
+        if expired:
+            drop_expired(self.coins, expired, is_active)
+            coin_pool.release_all(expired)
+
+    def check_collections(self, player_rect, coin_multiplier=1, player_prev_rect=None, candidates=None):
+        """检测玩家与所有金币的碰撞，支持金币翻倍效果
+
+        给出玩家上一步的矩形时做连续碰撞检测（见 collision.py），跳得再快也不会从金币中间穿过去。
+        candidates 是 snapshot 记下的 [(金币, 起点矩形)]，给出时从那时起算移动过程
+        （player_prev_rect 也是那时的矩形），不给时只算这一步。
+        """
         collected_count = 0
 
-        for coin in self.coins:
-            if not coin.is_collected and coin.check_collision(player_rect):
+        if player_prev_rect is None:
+            touched = [coin for coin in query_rect(self.coins, player_rect, self.max_width, self.order_slack)
+                       if coin.check_collision(player_rect)]
+        else:
+            if candidates is None:
+                sweep = player_rect.union(player_prev_rect)
+                candidates = ((coin, coin.prev_rect())
+                              for coin in query_span(self.coins, sweep.left - sweep_reach(self.shift), sweep.right,
+                                                     self.max_width, self.order_slack))
+            touched = [coin for coin, coin_prev in candidates
+                       if not coin.is_collected and swept_hit(player_prev_rect, player_rect, coin_prev, coin.rect)]
+
+        for coin in touched:
+            if not coin.is_collected:
                 if coin.collect():
                     collected_count += 1
-                    # 播放收集音效
-                    if self.collect_sound:
-                        self.collect_sound.play()
+                    self.events.append(("coin_pickup", coin.rect.center))
 
         # 应用金币翻倍效果
         return collected_count * coin_multiplier
 
-    def draw(self, screen):
+    def snapshot(self, left, right):
+        """横向和 [left, right) 重叠、还没被收集的金币和它们当前矩形的副本 [(金币, 矩形), ...]"""
+        return [(coin, coin.rect.copy())
+                for coin in query_span(self.coins, left, right, self.max_width, self.order_slack)
+                if not coin.is_collected]
+
+    def draw(self, screen, alpha=1.0):
         """绘制所有金币"""
         for coin in self.coins:
-            coin.draw(screen)
+            coin.draw(screen, alpha)
+
+    def enqueue(self, render_queue, alpha=1.0):
+        """把所有金币提交到渲染队列"""
+        for coin in self.coins:
+            coin.enqueue(render_queue, alpha)
 
     def clear(self):
         """清除所有金币"""
+        self.events.clear()
+        if not self.entity_store:
+            coin_pool.release_all(self.coins)
         self.coins.clear()
@@ -11,12 +11,26 @@ from typing import Dict, List, Optional
 
 import pygame
 
+from asset_manager import asset_manager
+from collision import swept_hit, sweep_reach
+from pool import ObjectPool
+from render_queue import LAYER_BULLETS, LAYER_ENEMIES, RenderQueue
+from spatial import drop_expired, is_active, query_span
+from timestep import lerp
+
 
 class Monster:
     """简单的怪物实体（仅保留绵羊）。"""
 
+    __slots__ = ("rect", "x", "prev_x", "y", "type", "health", "max_health", "damage", "speed",
+                 "attack_range", "attack_cooldown", "is_alive", "is_attacking", "image", "color",
+                 "animation_frame")
+
     def __init__(self, x: int, y: int, monster_type: str, image: Optional[pygame.Surface] = None):
         self.rect = pygame.Rect(x, y, 60, 60)
+        # 浮点横坐标和上一步的横坐标（绘制时插值）
+        self.x = self.prev_x = float(x)
+        self.y = y
         self.type = monster_type  # 固定为 sheep
 
         # 战斗属性（调整为绵羊的属性）
@@ -36,14 +50,6 @@ class Monster:
         self.color = self._get_color_by_type()
         self.animation_frame = 0
 
-    @property
-    def x(self):
-        return self.rect.x
-
-    @property
-    def y(self):
-        return self.rect.y
-
     def _get_color_by_type(self):
         """仅保留绵羊的颜色（白色+浅灰色）"""
         colors = {
@@ -58,17 +64,19 @@ class Monster:
         pygame.draw.rect(surface, (200, 200, 200), surface.get_rect(), 2)  # 边框浅灰色
         return surface
 
-    def update(self, scroll_speed: int):
+    def update(self, scroll_speed: int, dt: float = 1.0):
         if not self.is_alive:
             return
 
         # 绵羊向左移动，叠加基础速度
-        self.rect.x -= scroll_speed + self.speed
+        self.prev_x = self.x
+        self.x -= (scroll_speed + self.speed) * dt
+        self.rect.x = round(self.x)
 
         if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
+            self.attack_cooldown -= dt
 
-        self.animation_frame = (self.animation_frame + 1) % 60
+        self.animation_frame = (self.animation_frame + dt) % 60
 
     def take_damage(self, damage: int) -> bool:
         self.health -= damage
@@ -91,27 +99,49 @@ class Monster:
             return True
         return False
 
-    def draw(self, screen: pygame.Surface):
+    def prev_rect(self) -> pygame.Rect:
+        """上一步的矩形（连续碰撞检测用，见 collision.py）"""
+        return self.rect.move(round(self.prev_x) - self.rect.x, 0)
+
+    def draw_x(self, alpha: float = 1.0) -> int:
+        """在上一步和当前位置之间插值的绘制横坐标"""
+        return round(lerp(self.prev_x, self.x, alpha))
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0):
         if not self.is_alive:
             return
 
-        screen.blit(self.image, self.rect)
-        self._draw_health_bar(screen)
+        x = self.draw_x(alpha)
+        screen.blit(self.image, (x, self.rect.y))
+        self._draw_health_bar(screen, x)
 
         if self.is_attacking:
             self._draw_attack_effect(screen)
             self.is_attacking = False
 
-    def _draw_health_bar(self, screen: pygame.Surface):
+    def enqueue(self, render_queue: RenderQueue, alpha: float = 1.0):
+        """把绵羊提交到渲染队列（血条和攻击特效作为绘制回调）"""
+        if not self.is_alive:
+            return
+
+        x = self.draw_x(alpha)
+        render_queue.push(LAYER_ENEMIES, self.image, (x, self.rect.y))
+        render_queue.push_draw(LAYER_ENEMIES, lambda screen: self._draw_health_bar(screen, x))
+
+        if self.is_attacking:
+            render_queue.push_draw(LAYER_ENEMIES, self._draw_attack_effect)
+            self.is_attacking = False
+
+    def _draw_health_bar(self, screen: pygame.Surface, x: int):
         bar_width = self.rect.width
         bar_height = 5
         health_percent = max(self.health, 0) / self.max_health
 
-        pygame.draw.rect(screen, (255, 0, 0), (self.rect.x, self.rect.y - 10, bar_width, bar_height))
+        pygame.draw.rect(screen, (255, 0, 0), (x, self.rect.y - 10, bar_width, bar_height))
         pygame.draw.rect(
             screen,
             (0, 255, 0),
-            (self.rect.x, self.rect.y - 10, bar_width * health_percent, bar_height),
+            (x, self.rect.y - 10, bar_width * health_percent, bar_height),
         )
 
     def _draw_attack_effect(self, screen: pygame.Surface):
@@ -122,38 +152,75 @@ class Monster:
 
 class Bullet:
     """子弹类（保留原有逻辑，无改动）"""
+
+    __slots__ = ("rect", "image", "x", "prev_x", "speed", "damage", "direction", "is_active")
+
     def __init__(self, x: int, y: int, direction: str = "right", damage: int = 20,
                  image: Optional[pygame.Surface] = None):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, direction, damage, image)
+
+    def reset(self, x: int, y: int, direction: str = "right", damage: int = 20,
+              image: Optional[pygame.Surface] = None):
+        """原地重新初始化（对象池复用时调用，见 pool.py）"""
         self.image = image
         if self.image:
+            self.rect.size = self.image.get_size()
             if direction == "right":
-                self.rect = self.image.get_rect(midleft=(x, y))
+                self.rect.midleft = (x, y)
             else:
-                self.rect = self.image.get_rect(midright=(x, y))
+                self.rect.midright = (x, y)
         else:
-            self.rect = pygame.Rect(x, y, 15, 5)
+            self.rect.update(x, y, 15, 5)
+        # 浮点横坐标和上一步的横坐标（绘制时插值）
+        self.x = self.prev_x = float(self.rect.x)
         self.speed = 10
         self.damage = damage
         self.direction = direction
         self.is_active = True
 
-    def update(self):
+    def update(self, dt: float = 1.0):
+        self.prev_x = self.x
         if self.direction == "right":
-            self.rect.x += self.speed
+            self.x += self.speed * dt
         else:
-            self.rect.x -= self.speed
+            self.x -= self.speed * dt
+        self.rect.x = round(self.x)
 
-        if self.rect.x > 1000 or self.rect.x < -50:
+        # 飞出范围后再留一步：连续碰撞检测还要用这一步的移动过程（见 collision.py）
+        prev_x = round(self.prev_x)
+        if prev_x > 1000 or prev_x < -50:
             self.is_active = False
 
-    def draw(self, screen: pygame.Surface):
+    def prev_rect(self) -> pygame.Rect:
+        """上一步的矩形（连续碰撞检测用，见 collision.py）"""
+        return self.rect.move(round(self.prev_x) - self.rect.x, 0)
+
+    def draw_rect(self, alpha: float = 1.0) -> pygame.Rect:
+        """在上一步和当前位置之间插值的绘制矩形"""
+        return self.rect.move(round(lerp(self.prev_x, self.x, alpha)) - self.rect.x, 0)
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0):
         if not self.is_active:
             return
         if self.image:
-            screen.blit(self.image, self.rect)
+            screen.blit(self.image, self.draw_rect(alpha))
         else:
-            pygame.draw.rect(screen, (255, 240, 0), self.rect)
-            pygame.draw.rect(screen, (255, 255, 255), self.rect, 1)
+            self._draw_fallback(screen, self.draw_rect(alpha))
+
+    def enqueue(self, render_queue: RenderQueue, alpha: float = 1.0):
+        """把子弹提交到渲染队列"""
+        if not self.is_active:
+            return
+        rect = self.draw_rect(alpha)
+        if self.image:
+            render_queue.push(LAYER_BULLETS, self.image, rect.topleft)
+        else:
+            render_queue.push_draw(LAYER_BULLETS, lambda screen: self._draw_fallback(screen, rect))
+
+    def _draw_fallback(self, screen: pygame.Surface, rect: pygame.Rect):
+        pygame.draw.rect(screen, (255, 240, 0), rect)
+        pygame.draw.rect(screen, (255, 255, 255), rect, 1)
 
 
 class Skill:
@@ -195,15 +262,38 @@ class Skill:
             return None
 
 
+# 玩家子弹对象池：飞出屏幕或命中后的子弹收回来给下一次射击用
+bullet_pool = ObjectPool(Bullet)
+
+
+def _monster_present(monster: Monster) -> bool:
+    """绵羊还活着、上一步还没滚出左边（再留一步给连续碰撞检测，见 collision.py）"""
+    return monster.is_alive and round(monster.prev_x) + monster.rect.width >= 0
+
+
 class EnemyManager:
     """统一管理怪物（仅绵羊）和战斗交互。"""
 
-    def __init__(self):
-        self.monsters: List[Monster] = []
+    def __init__(self, rng=random, entity_store: bool = False):
+        # 都按生成顺序排列：绵羊从左边滚出、子弹从右边飞出，过期的从列表里去掉；
+        # entity_store 为 True 时绵羊改用数组存储（见 entity_store.py）
+        self.entity_store = entity_store
+        if entity_store:
+            from entity_store import MonsterStore
+            self.monsters = MonsterStore()
+        else:
+            self.monsters = []
+        self.rng = rng  # 生成用的随机数流（默认全局 random）
         self.player_bullets: List[Bullet] = []
         self.spawn_timer = 0
         self.spawn_interval = 120  # 绵羊生成间隔（可自行调整）
+        # 按横坐标查询碰撞用：出现过的最大绵羊宽度和攻击范围
+        self.max_width = 0
+        self.max_attack_range = 0
+        self.max_speed = 0
         self.missing_assets: List[str] = []
+        # 命中/死亡事件，由 World 取走（粒子在渲染端处理）
+        self.events: List[tuple] = []
 
         self.monster_images = self._load_monster_images()
         self.bullet_image = self._load_bullet_image()
@@ -217,9 +307,8 @@ class EnemyManager:
             "sheep": os.path.join(base_dir, "assets", "sheep.png"),  # 绵羊图片路径（修正为实际位置）          
         }
         for monster_type, path in expected.items():
-            if os.path.exists(path):
-                loaded = pygame.image.load(path).convert_alpha()
-                loaded = pygame.transform.scale(loaded, (60, 60))
+            loaded = asset_manager.try_load(path, (60, 60))
+            if loaded:
                 images[monster_type] = loaded
             else:
                 self.missing_assets.append(path)
@@ -229,16 +318,17 @@ class EnemyManager:
     def _load_bullet_image(self) -> Optional[pygame.Surface]:
         base_dir = os.path.dirname(__file__)
         bullet_path = os.path.join(base_dir, "image", "player_bullet.png")
-        if not os.path.exists(bullet_path):
+        loaded = asset_manager.try_load(bullet_path, (20, 10))
+        if loaded is None:
             self.missing_assets.append(bullet_path)
-            return None
-        loaded = pygame.image.load(bullet_path).convert_alpha()
-        return pygame.transform.scale(loaded, (20, 10))
+        return loaded
 
     def reset(self):
         """重置怪物列表"""
         self.monsters.clear()
+        bullet_pool.release_all(self.player_bullets)
         self.player_bullets.clear()
+        self.events.clear()
         self.spawn_timer = 0
 
     def spawn_monster(self):
@@ -248,11 +338,15 @@ class EnemyManager:
             return  # 缺少贴图时不生成白块占位
         ground_y = 400 - 60     # 地面y坐标（和原来一致）
         new_monster = Monster(800, ground_y, monster_type, self.monster_images.get(monster_type))
+        # 绵羊都从右边生成、同样速度移动，列表保持按横坐标有序
         self.monsters.append(new_monster)
+        self.max_width = max(self.max_width, new_monster.rect.width)
+        self.max_attack_range = max(self.max_attack_range, new_monster.attack_range)
+        self.max_speed = max(self.max_speed, new_monster.speed)
 
     def spawn_player_bullet(self, player_rect: pygame.Rect, damage: int = 25):
         """生成玩家子弹（无改动）"""
-        bullet = Bullet(
+        bullet = bullet_pool.acquire(
             x=player_rect.right,
             y=player_rect.centery,
             direction="right",
@@ -261,51 +355,99 @@ class EnemyManager:
         )
         self.player_bullets.append(bullet)
 
-    def update(self, scroll_speed: int, player_rect: Optional[pygame.Rect]) -> bool:
-        """更新怪物和战斗逻辑（仅生成绵羊）"""
-        self.spawn_timer += 1
+    def drop_monsters(self, expired):
+        """去掉死了或滚出屏幕的绵羊 expired，留下的保持原来的顺序"""
+        if self.entity_store:
+            self.monsters.compact()
+        else:
+            drop_expired(self.monsters, expired, _monster_present)
+
+    def update(self, scroll_speed: int, player_rect: Optional[pygame.Rect], dt: float = 1.0) -> bool:
+        """更新怪物和战斗逻辑（仅生成绵羊）：生成并推进一步（World 按帧调用 tick_spawner、每步调用 step）"""
+        self.tick_spawner(dt)
+        return self.step(scroll_speed, player_rect, dt)
+
+    def tick_spawner(self, frames: float):
+        """生成计时推进 frames 帧，到时间就生成绵羊"""
+        self.spawn_timer += frames
         if self.spawn_timer >= self.spawn_interval:
             self.spawn_monster()
-            self.spawn_interval = random.randint(100, 160)  # 生成间隔随机
+            self.spawn_interval = self.rng.randint(100, 160)  # 生成间隔随机
             self.spawn_timer = 0
 
+    def step(self, scroll_speed: int, player_rect: Optional[pygame.Rect], dt: float = 1.0) -> bool:
+        """移动绵羊和子弹、处理子弹命中；给出 player_rect 时检测绵羊攻击，返回玩家是否被攻击"""
         player_hit = False
 
         # 更新绵羊怪物
-        for monster in self.monsters[:]:
-            monster.update(scroll_speed)
-            if monster.rect.right < 0 or not monster.is_alive:
-                self.monsters.remove(monster)
-
-        # 更新子弹碰撞
-        for bullet in self.player_bullets[:]:
-            bullet.update()
+        if self.entity_store:
+            self.monsters.step(scroll_speed, dt)
+        else:
+            expired = []
+            for monster in self.monsters:
+                monster.update(scroll_speed, dt)
+                if not _monster_present(monster):
+                    expired.append(monster)
+            if expired:
+                self.drop_monsters(expired)
+
+        # 更新子弹（上一步命中的子弹这一步去掉）
+        expired = []
+        for bullet in self.player_bullets:
+            bullet.update(dt)
             if not bullet.is_active:
-                self.player_bullets.remove(bullet)
-                continue
-
-            for monster in self.monsters[:]:
-                if bullet.rect.colliderect(monster.rect) and monster.is_alive:
+                expired.append(bullet)
+        if expired:
+            drop_expired(self.player_bullets, expired, is_active)
+            bullet_pool.release_all(expired)
+
+        # 子弹碰撞（连续碰撞检测，见 collision.py）：绵羊这一步最多向左移动 reach，
+        # 往左多查这么远才不会漏掉和子弹交错而过的
+        killed = []
+        reach = sweep_reach((scroll_speed + self.max_speed) * dt)
+        # 没有绵羊时（跑酷的大部分时间）不用逐个子弹查询
+        for bullet in self.player_bullets if self.monsters else ():
+            bullet_prev = bullet.prev_rect()
+            sweep = bullet.rect.union(bullet_prev)
+            for monster in query_span(self.monsters, sweep.left - reach, sweep.right, self.max_width):
+                if monster.is_alive and swept_hit(bullet_prev, bullet.rect, monster.prev_rect(), monster.rect,
+                                                  include_start=True):
                     bullet.is_active = False
                     is_dead = monster.take_damage(bullet.damage)
+                    self.events.append(("hit", bullet.rect.center))
                     if is_dead:
-                        self.monsters.remove(monster)
+                        self.events.append(("monster_death", monster.rect.center, monster.color))
+                        killed.append(monster)
                     break
+        if killed:
+            self.drop_monsters(killed)
 
         # 检测绵羊攻击玩家
         if player_rect:
-            for monster in self.monsters:
+            # 只有中心在攻击范围内的绵羊才可能攻击到玩家
+            reach = self.max_attack_range
+            nearby = query_span(self.monsters, player_rect.centerx - reach,
+                                player_rect.centerx + reach + 1, self.max_width)
+            for monster in nearby:
                 if monster.attack(player_rect):
                     player_hit = True
 
         return player_hit
 
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0):
         """绘制绵羊和子弹"""
         for monster in self.monsters:
-            monster.draw(screen)
+            monster.draw(screen, alpha)
+
+        for bullet in self.player_bullets:
+            bullet.draw(screen, alpha)
+
+    def enqueue(self, render_queue: RenderQueue, alpha: float = 1.0):
+        """把绵羊和子弹提交到渲染队列"""
+        for monster in self.monsters:
+            monster.enqueue(render_queue, alpha)
 
         for bullet in self.player_bullets:
-            bullet.draw(screen)
+            bullet.enqueue(render_queue, alpha)
 
 
@@ -0,0 +1,331 @@
+# entity_store.py
+"""滚动实体的数组存储（可选，World(entity_store=True) 打开）
+
+默认每个障碍物、金币、绵羊都是一个对象，每步在 Python 里逐个 move/update。
+打开数组存储后，同一种实体的坐标、矩形、状态位、动画相位各存一列 NumPy 数组
+（和 particles.py 一样的“数组结构”），每步的滚动、金币浮动、出屏剔除各是一次整列计算，
+和玩家矩形的重叠检测也是一次向量化比较（spatial.py 的查询遇到 EntityStore 时直接交给它）。
+
+原来的对象接口仍然可用：容器里放的是视图（障碍物、金币、绵羊类的子类），
+x、rect、is_collected 这些属性读写的是数组里对应的那一行，绘制、拾取、受伤等代码不用改。
+rect 每次读取都新建一个 ViewRect，给它的属性赋值、调用 move_ip 这类原地修改的方法、
+或者给视图的 rect 整个赋值，都会写回数组；copy()、move() 等得到的新矩形和数组无关。
+
+生成代码也不变：新实体照常从对象池取出，append 时把数据拷进数组、原对象还回对象池。
+实体去掉后它的视图就失效了（之后复用给新实体），不能再留着用。
+
+计算顺序和对象版逐个计算完全一样（浮动和晃动取自 anim_curves.py 的同一张表，np.rint 与 round
+同样是四舍六入五取偶），同一个录像在两种存储下的校验和相同，可以用 python replay.py --entity-store 验证。
+实体只有几十个时整列计算的固定开销比逐个计算还大，见 benchmarks/bench_entity_store.py。
+"""
+from abc import ABC, abstractmethod
+from functools import cache
+
+import numpy as np
+import pygame
+
+from anim_curves import COIN_WOBBLE, SINE
+from coin import Coin, coin_pool
+from enemy import Monster
+from obstacle import Obstacle, obstacle_pool
+
+# 容量不够时翻倍
+STORE_CAPACITY = 64
+# 最多留多少个空闲视图给之后的实体复用
+MAX_FREE_VIEWS = 256
+
+# 每种实体都有的列：矩形的位置和尺寸
+RECT_COLUMNS = (("rx", np.int64), ("ry", np.int64), ("w", np.int64), ("h", np.int64))
+
+# 动画曲线表的数组版本，整列按相位取值
+SINE_TABLE = np.array(SINE.values)
+WOBBLE_TABLE = np.array(COIN_WOBBLE.values)
+
+
+def _column(name):
+    """视图上的属性：读写 store 里同名的列的第 row 行"""
+
+    def get(self):
+        return getattr(self.store, name)[self.row].item()
+
+    def set(self, value):
+        getattr(self.store, name)[self.row] = value
+
+    return property(get, set)
+
+
+class ViewRect(pygame.Rect):
+    """视图的 rect：修改后把位置和尺寸写回数组里视图的那一行"""
+
+    __slots__ = ("view",)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name != "view":
+            self._write_back()
+
+    def _write_back(self):
+        # copy()、move() 等得到的矩形也是 ViewRect，但没有 view，不写回
+        view = getattr(self, "view", None)
+        if view is not None:
+            _set_rect(view, self)
+
+
+def _in_place(name):
+    method = getattr(pygame.Rect, name)
+
+    def write_back(self, *args, **kwargs):
+        method(self, *args, **kwargs)
+        self._write_back()
+
+    write_back.__name__ = name
+    return write_back
+
+
+for _name in ("move_ip", "inflate_ip", "scale_by_ip", "clamp_ip", "union_ip", "unionall_ip",
+              "update", "normalize"):
+    if hasattr(pygame.Rect, _name):
+        setattr(ViewRect, _name, _in_place(_name))
+del _name
+
+
+def _rect(self):
+    store, row = self.store, self.row
+    rect = ViewRect(store.rx[row].item(), store.ry[row].item(), store.w[row].item(), store.h[row].item())
+    rect.view = self
+    return rect
+
+
+def _set_rect(self, rect):
+    store, row = self.store, self.row
+    store.rx[row], store.ry[row], store.w[row], store.h[row] = rect.x, rect.y, rect.width, rect.height
+
+
+@cache
+def _view_class(entity_class, fields):
+    """entity_class 的视图类：fields 里的属性读写数组，rect 由数组拼出（修改会写回），其余属性照常存在实例上"""
+    namespace = {name: _column(name) for name, _ in fields}
+    namespace["rect"] = property(_rect, _set_rect)
+    namespace["__slots__"] = ("store", "row")
+    return type(entity_class.__name__ + "View", (entity_class,), namespace)
+
+
+class EntityStore(ABC):
+    """一种滚动实体的数组存储，用起来和列表一样（按生成顺序排列）
+
+    子类设置 entity_class、fields（存进数组的属性和类型）、alive_field（留下的条件）、
+    pool（拷进数组后原对象还回的对象池），并实现 step。
+    """
+
+    entity_class = None
+    fields = ()
+    alive_field = "is_active"
+    pool = None
+
+    def __init__(self, capacity=STORE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.columns = [name for name, _ in RECT_COLUMNS + self.fields]
+        for name, dtype in RECT_COLUMNS + self.fields:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        # 不存进数组的属性（贴图、血量、随机数流等）照常放在视图实例上
+        self.cold_fields = [name for name in self.entity_class.__slots__
+                            if name != "rect" and name not in self.columns]
+        self.view_class = _view_class(self.entity_class, self.fields)
+        self.views = []       # 第 row 行的视图
+        self.free_views = []  # 过期的视图，下次 append 复用
+
+    # ==================== 和列表一样的接口 ====================
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def append(self, entity):
+        """把 entity 的数据拷进新的一行（entity 还回对象池，之后用容器里的视图）"""
+        if self.count == self.capacity:
+            self._grow()
+        row = self.count
+        rect = entity.rect
+        self.rx[row], self.ry[row], self.w[row], self.h[row] = rect.x, rect.y, rect.width, rect.height
+        for name, _ in self.fields:
+            # 地面金币没有浮动参数，缺的属性按 0 存
+            getattr(self, name)[row] = getattr(entity, name, 0)
+
+        view = self.free_views.pop() if self.free_views else self.view_class.__new__(self.view_class)
+        view.store, view.row = self, row
+        for name in self.cold_fields:
+            if hasattr(entity, name):
+                setattr(view, name, getattr(entity, name))
+        self.views.append(view)
+        self.count += 1
+
+        if self.pool is not None:
+            self.pool.release(entity)
+
+    def extend(self, entities):
+        for entity in entities:
+            self.append(entity)
+
+    def clear(self):
+        self._free(self.views)
+        self.views = []
+        self.count = 0
+
+    # ==================== 数组操作 ====================
+    def column(self, name):
+        """名为 name 的列里正在使用的部分（视图，修改会写回）"""
+        return getattr(self, name)[:self.count]
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in self.columns:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _free(self, views):
+        # 去掉的视图不再对应任何一行：行号之后会给别的实体用，继续读写它会直接报错，
+        # 不会悄悄读到别的实体（或者 count 之后的空行）
+        for view in views:
+            view.store = None
+        room = MAX_FREE_VIEWS - len(self.free_views)
+        if room > 0:
+            self.free_views.extend(views[:room])
+
+    def compact(self):
+        """去掉 alive_field 列为 False 的行，留下的行保持原来的顺序，返回去掉的数量"""
+        alive = self.column(self.alive_field)
+        if alive.all():
+            return 0
+        kept = np.flatnonzero(alive)
+        # alive 是列的视图，下面整理各列时会被改掉，要去掉的行先记下来
+        dropped = np.flatnonzero(~alive)
+        removed = len(dropped)
+        for name in self.columns:
+            column = getattr(self, name)
+            column[:len(kept)] = column[kept]
+
+        # 第一个去掉的行之前的视图行号不变
+        first = int(dropped[0])
+        views = self.views
+        self._free([views[row] for row in dropped])
+        self.views = views[:first] + [views[row] for row in kept[first:]]
+        for row in range(first, len(kept)):
+            self.views[row].row = row
+        self.count = len(kept)
+        return removed
+
+    def overlapping(self, left, right, top=None, bottom=None):
+        """矩形和 [left, right) x [top, bottom) 重叠的视图（不给 top/bottom 时只看横向），保持原来的顺序"""
+        if not self.count:
+            return []
+        rx, w = self.column("rx"), self.column("w")
+        hit = (rx < right) & (rx + w > left)
+        if top is not None:
+            ry, h = self.column("ry"), self.column("h")
+            hit &= (ry < bottom) & (ry + h > top)
+        views = self.views
+        return [views[row] for row in np.flatnonzero(hit)]
+
+    @abstractmethod
+    def step(self, scroll_speed, dt=1.0):
+        """所有行推进一步，去掉过期的行"""
+
+
+class ObstacleStore(EntityStore):
+    """障碍物：整列左移，滚出左边的去掉（对应 Obstacle.move）"""
+
+    entity_class = Obstacle
+    fields = (("x", np.float64), ("prev_x", np.float64), ("is_active", np.bool_))
+    pool = obstacle_pool
+
+    def step(self, scroll_speed, dt=1.0):
+        if not self.count:
+            return
+        x = self.column("x")
+        self.column("prev_x")[:] = x
+        x -= scroll_speed * dt
+        self.column("rx")[:] = np.rint(x)
+        # 移出屏幕后再留一步（和 Obstacle.move 一样）
+        self.column("is_active")[:] = np.rint(self.column("prev_x")) + self.column("w") >= 0
+        self.compact()
+
+
+class CoinStore(EntityStore):
+    """金币：滚动、空中金币浮动、收集动画，过期的去掉（对应 Coin.move）"""
+
+    entity_class = Coin
+    fields = (("x", np.float64), ("prev_x", np.float64), ("y", np.float64), ("prev_y", np.float64),
+              ("is_active", np.bool_), ("is_collected", np.bool_), ("is_ground_coin", np.bool_),
+              ("collect_animation", np.float64), ("max_collect_animation", np.float64),
+              ("original_y", np.float64), ("float_timer", np.float64), ("float_speed", np.float64),
+              ("float_amplitude", np.float64))
+    pool = coin_pool
+
+    def step(self, scroll_speed, dt=1.0):
+        if not self.count:
+            return
+        x, y = self.column("x"), self.column("y")
+        self.column("prev_x")[:] = x
+        self.column("prev_y")[:] = y
+        collected = self.column("is_collected")
+        rolling = ~collected
+
+        # 金币与背景同步滚动，空中金币上下浮动
+        x[rolling] -= scroll_speed * dt
+        floating = rolling & ~self.column("is_ground_coin")
+        timer = self.column("float_timer")
+        timer[floating] += self.column("float_speed")[floating] * dt
+        phase = timer[floating].astype(np.int64) % SINE.steps
+        y[floating] = self.column("original_y")[floating] + SINE_TABLE[phase] * self.column("float_amplitude")[floating]
+
+        # 收集动画：向上飘并左右晃动
+        animation = self.column("collect_animation")
+        if collected.any():
+            animation[collected] += dt
+            y[collected] -= 2 * dt
+            x[collected] += WOBBLE_TABLE[animation[collected].astype(np.int64) % COIN_WOBBLE.steps] * dt
+
+        self.column("rx")[:] = np.rint(x)
+        self.column("ry")[:] = np.rint(y)
+        # 滚出屏幕后再留一步（和 Coin.move 一样）
+        self.column("is_active")[:] = np.where(collected, animation < self.column("max_collect_animation"),
+                                               np.rint(self.column("prev_x")) + self.column("w") >= 0)
+        self.compact()
+
+
+class MonsterStore(EntityStore):
+    """绵羊：活着的整列左移（叠加自身速度）、攻击冷却和动画帧推进，死了或滚出左边的去掉（对应 Monster.update）"""
+
+    entity_class = Monster
+    fields = (("x", np.float64), ("prev_x", np.float64), ("speed", np.float64), ("is_alive", np.bool_),
+              ("attack_cooldown", np.float64), ("animation_frame", np.float64))
+    alive_field = "is_alive"
+
+    def step(self, scroll_speed, dt=1.0):
+        if not self.count:
+            return
+        alive = self.column("is_alive")
+        x = self.column("x")
+        self.column("prev_x")[alive] = x[alive]
+        x[alive] -= (scroll_speed + self.column("speed")[alive]) * dt
+        rx = self.column("rx")
+        rx[alive] = np.rint(x[alive])
+
+        cooldown = self.column("attack_cooldown")
+        cooling = alive & (cooldown > 0)
+        cooldown[cooling] -= dt
+        frame = self.column("animation_frame")
+        frame[alive] = (frame[alive] + dt) % 60
+
+        alive &= np.rint(self.column("prev_x")) + self.column("w") >= 0
+        self.compact()
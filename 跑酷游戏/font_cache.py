@@ -0,0 +1,86 @@
+# font_cache.py
+"""字体和文字渲染缓存
+
+- FontRegistry：每个 (字体路径, 字号) 只加载一次
+- TextCache：按 (字体, 文字, 颜色, 抗锯齿) 缓存渲染好的文字 Surface（LRU 淘汰）
+
+缓存返回的 Surface 是共享的，调用方不要直接修改它（需要改透明度时先 copy）。
+"""
+from collections import OrderedDict
+
+import pygame
+
+DEFAULT_FONT_PATH = 'image/STKAITI.TTF'
+
+
+class FontRegistry:
+    """字体注册表：同一路径和字号的字体只创建一次"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, path=DEFAULT_FONT_PATH):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        return font
+
+    def clear(self):
+        self.fonts.clear()
+
+
+class TextCache:
+    """渲染文字的 LRU 缓存，带命中/未命中计数"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # 淘汰最久未使用的文字
+        return surface
+
+    def stats(self):
+        """返回缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# 全局共享实例
+font_registry = FontRegistry()
+text_cache = TextCache()
+
+
+def get_font(size, path=DEFAULT_FONT_PATH):
+    """获取（缓存的）字体对象"""
+    return font_registry.get(size, path)
+
+
+def render_text(font, text, color, antialias=True):
+    """通过文字缓存渲染文字"""
+    return text_cache.render(font, text, color, antialias)
@@ -0,0 +1,84 @@
+# glyph_atlas.py
+"""数字字形图集
+
+HUD 上的分数、生命、金币每帧都在变，整串文字缓存基本命中不了。
+这里把数字和常用符号预先渲染到一张图集上，标签前缀（"分数: " 等）也只渲染一次，
+显示数字时按字符逐个从图集 blit，不再每帧调用 font.render。
+"""
+import pygame
+
+from font_cache import render_text
+
+GLYPH_CHARS = "0123456789/.-+×"
+
+
+class GlyphAtlas:
+    """单一字体和颜色的字形图集"""
+
+    def __init__(self, font, color, chars=GLYPH_CHARS):
+        self.font = font
+        self.color = tuple(color)
+        self.height = font.get_height()
+        self.glyph_areas = {}  # 字符 -> 图集中的区域
+        self.labels = {}       # 标签文字 -> Surface
+
+        glyphs = [(ch, font.render(ch, True, self.color)) for ch in chars]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        self.surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+
+        x = 0
+        for ch, glyph in glyphs:
+            self.surface.blit(glyph, (x, 0))
+            self.glyph_areas[ch] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def label(self, text):
+        """获取（只渲染一次的）标签文字"""
+        surface = self.labels.get(text)
+        if surface is None:
+            surface = render_text(self.font, text, self.color)
+            self.labels[text] = surface
+        return surface
+
+    def measure(self, label, value):
+        """计算 标签+数字 的显示宽度"""
+        width = self.label(label).get_width() if label else 0
+        for ch in value:
+            width += self.glyph_areas[ch].width
+        return width
+
+    def draw(self, surface, label, value, pos, anchor="topleft"):
+        """绘制 标签+数字，返回占用的矩形
+
+        value 只能包含图集里的字符（数字和 GLYPH_CHARS 中的符号）。
+        """
+        value = str(value)
+        rect = pygame.Rect(0, 0, self.measure(label, value), self.height)
+        setattr(rect, anchor, pos)
+
+        x = rect.x
+        if label:
+            label_surface = self.label(label)
+            surface.blit(label_surface, (x, rect.y))
+            x += label_surface.get_width()
+
+        blits = []
+        for ch in value:
+            area = self.glyph_areas[ch]
+            blits.append((self.surface, (x, rect.y), area))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+        return rect
+
+
+_atlases = {}
+
+
+def get_glyph_atlas(font, color):
+    """获取（缓存的）字体+颜色对应的字形图集"""
+    key = (font, tuple(color))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(font, color)
+        _atlases[key] = atlas
+    return atlas
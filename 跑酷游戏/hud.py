@@ -0,0 +1,110 @@
+# hud.py
+"""保留式 HUD 图层
+
+HUD 各区域（分数、最高分、生命条、金币、物品效果）画在一张常驻的透明 Surface 上，
+每帧只重绘数值发生变化的区域，再把整张图层一次 blit 到屏幕。
+dirty_count 记录上一次合成时重绘了几个区域，方便确认每帧的工作量。
+游戏里各区域的位置由 game_hud_layout 按字体高度排开，互不重叠，
+所以只有分数变化时每帧只重绘一个区域（见 benchmarks/bench_hud.py）。
+"""
+import pygame
+
+# 物品效果每行的高度和最多显示的行数
+EFFECT_LINE_HEIGHT = 28
+EFFECT_LINES = 3
+
+
+def game_hud_layout(medium_height, small_height, ui_height):
+    """游戏 HUD 各区域的边界 [(名字, Rect), ...]（按绘制顺序）
+
+    左侧从上到下依次是分数、最高分、生命条、物品效果，右上角是金币；
+    字体比预想的高时往下顺延，保证区域之间不重叠。
+    """
+    score = pygame.Rect(20, 10, 360, medium_height)
+    high_score = pygame.Rect(20, max(50, score.bottom), 360, medium_height)
+    health = pygame.Rect(10, max(90, high_score.bottom), 370, 25 + small_height)
+    effects = pygame.Rect(10, health.bottom + 5, 370,
+                          EFFECT_LINE_HEIGHT * (EFFECT_LINES - 1) + small_height)
+    coins = pygame.Rect(380, 20, 400, ui_height)
+    return [("score", score), ("high_score", high_score), ("health", health),
+            ("coins", coins), ("effects", effects)]
+
+
+class HudRegion:
+    """HUD 上的一个区域：固定的边界矩形 + 当前显示内容的 key"""
+
+    def __init__(self, name, bounds):
+        self.name = name
+        self.bounds = pygame.Rect(bounds)
+        self.key = None          # 已绘制内容对应的值
+        self.pending_key = None  # 本帧提交的值
+        self.draw_fn = None
+        self.drawn = False
+
+
+class HudCompositor:
+    def __init__(self, size=(800, 200)):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.regions = []
+        self.region_map = {}
+
+        # 统计
+        self.dirty_count = 0     # 最近一次合成重绘的区域数
+        self.total_redraws = 0
+        self.frames = 0
+
+    def add_region(self, name, bounds):
+        """登记一个区域（按登记顺序绘制，后登记的在上层）"""
+        region = HudRegion(name, bounds)
+        self.regions.append(region)
+        self.region_map[name] = region
+        return region
+
+    def update(self, name, key, draw_fn):
+        """提交区域本帧的值和绘制函数 draw_fn(surface, bounds)，值没变时不会重绘"""
+        region = self.region_map[name]
+        region.pending_key = key
+        region.draw_fn = draw_fn
+
+    def invalidate(self):
+        """强制下一帧重绘全部区域"""
+        for region in self.regions:
+            region.drawn = False
+
+    def compose(self):
+        """重绘值发生变化的区域，返回重绘的区域数"""
+        dirty = [r for r in self.regions if not r.drawn or r.key != r.pending_key]
+
+        # 区域之间可能重叠，清除一个区域会擦掉重叠部分，需要把它们一起重绘
+        changed = bool(dirty)
+        while changed:
+            changed = False
+            for region in self.regions:
+                if region in dirty:
+                    continue
+                if any(region.bounds.colliderect(d.bounds) for d in dirty):
+                    dirty.append(region)
+                    changed = True
+
+        for region in dirty:
+            self.surface.fill((0, 0, 0, 0), region.bounds)
+
+        for region in self.regions:
+            if region not in dirty:
+                continue
+            if region.draw_fn is not None:
+                self.surface.set_clip(region.bounds)
+                region.draw_fn(self.surface, region.bounds)
+                self.surface.set_clip(None)
+            region.key = region.pending_key
+            region.drawn = True
+
+        self.dirty_count = len(dirty)
+        self.total_redraws += len(dirty)
+        self.frames += 1
+        return self.dirty_count
+
+    def draw(self, screen):
+        """合成并把 HUD 图层绘制到屏幕"""
+        self.compose()
+        screen.blit(self.surface, (0, 0))
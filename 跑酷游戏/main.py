@@ -1,20 +1,34 @@
 # main.py
 import pygame
+import os
 import sys
 import time
-import os
-import random
-from player import Player
-from obstacle import ObstacleManager
-from coin import CoinManager
+from anim_curves import EASE_OUT, FADE_OUT
+from coin import load_collect_sound
 from save_system import SaveSystem
-from battle_system import BattleBullet, BattleMonster
-from enemy import EnemyManager
+from world import World, TickInput
+from asset_manager import asset_manager
+from texture_atlas import TextureAtlas, ATLAS_MANIFEST
+from font_cache import get_font, render_text
+from glyph_atlas import get_glyph_atlas
+from hud import EFFECT_LINE_HEIGHT, HudCompositor, game_hud_layout
+from render_queue import RenderQueue
+from background import ParallaxBackground, load_background_layer
+from particles import particle_system
+from timestep import FixedTimestep
+from replay import Replay, ReplayRecorder, ReplayPlayer, LAST_RUN_PATH
+from checksum import ChecksumLog, checksum_path
 
 
 # 初始化pygame
 pygame.init()
 
+# 使用脏矩形模式绘制的静态界面（内容只在点击/按键后变化）
+STATIC_SCREENS = ("title", "load_save", "saves_list", "menu", "shop")
+# 金币飘字持续的帧数和上升的像素数
+COIN_EFFECT_FRAMES = 30
+COIN_EFFECT_RISE = 30
+
 
 class Game:
     def __init__(self):
@@ -23,6 +37,8 @@ class Game:
         self.screen = pygame.display.set_mode((800, 600))
         pygame.display.set_caption("跑酷游戏")
         self.clock = pygame.time.Clock()
+        asset_manager.attach_atlas(TextureAtlas.from_manifest(ATLAS_MANIFEST))
+        asset_manager.preload()
 
         # 2. 游戏状态
         self.state = "title"  # 可能的状态: title, menu, shop, playing, battle, paused, game_over, load_save, saves_list
@@ -30,17 +46,18 @@ class Game:
         self.paused_state = None
 
         # 3. 游戏核心对象
-        self.player = None
-        self.obstacle_manager = ObstacleManager()
-        self.coin_manager = CoinManager(self.obstacle_manager)
+        self.world = None  # 一局游戏的模拟状态，不在游戏中时为 None
+        self.run_seed = None  # 固定的随机种子（用来重现某一局），None 表示每局随机
+        self.recorder = None  # 本局的录像（每局结束写到 LAST_RUN_PATH）
+        self.replay_player = None  # 正在重放的录像，重放时不读键盘
         self.save_system = SaveSystem()
-        self.enemy_manager = EnemyManager()
+        # 下一步模拟的输入（按键事件先记在这里）
+        self.pending_jump = False
+        self.pending_shoot = False
 
         # 4. 游戏数据
-        self.score = 0
         self.high_score = 0
         self.coins = 0
-        self.current_game_coins = 0
         self.game_over_time = 0
 
         # 5. 角色系统
@@ -59,33 +76,27 @@ class Game:
         ]
         self.purchased_items = []
 
-        # 7. 物品效果状态
-        self.extra_life_active = False
-        self.extra_life_used = False
-        self.coin_double_active = False
-        self.star_effect_active = False
-        self.stars = []  # 星星粒子效果列表
-
-        # 8. 背景系统（修改为三层背景）
-        self.bg_layers = self.load_background_layers()  # 三层背景
-        # 每层背景的x坐标（初始位置）
-        self.bg1_x1, self.bg1_x2 = 0, 800  # 远层（最慢）
-        self.bg2_x1, self.bg2_x2 = 0, 800  # 中层（中速）
-        self.bg3_x1, self.bg3_x2 = 0, 800  # 近层（最快）
-        # 每层背景的移动速度（可自定义）
-        self.bg_speeds = {
-            "bg1": 2,  # 远层：最慢
-            "bg2": 5,  # 中层：中速
-            "bg3": 8  # 近层：最快（原速度）
+        # 8. 背景系统（三层视差背景）
+        # 每层背景的移动速度，按滚动速度的比例（可自定义，滚动速度 8 时为 2/5/8）
+        self.bg_speed_factors = {
+            "bg1": 2 / 8,  # 远层：最慢
+            "bg2": 5 / 8,  # 中层：中速
+            "bg3": 1.0  # 近层：最快（与地面同速）
         }
+        self.background = ParallaxBackground(800)
+        bg_layers = self.load_background_layers()
+        for layer_name, speed_factor in self.bg_speed_factors.items():
+            self.background.add_layer(layer_name, bg_layers[layer_name], speed_factor)
         self.menu_background = self.load_uibackground()
         self.shop_background = self.load_shop_background()
 
         # 9. 字体系统
-        self.font = pygame.font.Font('image/STKAITI.TTF', 48)
-        self.medium_font = pygame.font.Font('image/STKAITI.TTF', 36)
-        self.small_font = pygame.font.Font('image/STKAITI.TTF', 24)
-        self.ui_font = pygame.font.Font('image/STKAITI.TTF', 28)
+        self.font = get_font(48)
+        self.medium_font = get_font(36)
+        self.small_font = get_font(24)
+        self.ui_font = get_font(28)
+        self.hud = self.create_hud()
+        self.render_queue = RenderQueue()
 
         # 10. 存档系统相关
         self.save_list_offset = 0
@@ -97,29 +108,37 @@ class Game:
         self.coin_effect_text = ""
         self.coin_effect_pos = (0, 0)
         self.show_coin_effect = False
+        self.coin_effect_frames = {}  # 飘字文字 -> 每一帧的贴图（透明度按 FADE_OUT 预先生成）
+        self.collect_sound = None
+        self.collect_sound_loaded = False
 
         # 12. 鼠标系统
         self.mouse_pos = (0, 0)
 
-        # 13. 帧率控制
+        # 静态界面的脏矩形状态
+        self.static_screen_valid = False
+        self.static_screen_key = None
+        self.static_hovered = ()
+        self.static_base = None        # 没有悬停时的完整画面
+        self.static_hover_tiles = {}   # 按钮序号 -> [(矩形, 悬停时这块区域的画面), ...]
+
+        # 暂停/游戏结束的定格画面
+        self.frozen_frame = None
+        self.frozen_frame_state = None
+        self.countdown_value = None
+        self.countdown_rect = None
+
+        # 13. 帧率控制（target_fps 只限制绘制频率，模拟按固定步长推进）
         self.target_fps = 60
-        self.last_frame_time = 0
+        self.timestep = FixedTimestep()
+        self.render_alpha = 1.0  # 绘制时在上一步和当前位置之间的插值系数
         self.frame_count = 0
         self.frame_timer = 0
         # 14. 加载商店图片
         self.shop_images = self.load_shop_images()
 
-        # 15. 战斗系统
+        # 15. 战斗系统（打怪的逻辑在 World 中）
         self.max_health = 100
-        self.player_health = self.max_health
-        self.battle_thresholds = [1000, 3000, 5000]
-        self.completed_battles = set()
-        self.battle_monster = None
-        self.player_bullets = []
-        self.monster_bullets = []
-        self.player_shoot_cooldown = 0
-        self.monster_fire_interval = 45
-        self.battle_score_reward = 200
         self.battle_assets = self.load_battle_assets()
 
     # ==================== 资源加载方法 ====================
@@ -136,37 +155,26 @@ class Game:
         for layer_name, path in bg_paths.items():
             try:
                 # 区分 PNG（透明）和其他格式（非透明）
-                if path.lower().endswith('.png'):
-                    background = pygame.image.load(path).convert_alpha()  # 保留透明通道
-                else:
-                    background = pygame.image.load(path).convert()
-                background = pygame.transform.scale(background, (800, 600))
+                background = load_background_layer(path, (800, 600), alpha=path.lower().endswith('.png'))
                 bg_layers[layer_name] = background
                 print(f"成功加载{layer_name}背景: {path}")
             except Exception as e:
-                # 异常时也用 convert_alpha 加载默认背景（如果默认背景是PNG）
+                # 异常时加载默认背景（PNG，保留透明通道）
                 print(f"加载{layer_name}失败({e})，使用默认背景")
-                if '像素背景.png'.endswith('.png'):
-                    background = pygame.image.load('image/像素背景.png').convert_alpha()
-                else:
-                    background = pygame.image.load('image/像素背景.png').convert()
-                background = pygame.transform.scale(background, (800, 600))
-                bg_layers[layer_name] = background
+                bg_layers[layer_name] = load_background_layer('image/像素背景.png', (800, 600))
         return bg_layers
 
     def load_uibackground(self):
         """加载UI背景图片"""
         uibackground_path = 'image/背景.jpg'
-        uibackground = pygame.image.load(uibackground_path).convert()
-        uibackground = pygame.transform.scale(uibackground, (800, 600))
+        uibackground = asset_manager.load(uibackground_path, (800, 600), alpha=False)
         print(f"成功加载UI背景: {uibackground_path}")
         return uibackground
 
     def load_shop_background(self):
         """加载商店背景图片"""
         background_path = 'image/shop.png'
-        background = pygame.image.load(background_path).convert()
-        background = pygame.transform.scale(background, (800, 600))
+        background = asset_manager.load(background_path, (800, 600), alpha=False)
         print(f"成功加载商店背景: {background_path}")
         return background
 
@@ -181,9 +189,7 @@ class Game:
 
 
         for item_type, path in item_images.items():
-            image = pygame.image.load(path).convert_alpha()
-            image = pygame.transform.scale(image, (80, 80))
-            shop_images[item_type] = image
+            shop_images[item_type] = asset_manager.load(path, (80, 80))
             print(f"成功加载商店图片: {path}")
 
         return shop_images
@@ -211,10 +217,9 @@ class Game:
             return surface
 
         for key, path in paths.items():
-            if os.path.exists(path):
-                loaded = pygame.image.load(path).convert_alpha()
-                target_size = placeholder_sizes[key]
-                assets[key] = pygame.transform.scale(loaded, target_size)
+            loaded = asset_manager.try_load(path, placeholder_sizes[key])
+            if loaded:
+                assets[key] = loaded
             else:
                 # 使用占位图，确保战斗元素始终可见
                 color = (255, 200, 80) if "bullet" in key else (200, 120, 120)
@@ -225,18 +230,19 @@ class Game:
     # ==================== 游戏核心控制方法 ====================
     def run(self):
         """运行游戏主循环"""
+        frame_time = 0
         while self.running:
-            current_time = pygame.time.get_ticks()
-
-            # 计算帧时间
-            frame_time = current_time - self.last_frame_time
-            self.last_frame_time = current_time
-
             self.handle_events()
-            self.update()
+            # 游戏帧内不应该再读盘（见 asset_manager.gameplay_reads）
+            asset_manager.in_gameplay = self.state in ("playing", "battle")
+
+            # 按经过的时间走若干个固定步长，剩下不足一步的时间用于插值绘制
+            for _ in range(self.timestep.advance(frame_time)):
+                self.update(self.timestep.dt)
+            self.render_alpha = self.timestep.alpha
             self.draw()
 
-            self.clock.tick(self.target_fps)
+            frame_time = self.clock.tick(self.target_fps)
 
         # 退出游戏
         pygame.quit()
@@ -248,63 +254,61 @@ class Game:
         if not self.selected_character:
             self.selected_character = 1
 
-        # 应用购买的物品效果
-        self.apply_purchased_items()
-
-        # 创建玩家对象
+        # 创建这一局的模拟世界（应用购买的物品效果）
         ability = self.character_abilities[self.selected_character]
-        animation_folder = self.character_animation_folders[self.selected_character]
-
-        self.player = Player(100, 250,
-                             can_double_jump=ability["can_double_jump"],
-                             player_id=self.selected_character,
-                             image_folder=animation_folder,
-                             shoot_image_path="image/player_shoot.png")
-
-        self.score = 0
-        self.current_game_coins = 0
-        self.obstacle_manager.clear()
-        self.coin_manager.clear()
-        self.enemy_manager.reset()
-        self.stars = []  # 清空星星特效
-        self.player_health = self.max_health
-        self.completed_battles = set()
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
-        self.battle_monster = None
-        self.state = "playing"
+        config = dict(character_id=self.selected_character,
+                      can_double_jump=ability["can_double_jump"],
+                      max_health=self.max_health,
+                      **self.apply_purchased_items())
+        self.world = World(image_folder=self.character_animation_folders[self.selected_character],
+                           battle_assets=self.battle_assets,
+                           seed=self.run_seed,
+                           **config)
+        print(f"本局随机种子: {self.world.seed}")
+        self.recorder = ReplayRecorder(Replay(self.world.seed, self.timestep.tick_rate, **config))
+        self.replay_player = None
+        self.begin_world()
+
+    def start_replay(self, path):
+        """在窗口里按正常速度重放一局录像"""
+        replay = Replay.load(path)
+        sum_path = checksum_path(path)
+        expected = ChecksumLog.load(sum_path) if os.path.exists(sum_path) else None
+        self.selected_character = replay.character_id
+        self.world = replay.make_world(image_folder=self.character_animation_folders[replay.character_id],
+                                       battle_assets=self.battle_assets)
+        self.replay_player = ReplayPlayer(replay, self.world, expected)
+        self.recorder = None
+        self.timestep = FixedTimestep(replay.tick_rate)
+        self.begin_world()
+
+    def begin_world(self):
+        """新的一局开始前清理上一局的表现状态"""
+        # 模拟不读图片，玩家贴图在这里（开始计算游戏内读盘之前）加载
+        self.world.player.load_sprites()
+        particle_system.clear()  # 清空星星等粒子特效
+        self.show_coin_effect = False
+        self.pending_jump = False
+        self.pending_shoot = False
 
         # 进入游戏状态
         self.state = "playing"
 
     def reset_game(self):
         """重置游戏"""
-        if self.player:
-            self.player.reset_position(100, 250)
-            self.player.health = 3
-            self.player.is_invincible = False
-            self.player.buff_timer = 0
-
-        self.obstacle_manager.clear()
-        self.coin_manager.clear()
-        self.enemy_manager.reset()
-        self.stars = []
-        # 重置当前游戏数据
-        self.score = 0
-        self.current_game_coins = 0
-        self.player_health = self.max_health
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
-        self.battle_monster = None
-        self.completed_battles = set()
-        if self.player:
-            self.player.set_force_shoot_pose(False)
+        if self.world:
+            self.world.release()  # 实体还回对象池，下一局复用
+        self.world = None
+        particle_system.clear()
+        self.show_coin_effect = False
+
+        # 录像：重放结束后恢复正常的步频
+        if self.replay_player:
+            self.replay_player = None
+            self.timestep = FixedTimestep()
+        self.recorder = None
 
         # 重置物品效果
-        self.extra_life_active = False
-        self.coin_double_active = False
-        self.star_effect_active = False
-        self.extra_life_used = False
         self.purchased_items = []
         self.paused_state = None
 
@@ -316,13 +320,18 @@ class Game:
                 self.running = False
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.static_screen_valid = False  # 点击可能改变界面内容
                 if event.button == 1:  # 左键点击
                     self.mouse_pos = event.pos
                     self.handle_mouse_click()
 
             elif event.type == pygame.KEYDOWN:
+                self.static_screen_valid = False
                 self.handle_keydown(event)
 
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.static_screen_valid = False
+
         # 更新鼠标位置
         self.mouse_pos = pygame.mouse.get_pos()
 
@@ -334,12 +343,11 @@ class Game:
         if self.state in ("playing", "battle"):
             self.handle_playing_keydown(event)
     def handle_playing_keydown(self, event):
-        """游戏中按键处理"""
+        """游戏中按键处理（记到下一步模拟的输入里）"""
         if event.key == pygame.K_SPACE:
-            if self.player:
-                self.player.jump()
+            self.pending_jump = True
         elif event.key == pygame.K_f:
-            self.attempt_player_shoot()
+            self.pending_shoot = True
 
     def handle_mouse_click(self):
         """处理鼠标点击"""
@@ -508,21 +516,15 @@ class Game:
             print(f"购买了 {item['name']}，花费 {item['price']} 金币")
 
     def apply_purchased_items(self):
-        """应用购买的物品效果"""
-        self.extra_life_active = False
-        self.coin_double_active = False
-        self.star_effect_active = False
-        self.extra_life_used = False
+        """应用购买的物品效果，返回传给 World 的物品开关"""
+        effects = {"extra_life": False, "coin_double": False, "star_effect": False}
 
         for item in self.purchased_items:
-            if item["type"] == "extra_life":
-                self.extra_life_active = True
-            elif item["type"] == "coin_double":
-                self.coin_double_active = True
-            elif item["type"] == "star_effect":
-                self.star_effect_active = True
+            if item["type"] in effects:
+                effects[item["type"]] = True
 
         # 购买记录会在游戏开始后清空
+        return effects
 
     # ==================== 存档系统方法 ====================
     def update_game_data_from_save(self):
@@ -533,12 +535,10 @@ class Game:
                 self.coins = save_info["total_coins"]
 
     # ==================== 游戏更新方法 ====================
-    def update(self):
-        """更新游戏状态"""
-        if self.state == "playing":
-            self.update_playing()
-        elif self.state == "battle":
-            self.update_battle()
+    def update(self, dt=1.0):
+        """模拟一步（dt 以 60 帧/秒的一帧为单位）"""
+        if self.state in ("playing", "battle"):
+            self.update_world(dt)
         elif self.state == "paused":
             pass
         elif self.state == "game_over":
@@ -546,222 +546,99 @@ class Game:
         elif self.state == "shop":
             self.update_shop()
 
-    def update_playing(self):
-        """更新游戏进行状态"""
-        # 获取背景滚动速度
-        scroll_speed = 8
-
-        # 玩家射击冷却
-        if self.player_shoot_cooldown > 0:
-            self.player_shoot_cooldown -= 1
+    def update_world(self, dt=1.0):
+        """用这一帧的输入推进模拟一步，再处理它产生的事件"""
+        world = self.world
+        if self.replay_player:
+            # 重放：输入来自录像，放完就结束这一局
+            tick_input = self.replay_player.next_input()
+            if tick_input is None:
+                self.finish_game()
+                return
+        else:
+            keys = pygame.key.get_pressed()
+            tick_input = TickInput(jump=self.pending_jump, shoot=self.pending_shoot or keys[pygame.K_f])
+            if self.recorder:
+                self.recorder.record(tick_input)
+        self.pending_jump = False
+        self.pending_shoot = False
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_f]:
-            self.attempt_player_shoot()
+        world.step(tick_input, dt)
+        if self.replay_player:
+            self.replay_player.record_state()
+        elif self.recorder:
+            self.recorder.record_state(world)
+        for event in world.events:
+            self.handle_world_event(event)
 
-        # 更新背景滚动
-        self.update_background()
-
-        # 更新玩家
-        if self.player:
-            self.player.update()
-
-        # 更新障碍物
-        self.obstacle_manager.update(scroll_speed, self.coin_manager)
-
-        # 更新金币
-        self.coin_manager.update(scroll_speed)
-
-        # 更新敌人和子弹
-        player_hit = self.enemy_manager.update(scroll_speed, self.player.rect if self.player else None)
-
-        # 检测金币收集
-        if self.player:
-            # 计算金币倍数
-            coin_multiplier = 2 if self.coin_double_active else 1
-            collected = self.coin_manager.check_collections(self.player.rect)
-            if collected > 0:
-                # 应用金币翻倍效果
-                collected *= coin_multiplier
-                # 每次收集的金币累加到总金币数
-                self.coins += collected
-                self.current_game_coins += collected
-                self.score += collected * 10
-
-                # 显示金币收集效果
-                self.show_coin_effect = True
-                self.coin_effect_timer = 30
-                self.coin_effect_text = f"+{collected}" if coin_multiplier == 1 else f"+{collected // coin_multiplier}×{coin_multiplier}"
-                self.coin_effect_pos = (self.player.rect.x, self.player.rect.y - 50)
-
-        self.score += 0.1
-
-        # 检查是否需要进入战斗
-        self.try_trigger_battle()
-        if self.state == "battle":
-            return
+        # 跑酷时背景滚动，打怪时保持静止
+        self.background.update(world.scroll_speed if world.state == "playing" else 0, dt)
+
+        # 更新星星特效和其他粒子
+        if world.star_effect_active and world.state == "playing":
+            self.update_star_effect(dt)
+        particle_system.update(dt)
 
-        # 检测碰撞
-        if self.player:
-            hits = self.obstacle_manager.check_collisions(self.player.rect)
-            if hits:
-                if self.extra_life_active and not self.extra_life_used:
-                    self.extra_life_used = True
-                else:
-                    self.apply_damage(1)
-
-            if player_hit:
-                self.apply_damage(1)        # 更新星星特效
-        if self.star_effect_active and self.player:
-            self.update_star_effect()
-
-        # 更新金币收集效果
+        # 更新金币收集效果（文字向上飘，位置和透明度在绘制时按进度取曲线）
         if self.show_coin_effect:
-            self.coin_effect_timer -= 1
+            self.coin_effect_timer -= dt
             if self.coin_effect_timer <= 0:
                 self.show_coin_effect = False
 
-    def try_trigger_battle(self):
-        """当分数达到阈值时进入打怪状态"""
-        for threshold in self.battle_thresholds:
-            if self.score >= threshold and threshold not in self.completed_battles:
-                self.start_battle(threshold)
-                break
-
-    def start_battle(self, threshold):
-        """开启打怪状态"""
-        self.state = "battle"
-        ground_y = 400 - 80  # 与玩家同一地面高度
-        self.battle_monster = BattleMonster(600, ground_y,
-                                            image=self.battle_assets.get("monster"),
-                                            health=20)
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
-        self.player_shoot_cooldown = 0
-        self.current_battle_threshold = threshold
-        if self.player:
-            self.player.set_force_shoot_pose(True)
-
-    def end_battle(self, victory=True):
-        """结束战斗并返回跑酷"""
-        if victory:
-            self.score += self.battle_score_reward
-            if hasattr(self, "current_battle_threshold"):
-                self.completed_battles.add(self.current_battle_threshold)
-        self.state = "playing"
-        self.battle_monster = None
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
-        if self.player:
-            self.player.set_force_shoot_pose(False)
-
-    def update_battle(self):
-        """战斗状态更新"""
-        # 背景不滚动，保持静止
-        if self.player:
-            self.player.update()
+        if world.state == "game_over":
+            self.finish_game()
+        else:
+            self.state = world.state
+
+    def handle_world_event(self, event):
+        """把模拟产生的事件变成粒子、音效和飘字"""
+        kind = event[0]
+        if kind == "coin_pickup":
+            particle_system.emit_coin_pickup(event[1], rng=self.world.rng.stream("particles"))
+            self.play_collect_sound()
+        elif kind == "coins":
+            collected, coin_multiplier = event[1], event[2]
+            # 每次收集的金币累加到总金币数
+            self.coins += collected
+
+            # 显示金币收集效果
+            player_rect = self.world.player.rect
+            self.show_coin_effect = True
+            self.coin_effect_timer = COIN_EFFECT_FRAMES
+            self.coin_effect_text = f"+{collected}" if coin_multiplier == 1 else f"+{collected // coin_multiplier}×{coin_multiplier}"
+            self.coin_effect_pos = (player_rect.x, player_rect.y - 50)
+        elif kind == "hit":
+            particle_system.emit_hit(event[1], rng=self.world.rng.stream("particles"))
+        elif kind == "monster_death":
+            particle_system.emit_monster_death(event[1], event[2], rng=self.world.rng.stream("particles"))
+
+    def play_collect_sound(self):
+        """播放金币音效（第一次播放时才加载）"""
+        if not self.collect_sound_loaded:
+            self.collect_sound = load_collect_sound()
+            self.collect_sound_loaded = True
+        if self.collect_sound:
+            self.collect_sound.play()
 
-        # 玩家射击冷却
-        if self.player_shoot_cooldown > 0:
-            self.player_shoot_cooldown -= 1
+    def finish_game(self):
+        """一局结束：进入游戏结束画面并写入存档"""
+        self.state = "game_over"
+        self.game_over_time = time.time()
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_f]:
-            self.attempt_player_shoot()
-
-        # 怪物攻击节奏
-        if self.battle_monster:
-            self.battle_monster.update()
-            if self.battle_monster.ready_to_fire():
-                self.fire_monster_bullet()
-                self.battle_monster.reset_fire_cooldown(self.monster_fire_interval)
-
-        # 更新子弹
-        self.update_bullets()
-
-        # 检测玩家是否死亡
-        if self.player_health <= 0:
-            self.state = "game_over"
-            self.game_over_time = time.time()
-
-
-        # 检测怪物是否死亡
-        if self.battle_monster and not self.battle_monster.alive:
-            self.end_battle(True)
-
-    def fire_player_bullet(self):
-        """生成玩家子弹"""
-        if not self.player:
+        world = self.world
+        if self.replay_player:
+            # 重放不写存档，只报告和录像时的状态是否一致
+            print(f"重放结束：{self.replay_player.report()}")
             return
-        bullet = BattleBullet(
-            self.player.rect.right,
-            self.player.rect.centery - 5,
-            speed=12,
-            direction="right",
-            image=self.battle_assets.get("player_bullet")
-        )
-        self.player_bullets.append(bullet)
-        self.player.trigger_shooting_pose(10)
-
-    def fire_monster_bullet(self):
-        """生成怪物子弹"""
-        if not self.battle_monster:
-            return
-        bullet = BattleBullet(
-            self.battle_monster.rect.left - 20,
-            self.battle_monster.rect.centery - 5,
-            speed=8,
-            direction="left",
-            image=self.battle_assets.get("monster_bullet")
-        )
-        self.monster_bullets.append(bullet)
-
-    def attempt_player_shoot(self):
-        """根据当前状态尝试发射玩家子弹"""
-        if not self.player or self.player_shoot_cooldown > 0:
-            return
-
-        if self.state == "battle":
-            self.fire_player_bullet()
-        elif self.state == "playing":
-            self.enemy_manager.spawn_player_bullet(self.player.rect, self.player.attack_power)
-            self.player.trigger_shooting_pose(10)
-        else:
-            return
-
-        self.player_shoot_cooldown = 12
-
-    def update_bullets(self):
-        """更新战斗子弹并处理碰撞"""
-        for bullet in self.player_bullets:
-            bullet.update()
-            if self.battle_monster and bullet.active and bullet.rect.colliderect(self.battle_monster.rect):
-                self.battle_monster.take_hit(bullet.damage)
-                bullet.active = False
-
-        for bullet in self.monster_bullets:
-            bullet.update()
-            if self.player and bullet.active and bullet.rect.colliderect(self.player.rect):
-                bullet.active = False
-                self.apply_damage(1)
-
-        self.player_bullets = [b for b in self.player_bullets if b.active]
-        self.monster_bullets = [b for b in self.monster_bullets if b.active]
-
-    def apply_damage(self, amount):
-        """统一的扣血逻辑"""
-        self.player_health = max(0, self.player_health - amount)
-        if self.player_health <= 0:
-            self.state = "game_over"
-            self.game_over_time = time.time()
-
-            if self.save_system.current_save:
-                final_coins = self.current_game_coins
-                if self.coin_double_active:
-                    final_coins *= 2
-                self.save_system.update_save(self.score, final_coins, self.selected_character)
-                self.update_game_data_from_save()
-
+        if self.recorder:
+            self.recorder.save(LAST_RUN_PATH)
+            print(f"本局录像已保存: {LAST_RUN_PATH}")
+        if self.save_system.current_save:
+            final_coins = world.current_game_coins
+            if world.coin_double_active:
+                final_coins *= 2
+            self.save_system.update_save(world.score, final_coins, self.selected_character)
+            self.update_game_data_from_save()
 
     def update_game_over(self):
         """更新游戏结束状态"""
@@ -775,69 +652,34 @@ class Game:
         # 商店界面不需要特殊更新逻辑
         pass
 
-    def update_background(self):
-        """更新三层背景滚动位置（不同速度）"""
-        # 远层（最慢）
-        self.bg1_x1 -= self.bg_speeds["bg1"]
-        self.bg1_x2 -= self.bg_speeds["bg1"]
-        if self.bg1_x1 <= -800:
-            self.bg1_x1 = 800
-        if self.bg1_x2 <= -800:
-            self.bg1_x2 = 800
-
-        # 中层（中速）
-        self.bg2_x1 -= self.bg_speeds["bg2"]
-        self.bg2_x2 -= self.bg_speeds["bg2"]
-        if self.bg2_x1 <= -800:
-            self.bg2_x1 = 800
-        if self.bg2_x2 <= -800:
-            self.bg2_x2 = 800
-
-        # 近层（最快）
-        self.bg3_x1 -= self.bg_speeds["bg3"]
-        self.bg3_x2 -= self.bg_speeds["bg3"]
-        if self.bg3_x1 <= -800:
-            self.bg3_x1 = 800
-        if self.bg3_x2 <= -800:
-            self.bg3_x2 = 800
-
-    def update_star_effect(self):
+    def update_star_effect(self, dt):
         """更新星星特效"""
-        # 每隔一定时间生成新的星星
-        if pygame.time.get_ticks() % 5 == 0:
-            # 在玩家身后生成星星
-            star_x = self.player.rect.x - 20
-            star_y = self.player.rect.y + random.randint(-10, 40)
-            star_size = random.randint(3, 8)
-            star_speed = random.uniform(1.0, 3.0)
-            star_color = random.choice([
-                (255, 255, 0),  # 黄色
-                (255, 200, 0),  # 橙色
-                (255, 255, 200),  # 淡黄色
-                (255, 100, 100),  # 淡红色
-                (100, 255, 255)  # 青色
-            ])
-
-            self.stars.append({
-                'x': star_x,
-                'y': star_y,
-                'size': star_size,
-                'speed': star_speed,
-                'alpha': 255,
-                'color': star_color
-            })
-
-        # 更新现有星星
-        for star in self.stars[:]:
-            star['x'] -= star['speed']
-            star['alpha'] -= 5
-
-            if star['alpha'] <= 0:
-                self.stars.remove(star)
+        # 每隔一定时间在玩家身后生成新的星星，移动和淡出由粒子系统统一处理
+        # 按模拟步数计时（60 帧/秒时每 5 帧一颗），不依赖真实时间，同一种子可以重现
+        world = self.world
+        if world.tick % max(1, round(5 / dt)) == 0:
+            particle_system.emit_star_trail(world.player.rect, rng=world.rng.stream("star_effect"))
 
     # ==================== 绘制方法 ====================
     def draw(self):
         """绘制游戏画面"""
+        if self.state in STATIC_SCREENS:
+            self.draw_static_screen()
+            return
+
+        self.static_screen_valid = False
+        if self.state in ("paused", "game_over"):
+            self.draw_frozen_screen()
+            return
+
+        self.frozen_frame = None
+        self.draw_state()
+
+        # 更新显示
+        pygame.display.flip()
+
+    def draw_state(self):
+        """绘制当前状态的完整画面"""
         if self.state == "title":
             self.draw_title_screen()
         elif self.state == "load_save":
@@ -857,9 +699,121 @@ class Game:
         elif self.state == "game_over":
             self.draw_game_over_screen()
 
+    def draw_frozen_screen(self):
+        """暂停/游戏结束：定格画面只合成一次，之后只刷新变化的倒计时文字"""
+        if self.frozen_frame is None or self.frozen_frame_state != self.state:
+            self.draw_state()
+            pygame.display.flip()
+            return
 
-        # 更新显示
-        pygame.display.flip()
+        if self.state == "game_over":
+            dirty_rects = self.draw_game_over_countdown()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+
+    def draw_static_screen(self):
+        """脏矩形模式绘制静态界面
+
+        进入界面或点击/按键后，把没有悬停的完整画面画一次存成底图，整屏刷新；
+        之后只有鼠标悬停状态变化时才动画面：变化的按钮区域先贴回底图，再贴上悬停按钮的画面
+        （每个按钮第一次悬停时画一次并缓存），只把这些区域提交给 display.update。
+        """
+        regions = self.get_hover_regions()
+        hovered = tuple(i for i, (hover_rect, _) in enumerate(regions) if hover_rect.collidepoint(self.mouse_pos))
+        key = (self.state, self.delete_confirm)
+
+        if not self.static_screen_valid or key != self.static_screen_key:
+            self.draw_static_variant((-1, -1))
+            self.static_base = self.screen.copy()
+            self.static_hover_tiles = {}
+            self.static_screen_valid = True
+            self.static_screen_key = key
+            self.static_hovered = hovered
+            self.blit_hover_tiles(regions, hovered)
+            pygame.display.flip()
+            return
+
+        if hovered == self.static_hovered:
+            return  # 画面没有变化
+
+        changed = set(hovered) ^ set(self.static_hovered)
+        dirty_rects = [rect for i in changed for rect in regions[i][1]]
+        for rect in dirty_rects:
+            self.screen.blit(self.static_base, rect, rect)
+        self.static_hovered = hovered
+        dirty_rects += self.blit_hover_tiles(regions, hovered)
+        pygame.display.update(dirty_rects)
+
+    def draw_static_variant(self, mouse_pos):
+        """假设鼠标在 mouse_pos，把当前静态界面完整画到屏幕上"""
+        real_mouse_pos = self.mouse_pos
+        self.mouse_pos = mouse_pos
+        self.draw_state()
+        self.mouse_pos = real_mouse_pos
+
+    def blit_hover_tiles(self, regions, hovered):
+        """把悬停按钮的画面贴到屏幕上，返回贴过的矩形"""
+        missing = [i for i in hovered if i not in self.static_hover_tiles]
+        if missing:
+            screen_rect = self.screen.get_rect()
+            for i in missing:
+                hover_rect, rects = regions[i]
+                self.draw_static_variant(hover_rect.center)
+                clipped = [rect.clip(screen_rect) for rect in rects]
+                self.static_hover_tiles[i] = [(rect, self.screen.subsurface(rect).copy()) for rect in clipped]
+            # 画悬停画面时整屏都被改写了，换回底图（下面再贴上悬停的按钮）
+            self.screen.blit(self.static_base, (0, 0))
+
+        drawn = []
+        for i in hovered:
+            for rect, tile in self.static_hover_tiles[i]:
+                self.screen.blit(tile, rect)
+                drawn.append(rect)
+        return drawn
+
+    def get_hover_regions(self):
+        """当前静态界面中会随鼠标悬停变化的区域 [(悬停检测矩形, [需要刷新的矩形]), ...]
+
+        位置与各 draw_*_screen 中的按钮保持一致。
+        """
+        regions = []
+
+        def button(rect, *extra):
+            rect = pygame.Rect(rect)
+            regions.append((rect, [rect.inflate(4, 4), *extra]))
+
+        if self.state == "title":
+            for y_pos in (250, 330, 410, 490):
+                button((300, y_pos, 200, 60))
+        elif self.state == "load_save":
+            all_saves = self.save_system.get_all_saves()
+            for i in range(len(all_saves[self.save_list_offset:self.save_list_offset + 5])):
+                button((150, 150 + i * 80, 500, 70))
+            button((650, 500, 100, 50))
+        elif self.state == "saves_list":
+            if self.delete_confirm:
+                button((300, 350, 100, 50))
+                button((450, 350, 100, 50))
+            else:
+                y_pos = 220
+                for _ in self.save_system.get_all_saves():
+                    if y_pos > 500:
+                        break
+                    button((650, y_pos, 80, 30))
+                    y_pos += 40
+                button((650, 500, 100, 50))
+        elif self.state == "menu":
+            button((250, 250, 100, 150))
+            button((450, 250, 100, 150))
+            button((300, 450, 200, 60))
+        elif self.state == "shop":
+            # 物品悬停时还会改变下方的描述区域
+            desc_rect = pygame.Rect(100, 420, 600, 80)
+            for i in range(len(self.shop_items)):
+                button((125 + i * 200, 200, 150, 200), desc_rect.inflate(4, 4))
+            button((50, 500, 150, 60))
+            button((600, 500, 150, 60))
+        return regions
 
     # ==================== 各个界面的绘制方法 ====================
     def draw_title_screen(self):
@@ -868,7 +822,7 @@ class Game:
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("跑酷游戏", True, (255, 255, 255))
+        title_text = render_text(self.font, "跑酷游戏", (255, 255, 255))
         title_rect = title_text.get_rect(center=(400, 120))
         self.screen.blit(title_text, title_rect)
 
@@ -876,12 +830,13 @@ class Game:
         if self.save_system.current_save:
             save_info = self.save_system.get_current_save_info()
             if save_info:
-                current_save_text = self.medium_font.render(f"当前存档: {save_info['player_name']}", True,
-                                                            (100, 255, 100))
+                current_save_text = render_text(self.medium_font, f"当前存档: {save_info['player_name']}",
+                                                (100, 255, 100))
                 self.screen.blit(current_save_text, (400 - current_save_text.get_width() // 2, 180))
 
-                score_text = self.small_font.render(
-                    f"最高分: {save_info['high_score']} | 总金币: {save_info['total_coins']}", True, (200, 200, 255))
+                score_text = render_text(
+                    self.small_font,
+                    f"最高分: {save_info['high_score']} | 总金币: {save_info['total_coins']}", (200, 200, 255))
                 self.screen.blit(score_text, (400 - score_text.get_width() // 2, 220))
 
         # 绘制菜单按钮
@@ -900,7 +855,7 @@ class Game:
             pygame.draw.rect(self.screen, button_color, button_rect, border_radius=10)
             pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 3, border_radius=10)
 
-            button_text = self.medium_font.render(text, True, (255, 255, 255))
+            button_text = render_text(self.medium_font, text, (255, 255, 255))
             self.screen.blit(button_text,
                              (400 - button_text.get_width() // 2, y_pos + 30 - button_text.get_height() // 2))
 
@@ -910,7 +865,7 @@ class Game:
         ]
 
         for i, text in enumerate(controls):
-            control_text = self.small_font.render(text, True, (200, 200, 200))
+            control_text = render_text(self.small_font, text, (200, 200, 200))
             self.screen.blit(control_text, (400 - control_text.get_width() // 2, 530 + i * 25))
 
     def draw_load_save_screen(self):
@@ -919,7 +874,7 @@ class Game:
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("加载存档", True, (255, 255, 200))
+        title_text = render_text(self.font, "加载存档", (255, 255, 200))
         title_rect = title_text.get_rect(center=(400, 100))
         self.screen.blit(title_text, title_rect)
 
@@ -928,11 +883,11 @@ class Game:
 
         if not all_saves:
             # 没有存档时显示提示
-            no_saves_text = self.medium_font.render("暂无存档，请先创建存档", True, (255, 100, 100))
+            no_saves_text = render_text(self.medium_font, "暂无存档，请先创建存档", (255, 100, 100))
             self.screen.blit(no_saves_text, (400 - no_saves_text.get_width() // 2, 300))
         else:
             # 显示存档列表
-            list_title = self.medium_font.render("选择存档:", True, (255, 255, 255))
+            list_title = render_text(self.medium_font, "选择存档:", (255, 255, 255))
             self.screen.blit(list_title, (150, 120))
 
             y_start = 150
@@ -945,12 +900,13 @@ class Game:
                 pygame.draw.rect(self.screen, (255, 255, 255), save_rect, 3, border_radius=10)
 
                 # 存档信息
-                name_text = self.medium_font.render(f"{save['player_name']}", True, (255, 255, 255))
+                name_text = render_text(self.medium_font, f"{save['player_name']}", (255, 255, 255))
                 self.screen.blit(name_text, (170, y_start + i * 80 + 15))
 
-                info_text = self.small_font.render(
+                info_text = render_text(
+                    self.small_font,
                     f"最高分: {save['high_score']} | 金币: {save['total_coins']} | 游戏次数: {save['games_played']}",
-                    True, (200, 255, 200)
+                    (200, 255, 200)
                 )
                 self.screen.blit(info_text, (170, y_start + i * 80 + 45))
 
@@ -961,25 +917,20 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), back_rect, 3, border_radius=10)
 
-        back_text = self.small_font.render("返回", True, (255, 255, 255))
+        back_text = render_text(self.small_font, "返回", (255, 255, 255))
         self.screen.blit(back_text, (700 - back_text.get_width() // 2, 525 - back_text.get_height() // 2))
 
         # 绘制操作说明
-        instruction_text = self.small_font.render("点击存档加载，使用鼠标操作", True, (200, 200, 200))
+        instruction_text = render_text(self.small_font, "点击存档加载，使用鼠标操作", (200, 200, 200))
         self.screen.blit(instruction_text, (400 - instruction_text.get_width() // 2, 560))
 
     def draw_saves_list_screen(self):
         """绘制存档列表屏幕"""
-        # 如果有确认删除的存档，绘制确认界面
-        if self.delete_confirm:
-            self.draw_delete_confirmation()
-            return
-
         # 绘制背景
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("存档管理", True, (255, 255, 200))
+        title_text = render_text(self.font, "存档管理", (255, 255, 200))
         title_rect = title_text.get_rect(center=(400, 80))
         self.screen.blit(title_text, title_rect)
 
@@ -987,13 +938,13 @@ class Game:
         all_saves = self.save_system.get_all_saves()
 
         # 显示存档总数
-        total_text = self.medium_font.render(f"总存档数: {len(all_saves)}", True, (255, 255, 255))
+        total_text = render_text(self.medium_font, f"总存档数: {len(all_saves)}", (255, 255, 255))
         self.screen.blit(total_text, (400 - total_text.get_width() // 2, 130))
 
         # 显示当前存档
         if self.save_system.current_save:
-            current_text = self.medium_font.render(f"当前存档: {self.save_system.current_save['player_name']}", True,
-                                                   (100, 255, 100))
+            current_text = render_text(self.medium_font, f"当前存档: {self.save_system.current_save['player_name']}",
+                                       (100, 255, 100))
             self.screen.blit(current_text, (400 - current_text.get_width() // 2, 170))
 
         # 显示所有存档详细信息
@@ -1006,7 +957,7 @@ class Game:
             save_info = f"{i + 1}. {save['player_name']} - 最高分: {save['high_score']} - 金币: {save['total_coins']}"
             if len(save_info) > 60:
                 save_info = save_info[:57] + "..."
-            save_text = self.small_font.render(save_info, True, (220, 220, 220))
+            save_text = render_text(self.small_font, save_info, (220, 220, 220))
             self.screen.blit(save_text, (100, y_pos))
 
             # 绘制删除按钮
@@ -1026,14 +977,14 @@ class Game:
             pygame.draw.rect(self.screen, delete_color, delete_rect, border_radius=5)
             pygame.draw.rect(self.screen, (255, 255, 255), delete_rect, 2, border_radius=5)
 
-            delete_text = pygame.font.Font('image/STKAITI.TTF', 20).render("删除", True, delete_text_color)
+            delete_text = render_text(get_font(20), "删除", delete_text_color)
             delete_text_rect = delete_text.get_rect(center=delete_rect.center)
             self.screen.blit(delete_text, delete_text_rect)
 
             y_pos += 40  # 减少行间距
 
         # 绘制说明文字
-        instruction_text = self.small_font.render("点击删除按钮删除存档（当前存档不能删除）", True, (255, 200, 100))
+        instruction_text = render_text(self.small_font, "点击删除按钮删除存档（当前存档不能删除）", (255, 200, 100))
         self.screen.blit(instruction_text, (400 - instruction_text.get_width() // 2, 520))
 
         # 绘制返回按钮 - 与事件检测位置保持一致 (650, 500, 100, 50)
@@ -1043,10 +994,14 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), back_rect, 3, border_radius=10)
 
-        back_text = self.small_font.render("返回", True, (255, 255, 255))
+        back_text = render_text(self.small_font, "返回", (255, 255, 255))
         back_text_rect = back_text.get_rect(center=back_rect.center)
         self.screen.blit(back_text, back_text_rect)
 
+        # 如果有确认删除的存档，在列表上方绘制确认界面
+        if self.delete_confirm:
+            self.draw_delete_confirmation()
+
     def draw_delete_confirmation(self):
         """绘制删除确认界面"""
         # 半透明背景
@@ -1060,10 +1015,10 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), confirm_rect, 3, border_radius=10)
 
         # 确认文字
-        confirm_text = self.medium_font.render(f"确认删除存档: {self.delete_confirm}?", True, (255, 100, 100))
+        confirm_text = render_text(self.medium_font, f"确认删除存档: {self.delete_confirm}?", (255, 100, 100))
         self.screen.blit(confirm_text, (400 - confirm_text.get_width() // 2, 250))
 
-        warning_text = self.small_font.render("此操作不可恢复！", True, (255, 200, 100))
+        warning_text = render_text(self.small_font, "此操作不可恢复！", (255, 200, 100))
         self.screen.blit(warning_text, (400 - warning_text.get_width() // 2, 290))
 
         # 确认按钮
@@ -1072,7 +1027,7 @@ class Game:
         confirm_color = (200, 50, 50) if confirm_hovered else (170, 30, 30)
         pygame.draw.rect(self.screen, confirm_color, confirm_btn, border_radius=5)
         pygame.draw.rect(self.screen, (255, 255, 255), confirm_btn, 2, border_radius=5)
-        confirm_text = self.small_font.render("确认", True, (255, 255, 255))
+        confirm_text = render_text(self.small_font, "确认", (255, 255, 255))
         self.screen.blit(confirm_text, (350 - confirm_text.get_width() // 2, 375 - confirm_text.get_height() // 2))
 
         # 取消按钮
@@ -1081,7 +1036,7 @@ class Game:
         cancel_color = (100, 100, 200) if cancel_hovered else (70, 70, 170)
         pygame.draw.rect(self.screen, cancel_color, cancel_btn, border_radius=5)
         pygame.draw.rect(self.screen, (255, 255, 255), cancel_btn, 2, border_radius=5)
-        cancel_text = self.small_font.render("取消", True, (255, 255, 255))
+        cancel_text = render_text(self.small_font, "取消", (255, 255, 255))
         self.screen.blit(cancel_text, (500 - cancel_text.get_width() // 2, 375 - cancel_text.get_height() // 2))
 
     def draw_menu_screen(self):
@@ -1090,7 +1045,7 @@ class Game:
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("选择你的角色", True, (255, 255, 200))
+        title_text = render_text(self.font, "选择你的角色", (255, 255, 200))
         title_rect = title_text.get_rect(center=(400, 150))
         self.screen.blit(title_text, title_rect)
 
@@ -1098,11 +1053,12 @@ class Game:
         if self.save_system.current_save:
             save_info = self.save_system.get_current_save_info()
             if save_info:
-                player_text = self.medium_font.render(f"玩家: {save_info['player_name']}", True, (100, 255, 100))
+                player_text = render_text(self.medium_font, f"玩家: {save_info['player_name']}", (100, 255, 100))
                 self.screen.blit(player_text, (400 - player_text.get_width() // 2, 170))
 
-                stats_text = self.small_font.render(
-                    f"最高分: {save_info['high_score']} | 总金币: {save_info['total_coins']}", True, (200, 200, 255))
+                stats_text = render_text(
+                    self.small_font,
+                    f"最高分: {save_info['high_score']} | 总金币: {save_info['total_coins']}", (200, 200, 255))
                 self.screen.blit(stats_text, (400 - stats_text.get_width() // 2, 210))
 
         # 绘制角色1选择框
@@ -1113,17 +1069,14 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), char1_rect, 3, border_radius=10)
 
         # 绘制角色1图片
-        try:
-            img = pygame.image.load('gif/nick.png').convert_alpha()
-            img = pygame.transform.scale(img, (80, 80))
+        img = asset_manager.try_load('gif/nick.png', (80, 80))
+        if img:
             self.screen.blit(img, (260, 260))
-        except:
-            pass
 
         # 绘制角色1描述
-        char1_text = self.small_font.render("尼克", True, (255, 255, 255))
+        char1_text = render_text(self.small_font, "尼克", (255, 255, 255))
         self.screen.blit(char1_text, (300 - char1_text.get_width() // 2, 350))
-        ability_text = self.small_font.render("单段跳", True, (200, 200, 255))
+        ability_text = render_text(self.small_font, "单段跳", (200, 200, 255))
         self.screen.blit(ability_text, (300 - ability_text.get_width() // 2, 375))
 
         # 绘制角色2选择框
@@ -1134,17 +1087,14 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), char2_rect, 3, border_radius=10)
 
         # 绘制角色2图片
-        try:
-            img = pygame.image.load('gif/judy.png').convert_alpha()
-            img = pygame.transform.scale(img, (80, 80))
+        img = asset_manager.try_load('gif/judy.png', (80, 80))
+        if img:
             self.screen.blit(img, (460, 260))
-        except:
-            pass
 
         # 绘制角色2描述
-        char2_text = self.small_font.render("朱迪", True, (255, 255, 255))
+        char2_text = render_text(self.small_font, "朱迪", (255, 255, 255))
         self.screen.blit(char2_text, (500 - char2_text.get_width() // 2, 350))
-        ability_text = self.small_font.render("二段跳", True, (200, 200, 255))
+        ability_text = render_text(self.small_font, "二段跳", (200, 200, 255))
         self.screen.blit(ability_text, (500 - ability_text.get_width() // 2, 375))
 
         # 绘制退出按钮
@@ -1154,7 +1104,7 @@ class Game:
         pygame.draw.rect(self.screen, quit_color, quit_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), quit_rect, 3, border_radius=10)
 
-        quit_text = self.medium_font.render("返回主页", True, (255, 255, 255))
+        quit_text = render_text(self.medium_font, "返回主页", (255, 255, 255))
         self.screen.blit(quit_text, (400 - quit_text.get_width() // 2, 480 - quit_text.get_height() // 2))
 
         # 绘制操作说明
@@ -1165,7 +1115,7 @@ class Game:
         ]
 
         for i, text in enumerate(controls):
-            control_text = self.small_font.render(text, True, (200, 200, 200))
+            control_text = render_text(self.small_font, text, (200, 200, 200))
             self.screen.blit(control_text, (400 - control_text.get_width() // 2, 530 + i * 25))
 
         # 重置金币效果
@@ -1177,7 +1127,7 @@ class Game:
         self.screen.blit(self.shop_background, (0, 0))
 
         # 显示当前金币
-        coins_text = self.medium_font.render(f"当前金币: {self.coins}", True, (255, 255, 100))
+        coins_text = render_text(self.medium_font, f"当前金币: {self.coins}", (255, 255, 100))
         self.screen.blit(coins_text, (400 - coins_text.get_width() // 2, 130))
 
         # 绘制物品 - 居中排列
@@ -1225,17 +1175,17 @@ class Game:
                 self.screen.blit(img, img_rect)
 
             # 绘制物品名称
-            name_text = self.small_font.render(item["name"], True, (255, 255, 255))
+            name_text = render_text(self.small_font, item["name"], (255, 255, 255))
             self.screen.blit(name_text, (x_pos + item_width // 2 - name_text.get_width() // 2, y_pos + 110))
 
             # 绘制价格
             price_color = (255, 255, 100) if can_purchase else (150, 150, 150)
-            price_text = self.small_font.render(f"价格: {item['price']}金币", True, price_color)
+            price_text = render_text(self.small_font, f"价格: {item['price']}金币", price_color)
             self.screen.blit(price_text, (x_pos + item_width // 2 - price_text.get_width() // 2, y_pos + 140))
 
             # 如果已购买，显示"已购买"
             if purchased:
-                purchased_text = self.small_font.render("已购买", True, (100, 255, 100))
+                purchased_text = render_text(self.small_font, "已购买", (100, 255, 100))
                 self.screen.blit(purchased_text,
                                  (x_pos + item_width // 2 - purchased_text.get_width() // 2, y_pos + 165))
 
@@ -1256,7 +1206,7 @@ class Game:
             desc_lines = hovered_item["description"].split("，")
             for j, line in enumerate(desc_lines):
                 if j < 2:  # 限制显示行数
-                    desc_text = self.small_font.render(line, True, (255, 255, 200))
+                    desc_text = render_text(self.small_font, line, (255, 255, 200))
                     self.screen.blit(desc_text, (desc_rect.x + 20, desc_rect.y + 10 + j * 25))
 
         # 绘制按钮区域
@@ -1272,7 +1222,7 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), back_rect, 3, border_radius=10)
 
-        back_text = self.medium_font.render("返回", True, (255, 255, 255))
+        back_text = render_text(self.medium_font, "返回", (255, 255, 255))
         back_text_rect = back_text.get_rect(center=back_rect.center)
         self.screen.blit(back_text, back_text_rect)
 
@@ -1284,38 +1234,28 @@ class Game:
         pygame.draw.rect(self.screen, start_color, start_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), start_rect, 3, border_radius=10)
 
-        start_text = self.medium_font.render("开始游戏", True, (255, 255, 255))
+        start_text = render_text(self.medium_font, "开始游戏", (255, 255, 255))
         start_text_rect = start_text.get_rect(center=start_rect.center)
         self.screen.blit(start_text, start_text_rect)
 
 
     def draw_game_screen(self):
         """绘制游戏画面"""
-        # 先清屏，避免角色跳跃时的拖影
-        self.screen.fill((0, 0, 0))
-        # 绘制背景␊
-        self.screen.blit(self.bg_layers['bg1'], (self.bg1_x1, 0))
-        self.screen.blit(self.bg_layers['bg1'], (self.bg1_x2, 0))
-        self.screen.blit(self.bg_layers['bg2'], (self.bg2_x1, 0))
-        self.screen.blit(self.bg_layers['bg2'], (self.bg2_x2, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x1, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x2, 0))
-
-        # 绘制障碍物
-        self.obstacle_manager.draw(self.screen)
-
-        # 绘制金币
-        self.coin_manager.draw(self.screen)
+        # 绘制背景（需要时先清屏，避免角色跳跃时的拖影）
+        world = self.world
+        alpha = self.render_alpha
+        self.background.draw(self.screen, alpha=alpha)
 
-        # 绘制敌人和战斗效果
-        self.enemy_manager.draw(self.screen)
+        # 障碍物、金币、敌人和战斗效果按层提交，一次批量绘制
+        world.obstacle_manager.enqueue(self.render_queue, alpha)
+        world.coin_manager.enqueue(self.render_queue, alpha)
+        world.enemy_manager.enqueue(self.render_queue, alpha)
+        self.render_queue.flush(self.screen)
 
         # 绘制玩家
-        if self.player:
-            self.player.draw(self.screen)
-        # 绘制星星特效
-        if self.star_effect_active:
-            self.draw_star_effect()
+        world.player.draw(self.screen, alpha)
+        # 绘制星星特效等粒子
+        particle_system.draw(self.screen, alpha)
 
         # 绘制金币收集效果
         if self.show_coin_effect:
@@ -1326,83 +1266,109 @@ class Game:
 
     def draw_battle_screen(self):
         """绘制战斗界面"""
-        self.screen.fill((0, 0, 0))
-        # 背景保持静止
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x1, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x2, 0))
+        # 背景保持静止，只画近层
+        world = self.world
+        alpha = self.render_alpha
+        self.background.draw(self.screen, only=("bg3",), alpha=alpha)
 
         # 绘制玩家
-        if self.player:
-            self.player.draw(self.screen)
+        world.player.draw(self.screen, alpha)
 
         # 绘制怪物和子弹
-        if self.battle_monster:
-            self.battle_monster.draw(self.screen)
-        for bullet in self.player_bullets:
-            bullet.draw(self.screen)
-        for bullet in self.monster_bullets:
-            bullet.draw(self.screen)
+        if world.battle_monster:
+            world.battle_monster.enqueue(self.render_queue)
+        for bullet in world.player_bullets:
+            bullet.enqueue(self.render_queue, alpha=alpha)
+        for bullet in world.monster_bullets:
+            bullet.enqueue(self.render_queue, alpha=alpha)
+        self.render_queue.flush(self.screen)
+        particle_system.draw(self.screen, alpha)
 
         # 提示文本
-        battle_text = self.medium_font.render("打怪模式：击败怪物继续跑酷", True, (255, 255, 0))
+        battle_text = render_text(self.medium_font, "打怪模式：击败怪物继续跑酷", (255, 255, 0))
         self.screen.blit(battle_text, (400 - battle_text.get_width() // 2, 40))
 
         # 绘制UI信息
         self.draw_ui()
 
     def draw_game_over_screen(self):
-        """绘制游戏结束画面"""
-        # 首先绘制游戏画面
-        self.draw_game_screen()
-
-        # 半透明覆盖层
-        overlay = pygame.Surface((800, 600), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
-
-        # 计算剩余时间
-        time_left = max(0, 5 - (time.time() - self.game_over_time))
-
+        """绘制游戏结束画面（定格画面 + 倒计时）"""
+        self.ensure_frozen_frame(150, self.draw_game_over_text)
+        self.screen.blit(self.frozen_frame, (0, 0))
+        self.countdown_value = None
+        self.draw_game_over_countdown()
+
+    def draw_game_over_text(self, surface):
+        """把游戏结束的固定文字画到定格画面上"""
         # 获取当前存档的最高分
         high_score = 0
         if self.save_system.current_save:
             high_score = self.save_system.current_save["high_score"]
 
         # 游戏结束文字
-        game_over_text = self.font.render("游戏结束!", True, (255, 50, 50))
-        score_text = self.font.render(f"最终分数: {int(self.score)}", True, (255, 255, 255))
-        high_score_text = self.font.render(f"最高分: {high_score}", True, (255, 255, 100))
+        game_over_text = render_text(self.font, "游戏结束!", (255, 50, 50))
+        score_text = render_text(self.font, f"最终分数: {int(self.world.score)}", (255, 255, 255))
+        high_score_text = render_text(self.font, f"最高分: {high_score}", (255, 255, 100))
 
         # 计算最终金币
-        final_coins = self.current_game_coins
+        final_coins = self.world.current_game_coins
 
-        coins_text = self.font.render(f"本局金币: {final_coins}", True, (255, 255, 100))
-        restart_text = self.medium_font.render(f"自动返回菜单: {int(time_left)}秒", True, (100, 255, 100))
-        click_text = self.small_font.render("点击任意处返回主页面", True, (200, 200, 200))
+        coins_text = render_text(self.font, f"本局金币: {final_coins}", (255, 255, 100))
+        click_text = render_text(self.small_font, "点击任意处返回主页面", (200, 200, 200))
 
         # 居中显示
-        self.screen.blit(game_over_text, (400 - game_over_text.get_width() // 2, 180))
-        self.screen.blit(score_text, (400 - score_text.get_width() // 2, 240))
-        self.screen.blit(high_score_text, (400 - high_score_text.get_width() // 2, 290))
-        self.screen.blit(coins_text, (400 - coins_text.get_width() // 2, 340))
-        self.screen.blit(restart_text, (400 - restart_text.get_width() // 2, 400))
-        self.screen.blit(click_text, (400 - click_text.get_width() // 2, 440))
+        surface.blit(game_over_text, (400 - game_over_text.get_width() // 2, 180))
+        surface.blit(score_text, (400 - score_text.get_width() // 2, 240))
+        surface.blit(high_score_text, (400 - high_score_text.get_width() // 2, 290))
+        surface.blit(coins_text, (400 - coins_text.get_width() // 2, 340))
+        surface.blit(click_text, (400 - click_text.get_width() // 2, 440))
+
+    def draw_game_over_countdown(self):
+        """秒数变化时重绘倒计时文字，返回需要刷新的矩形"""
+        time_left = int(max(0, 5 - (time.time() - self.game_over_time)))
+        if time_left == self.countdown_value:
+            return []
+
+        dirty_rects = []
+        if self.countdown_rect:
+            # 用定格画面擦掉旧的文字
+            self.screen.blit(self.frozen_frame, self.countdown_rect, self.countdown_rect)
+            dirty_rects.append(self.countdown_rect)
+
+        restart_text = render_text(self.medium_font, f"自动返回菜单: {time_left}秒", (100, 255, 100))
+        self.countdown_rect = self.screen.blit(restart_text, (400 - restart_text.get_width() // 2, 400))
+        self.countdown_value = time_left
+        dirty_rects.append(self.countdown_rect)
+        return dirty_rects
 
     def draw_pause_screen(self):
-        """绘制暂停画面"""
-        if self.paused_state == "battle":
-            self.draw_battle_screen()
-        else:
-            self.draw_game_screen()
-
-        overlay = pygame.Surface((800, 600), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 160))
-        self.screen.blit(overlay, (0, 0))
+        """绘制暂停画面（定格画面）"""
+        self.ensure_frozen_frame(160, self.draw_pause_text)
+        self.screen.blit(self.frozen_frame, (0, 0))
 
-        pause_text = self.font.render("已暂停", True, (255, 255, 255))
-        hint_text = self.small_font.render("按 P 继续游戏", True, (200, 200, 200))
-        self.screen.blit(pause_text, (400 - pause_text.get_width() // 2, 240))
-        self.screen.blit(hint_text, (400 - hint_text.get_width() // 2, 320))
+    def draw_pause_text(self, surface):
+        """把暂停提示画到定格画面上"""
+        pause_text = render_text(self.font, "已暂停", (255, 255, 255))
+        hint_text = render_text(self.small_font, "按 P 继续游戏", (200, 200, 200))
+        surface.blit(pause_text, (400 - pause_text.get_width() // 2, 240))
+        surface.blit(hint_text, (400 - hint_text.get_width() // 2, 320))
+
+    def ensure_frozen_frame(self, overlay_alpha, draw_text):
+        """进入暂停/游戏结束时，把最后一帧游戏画面变暗并画上固定文字，之后每帧直接使用"""
+        if self.frozen_frame is not None and self.frozen_frame_state == self.state:
+            return
+
+        # 屏幕上还保留着最后一帧游戏画面
+        frame = self.screen.copy()
+        # 相当于叠加一层透明度为 overlay_alpha 的黑色
+        shade = 255 - overlay_alpha
+        frame.fill((shade, shade, shade), special_flags=pygame.BLEND_MULT)
+        draw_text(frame)
+
+        self.frozen_frame = frame
+        self.frozen_frame_state = self.state
+        self.countdown_value = None
+        self.countdown_rect = None
 
     def toggle_pause(self):
         """切换暂停状态"""
@@ -1414,100 +1380,129 @@ class Game:
         if self.state in ("playing", "battle"):
             self.paused_state = self.state
             self.state = "paused"
+            if self.recorder:
+                self.recorder.mark_pause()
 
     # ==================== 特效绘制方法 ====================
+    def get_coin_effect_frames(self, text):
+        """飘字 text 每一帧的贴图：第一次用到时按帧生成透明度递减的副本，之后每帧只需要 blit"""
+        frames = self.coin_effect_frames.get(text)
+        if frames is None:
+            effect_text = render_text(get_font(32), text, (255, 255, 100))
+            frames = []
+            for frame in range(COIN_EFFECT_FRAMES + 1):
+                sprite = effect_text.copy()
+                sprite.set_alpha(round(255 * FADE_OUT.at(frame / COIN_EFFECT_FRAMES)))
+                frames.append(sprite)
+            self.coin_effect_frames[text] = frames
+        return frames
+
     def draw_coin_effect(self):
         """绘制金币收集效果"""
-        # 创建效果文本
-        effect_font = pygame.font.Font('image/STKAITI.TTF', 32)
-        effect_text = effect_font.render(self.coin_effect_text, True, (255, 255, 100))
-
-        # 添加透明度效果
-        alpha = min(255, self.coin_effect_timer * 8)
-        temp_surface = effect_text.copy()
-        temp_surface.set_alpha(alpha)
+        # 按进度取这一帧的贴图和上升高度
+        progress = 1 - self.coin_effect_timer / COIN_EFFECT_FRAMES
+        sprite = self.get_coin_effect_frames(self.coin_effect_text)[round(progress * COIN_EFFECT_FRAMES)]
 
         # 绘制效果文本
-        effect_rect = effect_text.get_rect(center=self.coin_effect_pos)
-        self.screen.blit(temp_surface, effect_rect)
-
-        # 更新位置（向上移动）
-        self.coin_effect_pos = (self.coin_effect_pos[0], self.coin_effect_pos[1] - 1)
-
-    def draw_star_effect(self):
-        """绘制星星特效"""
-        for star in self.stars:
-            # 创建带透明度的星星
-            star_surface = pygame.Surface((star['size'] * 2, star['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(star_surface, (*star['color'], star['alpha']),
-                               (star['size'], star['size']), star['size'])
-            self.screen.blit(star_surface, (star['x'], star['y']))
+        x, y = self.coin_effect_pos
+        effect_rect = sprite.get_rect(center=(x, y - round(COIN_EFFECT_RISE * EASE_OUT.at(progress))))
+        self.screen.blit(sprite, effect_rect)
+
+    def create_hud(self):
+        """创建 HUD 图层并登记各区域（顺序即绘制顺序）"""
+        layout = game_hud_layout(self.medium_font.get_height(), self.small_font.get_height(),
+                                 self.ui_font.get_height())
+        hud = HudCompositor((800, max(bounds.bottom for _, bounds in layout)))
+        for name, bounds in layout:
+            hud.add_region(name, bounds)
+        return hud
 
     def draw_ui(self):
         """绘制游戏UI（增强版）"""
-        if not self.player:
+        world = self.world
+        if not world:
             return
 
-        # 绘制分数
-        score_text = self.medium_font.render(f"分数: {int(self.score)}", True, (0, 0, 0))
-        self.screen.blit(score_text, (20, 10))
-
-        # 绘制最高分
+        hud = self.hud
+        score = int(world.score)
         high_score = 0
         if self.save_system.current_save:
             high_score = self.save_system.current_save["high_score"]
-        high_score_text = self.medium_font.render(f"最高分: {high_score}", True, (0, 0, 0))
-        self.screen.blit(high_score_text, (20, 50))
-
-        # 绘制生命值
-        health_ratio = self.player_health / self.max_health if self.max_health else 0
-        health_bar_bg = pygame.Rect(10, 90, 200, 20)
-        pygame.draw.rect(self.screen, (180, 50, 50), health_bar_bg, border_radius=5)
-        pygame.draw.rect(self.screen, (50, 200, 50),
-                         (10, 90, 200 * health_ratio, 20), border_radius=5)
-        health_text = self.small_font.render(f"生命: {self.player_health}/{self.max_health}", True, (0, 0, 0))
-        self.screen.blit(health_text, (15, 115))
-
-
-        # 绘制本局金币
-        coins_text = self.ui_font.render(f"金币: {self.current_game_coins}", True, (255, 255, 100))
-        coins_rect = coins_text.get_rect(topright=(780, 20))
-        self.screen.blit(coins_text, coins_rect)
-
-        # 显示当前激活的物品效果（增强版）
-        effects_y = 80
-
-        # 效果列表，包含图标、文本和颜色
+        health = (world.player_health, world.max_health)
+        coins = world.current_game_coins
+        effects = tuple(self.get_active_effects())
+
+        hud.update("score", score, lambda surface, bounds: self.draw_hud_score(surface, bounds, score))
+        hud.update("high_score", high_score,
+                   lambda surface, bounds: self.draw_hud_high_score(surface, bounds, high_score))
+        hud.update("health", health, lambda surface, bounds: self.draw_hud_health(surface, bounds, *health))
+        hud.update("coins", coins, lambda surface, bounds: self.draw_hud_coins(surface, bounds, coins))
+        hud.update("effects", effects, lambda surface, bounds: self.draw_hud_effects(surface, bounds, effects))
+        hud.draw(self.screen)
+
+    def get_active_effects(self):
+        """当前激活的物品效果列表 [(文本, 颜色), ...]"""
+        world = self.world
         effects = []
 
         # 额外生命效果
-        if self.extra_life_active and not self.extra_life_used:
+        if world.extra_life_active and not world.extra_life_used:
             effects.append(("♥ 额外生命: 激活", (100, 255, 100)))
-        elif self.extra_life_used:
+        elif world.extra_life_used:
             effects.append(("♥ 额外生命: 已使用", (255, 100, 100)))
 
         # 金币翻倍效果
-        if self.coin_double_active:
+        if world.coin_double_active:
             effects.append(("✪ 金币翻倍: 激活", (255, 255, 100)))
 
         # 星星特效
-        if self.star_effect_active:
+        if world.star_effect_active:
             effects.append(("☆ 星星特效: 激活", (255, 200, 50)))
 
+        return effects
+
+    def draw_hud_score(self, surface, bounds, score):
+        """绘制分数"""
+        get_glyph_atlas(self.medium_font, (0, 0, 0)).draw(surface, "分数: ", score, bounds.topleft)
+
+    def draw_hud_high_score(self, surface, bounds, high_score):
+        """绘制最高分"""
+        get_glyph_atlas(self.medium_font, (0, 0, 0)).draw(surface, "最高分: ", high_score, bounds.topleft)
+
+    def draw_hud_health(self, surface, bounds, health, max_health):
+        """绘制生命值"""
+        health_ratio = health / max_health if max_health else 0
+        health_bar_bg = pygame.Rect(bounds.x, bounds.y, 200, 20)
+        pygame.draw.rect(surface, (180, 50, 50), health_bar_bg, border_radius=5)
+        pygame.draw.rect(surface, (50, 200, 50),
+                         (bounds.x, bounds.y, 200 * health_ratio, 20), border_radius=5)
+        get_glyph_atlas(self.small_font, (0, 0, 0)).draw(surface, "生命: ", f"{health}/{max_health}",
+                                                         (bounds.x + 5, bounds.y + 25))
+
+    def draw_hud_coins(self, surface, bounds, coins):
+        """绘制本局金币"""
+        get_glyph_atlas(self.ui_font, (255, 255, 100)).draw(surface, "金币: ", coins, bounds.topright,
+                                                            anchor="topright")
+
+    def draw_hud_effects(self, surface, bounds, effects):
+        """显示当前激活的物品效果（增强版）"""
+        effects_y = bounds.y
+
         # 如果没有效果，显示提示
         if not effects:
-            no_effects_text = self.small_font.render("无激活效果", True, (150, 150, 150))
-            self.screen.blit(no_effects_text, (10, effects_y))
+            no_effects_text = render_text(self.small_font, "无激活效果", (150, 150, 150))
+            surface.blit(no_effects_text, (bounds.x, effects_y))
         else:
             # 绘制所有效果
             for i, (text, color) in enumerate(effects):
-                # 绘制效果文本
-                effect_text = self.small_font.render(text, True, color)
-                self.screen.blit(effect_text, (10, effects_y + i * 28))
-
+                effect_text = render_text(self.small_font, text, color)
+                surface.blit(effect_text, (bounds.x, effects_y + i * EFFECT_LINE_HEIGHT))
 
 if __name__ == "__main__":
     game = Game()
+    # python main.py --replay 录像文件：直接重放
+    if len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        game.start_replay(sys.argv[2])
 
     game.run()
 
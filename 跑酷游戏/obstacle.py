@@ -1,36 +1,97 @@
 # obstacle.py
 import pygame
 import random
-import os
+from collections import OrderedDict
+
+from asset_manager import asset_manager
+from collision import swept_hit, sweep_reach
+from pool import ObjectPool
+from render_queue import LAYER_OBSTACLES
+from spatial import drop_expired, is_active, query_rect, query_span
+from timestep import lerp
+
+OBSTACLE_SOURCE_SIZE = (90, 90)  # 障碍物贴图的源尺寸
+
+
+class ObstacleSurfaceCache:
+    """障碍物贴图缓存：按 (图片, 宽, 高) 缓存缩放后的 Surface，超出上限时淘汰最久未用的"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, image_path, width, height):
+        key = (image_path, width, height)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self._build(image_path, width, height)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def _build(self, image_path, width, height):
+        # 从图集里 90x90 的贴图缩放（障碍物最大 90x90）
+        source = asset_manager.try_load(image_path, OBSTACLE_SOURCE_SIZE)
+        if source:
+            return pygame.transform.scale(source, (width, height))
+
+        # 如果没有图片，创建简单的图片
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(image, (200, 50, 50), (0, 0, width, height))
+        pygame.draw.rect(image, (150, 0, 0), (0, 0, width, height), 2)
+        return image
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# 所有障碍物共用一份贴图缓存
+obstacle_surface_cache = ObstacleSurfaceCache()
 
 
 class Obstacle:
+    __slots__ = ("rect", "x", "prev_x", "speed", "color", "is_active", "image_path", "_image")
+
     def __init__(self, x, y, width=30, height=30, speed=8, image_path='image/障碍物1.jpg'):
         self.rect = pygame.Rect(x, y, width, height)
+        self.reset(x, y, width, height, speed, image_path)
+
+    def reset(self, x, y, width=30, height=30, speed=8, image_path='image/障碍物1.jpg'):
+        """原地重新初始化（对象池复用时调用，见 pool.py）"""
+        self.rect.update(x, y, width, height)
+        # 浮点坐标和上一步的坐标（绘制时插值）
+        self.x = self.prev_x = float(x)
         self.speed = speed
         self.color = (255, 0, 0)
         self.is_active = True
 
-        # 加载障碍物图片
-        self.image = None
-        if image_path and os.path.exists(image_path):
-            try:
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (width, height))
-            except:
-                self.image = None
+        # 障碍物图片在第一次绘制时才取（同尺寸的贴图共用缓存），无界面模拟时不需要
+        self.image_path = image_path
+        self._image = None
 
-        # 如果没有图片，创建简单的图片
-        if not self.image:
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, (200, 50, 50), (0, 0, width, height))
-            pygame.draw.rect(self.image, (150, 0, 0), (0, 0, width, height), 2)
+    @property
+    def image(self):
+        if self._image is None:
+            self._image = obstacle_surface_cache.get(self.image_path, self.rect.width, self.rect.height)
+        return self._image
 
-    def move(self, scroll_speed):
-        self.rect.x -= scroll_speed
+    def move(self, scroll_speed, dt=1.0):
+        self.prev_x = self.x
+        self.x -= scroll_speed * dt
+        self.rect.x = round(self.x)
 
-        # 如果移出屏幕，标记为不活动
-        if self.rect.right < 0:
+        # 移出屏幕后再留一步才标记为不活动：连续碰撞检测还要用这一步的移动过程（见 collision.py）
+        if round(self.prev_x) + self.rect.width < 0:
             self.is_active = False
 
     def draw(self, screen):
@@ -38,17 +99,44 @@ class Obstacle:
         if self.is_active:
             screen.blit(self.image, self.rect)
 
+    def enqueue(self, render_queue, alpha=1.0):
+        """把障碍物提交到渲染队列（按 alpha 在上一步和当前位置之间插值）"""
+        if self.is_active:
+            render_queue.push(LAYER_OBSTACLES, self.image, (round(lerp(self.prev_x, self.x, alpha)), self.rect.y))
+
     def check_collision(self, player_rect):
         """检测与玩家的碰撞"""
         return self.rect.colliderect(player_rect)
 
+    def prev_rect(self):
+        """上一步的矩形（连续碰撞检测用，见 collision.py）"""
+        return self.rect.move(round(self.prev_x) - self.rect.x, 0)
+
+
+# 障碍物对象池：滚出屏幕的障碍物收回来给下一次生成用
+obstacle_pool = ObjectPool(Obstacle)
+
 
 class ObstacleManager:
-    def __init__(self):
-        self.obstacles = []
+    def __init__(self, size_step=5, rng=random, entity_store=False):
+        # 按生成顺序（也就是横坐标）排列，滚出左边的从列表里去掉；
+        # entity_store 为 True 时改用数组存储（见 entity_store.py）
+        self.entity_store = entity_store
+        if entity_store:
+            from entity_store import ObstacleStore
+            self.obstacles = ObstacleStore()
+        else:
+            self.obstacles = []
+        self.rng = rng  # 生成用的随机数流（默认全局 random）
         self.spawn_timer = 0
         self.spawn_interval = 120
         self.min_spacing = 200
+        # 障碍物尺寸按这个步长取整，减少不同尺寸贴图的数量（1 表示不取整）
+        self.size_step = size_step
+        # 出现过的最大障碍物宽度（按横坐标查询碰撞时用）
+        self.max_width = 0
+        # 障碍物上一步向左移动的距离（连续碰撞检测时往左多查这么远）
+        self.shift = 0
 
         self.obstacles_images = [
             'image/ob1.png',
@@ -65,11 +153,18 @@ class ObstacleManager:
                     return True
         return False
 
+    def quantize_size(self, size, min_size=40, max_size=90):
+        """把尺寸取整到 size_step 的倍数（保持在范围内）"""
+        if self.size_step <= 1:
+            return size
+        size = min_size + round((size - min_size) / self.size_step) * self.size_step
+        return max(min_size, min(max_size, size))
+
     def spawn_obstacle(self):
         """生成一个新的障碍物"""
         # 随机高度和宽度
-        obstacle_height = random.randint(40, 90)
-        obstacle_width = random.randint(40, 90)#更改了高度和宽度
+        obstacle_height = self.quantize_size(self.rng.randint(40, 90))
+        obstacle_width = self.quantize_size(self.rng.randint(40, 90))#更改了高度和宽度
         obstacle_y = 400 - obstacle_height  # 底部在地面上，地面为400
 
         # 障碍物速度
@@ -80,12 +175,18 @@ class ObstacleManager:
             if last_obstacle.rect.x > 800 - self.min_spacing:
                 return None
 
-        image_path = random.choice(self.obstacles_images)
-        obstacle = Obstacle(800, obstacle_y, obstacle_width, obstacle_height, obstacle_speed, image_path)
+        image_path = self.rng.choice(self.obstacles_images)
+        obstacle = obstacle_pool.acquire(800, obstacle_y, obstacle_width, obstacle_height, obstacle_speed, image_path)
         return obstacle
 
-    def update(self, scroll_speed, coin_manager=None):
-        self.spawn_timer += 1
+    def update(self, scroll_speed, coin_manager=None, dt=1.0):
+        """生成并移动一步（World 按帧调用 tick_spawner、每步调用 step）"""
+        self.tick_spawner(dt, coin_manager)
+        self.step(scroll_speed, dt)
+
+    def tick_spawner(self, frames, coin_manager=None):
+        """生成计时推进 frames 帧，到时间就在右边生成障碍物"""
+        self.spawn_timer += frames
         if self.spawn_timer >= self.spawn_interval:
 
             if coin_manager and self.coin_blocking(coin_manager, 800):
@@ -93,35 +194,72 @@ class ObstacleManager:
             else:
                 new_obstacle = self.spawn_obstacle()
                 if new_obstacle:
+                    # 新障碍物总在最右边，列表保持按横坐标有序
+                    self.max_width = max(self.max_width, new_obstacle.rect.width)
                     self.obstacles.append(new_obstacle)
-                    self.spawn_interval = random.randint(80, 150)
+                    self.spawn_interval = self.rng.randint(80, 150)
                     self.spawn_timer = 0
 
                 if coin_manager:
                     coin_manager.waiting_after_obstacle = True
 
-        # ⭐⭐⭐ 永远要执行：移动障碍物
-        for obstacle in self.obstacles[:]:
-            obstacle.move(scroll_speed)
+    def step(self, scroll_speed, dt=1.0):
+        """移动障碍物，去掉滚出屏幕的"""
+        self.shift = scroll_speed * dt
+        if self.entity_store:
+            self.obstacles.step(scroll_speed, dt)
+            return
+        expired = []
+        for obstacle in self.obstacles:
+            obstacle.move(scroll_speed, dt)
             if not obstacle.is_active:
-                self.obstacles.remove(obstacle)
+                expired.append(obstacle)
+        if expired:
+            drop_expired(self.obstacles, expired, is_active)
+            obstacle_pool.release_all(expired)
 
     def draw(self, screen):
         """绘制所有障碍物"""
         for obstacle in self.obstacles:
             obstacle.draw(screen)
 
-    def check_collisions(self, player_rect):
-        """检测玩家与所有障碍物的碰撞"""
+    def enqueue(self, render_queue, alpha=1.0):
+        """把所有障碍物提交到渲染队列"""
         for obstacle in self.obstacles:
-            if obstacle.check_collision(player_rect):
+            obstacle.enqueue(render_queue, alpha)
+
+    def check_collisions(self, player_rect, player_prev_rect=None, candidates=None):
+        """检测玩家与障碍物的碰撞（只检查横向和玩家重叠的障碍物）
+
+        给出玩家上一步的矩形时做连续碰撞检测（见 collision.py），滚动再快也不会穿过障碍物。
+        candidates 是 snapshot 记下的 [(障碍物, 起点矩形)]，给出时从那时起算移动过程
+        （player_prev_rect 也是那时的矩形），不给时只算这一步。
+        """
+        if player_prev_rect is None:
+            return any(obstacle.rect.colliderect(player_rect)
+                       for obstacle in query_rect(self.obstacles, player_rect, self.max_width))
+        if candidates is None:
+            # 障碍物这一步向左移动了 shift，往左多查这么远才不会漏掉已经穿过玩家的
+            sweep = player_rect.union(player_prev_rect)
+            candidates = ((obstacle, obstacle.prev_rect())
+                          for obstacle in query_span(self.obstacles, sweep.left - sweep_reach(self.shift),
+                                                     sweep.right, self.max_width))
+        for obstacle, obstacle_prev in candidates:
+            if swept_hit(player_prev_rect, player_rect, obstacle_prev, obstacle.rect):
                 return True
         return False
 
+    def snapshot(self, left, right):
+        """横向和 [left, right) 重叠的障碍物和它们当前矩形的副本 [(障碍物, 矩形), ...]"""
+        return [(obstacle, obstacle.rect.copy())
+                for obstacle in query_span(self.obstacles, left, right, self.max_width)]
+
     def get_all_obstacle_rects(self):
         """获取所有活动障碍物的矩形"""
         return [obstacle.rect for obstacle in self.obstacles]
 
     def clear(self):
         """清除所有障碍物"""
+        if not self.entity_store:
+            obstacle_pool.release_all(self.obstacles)
         self.obstacles.clear()
@@ -0,0 +1,187 @@
+# particles.py
+"""粒子系统
+
+粒子按“数组结构”存放在固定容量的 NumPy 数组里（位置、速度、透明度、尺寸、颜色各一列），
+每帧的移动和淡出一次性对整列计算，不再逐个处理字典。
+
+绘制时透明度按 ALPHA_BUCKETS 档取整，圆点贴图按 (尺寸, 颜色, 透明度档) 预先生成并缓存，
+所有粒子用一次 blits 画完。
+
+星星拖尾、金币收集、受击、怪物死亡都通过同一个共享实例 particle_system 发射粒子。
+"""
+import math
+import random
+
+import numpy as np
+import pygame
+
+PARTICLE_CAPACITY = 1024
+ALPHA_BUCKETS = 16
+
+# 星星拖尾的颜色
+STAR_COLORS = [
+    (255, 255, 0),  # 黄色
+    (255, 200, 0),  # 橙色
+    (255, 255, 200),  # 淡黄色
+    (255, 100, 100),  # 淡红色
+    (100, 255, 255)  # 青色
+]
+COIN_COLORS = [(255, 215, 0), (255, 255, 150)]
+HIT_COLORS = [(255, 255, 255), (255, 80, 80)]
+
+
+class ParticleSpriteCache:
+    """圆点贴图缓存：每种 (尺寸, 颜色, 透明度档) 只画一次"""
+
+    def __init__(self, buckets=ALPHA_BUCKETS):
+        self.buckets = buckets
+        self.sprites = {}
+
+    def get(self, size, color, bucket):
+        key = (size, color, bucket)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            alpha = (bucket + 1) * 255 // self.buckets
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (size, size), size)
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+class ParticleSystem:
+    """固定容量的粒子池，超出容量的新粒子直接丢弃"""
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.alpha = np.zeros(capacity, dtype=np.float32)
+        self.fade = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)  # palette 中的下标
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.palette = []        # 颜色表
+        self.palette_index = {}  # 颜色 -> 下标
+        self.sprite_cache = ParticleSpriteCache()
+        self.dropped = 0  # 因容量已满而丢弃的粒子数
+        self.last_dt = 1.0  # 最近一步的 dt，绘制插值用
+
+    @property
+    def count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def _color_index(self, color):
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
+
+    def emit(self, x, y, vx, vy, size, color, alpha=255, fade=5, gravity=0.0):
+        """发射一批粒子；每个参数可以是单个值，也可以是与粒子数等长的列表（颜色是元组，多种颜色用列表）"""
+        n = max(len(v) if isinstance(v, (list, np.ndarray)) else 1 for v in (x, y, vx, vy, size, color, fade))
+        slots = np.flatnonzero(~self.alive)[:n]
+        if len(slots) < n:
+            self.dropped += n - len(slots)
+        if not len(slots):
+            return
+
+        count = len(slots)
+
+        def column(value):
+            if isinstance(value, (list, np.ndarray)):
+                return np.asarray(value)[:count]
+            return value
+
+        self.x[slots] = column(x)
+        self.y[slots] = column(y)
+        self.vx[slots] = column(vx)
+        self.vy[slots] = column(vy)
+        self.size[slots] = column(size)
+        self.alpha[slots] = alpha
+        self.fade[slots] = column(fade)
+        self.gravity[slots] = gravity
+        if isinstance(color, list):
+            self.color[slots] = [self._color_index(c) for c in color[:count]]
+        else:
+            self.color[slots] = self._color_index(color)
+        self.alive[slots] = True
+
+    # ==================== 常用发射器 ====================
+    def emit_star_trail(self, rect, rng=random):
+        """星星拖尾：在玩家身后生成一颗向左飘的星星"""
+        self.emit(rect.x - 20, rect.y + rng.randint(-10, 40),
+                  -rng.uniform(1.0, 3.0), 0.0, rng.randint(3, 8), rng.choice(STAR_COLORS))
+
+    def emit_burst(self, center, count, colors, speed, size, fade, gravity=0.0, rng=random):
+        """向四周炸开的一团粒子"""
+        vx, vy, sizes, burst_colors = [], [], [], []
+        for i in range(count):
+            angle = (i + rng.random()) * 2 * math.pi / count
+            velocity = rng.uniform(*speed)
+            vx.append(math.cos(angle) * velocity)
+            vy.append(math.sin(angle) * velocity)
+            sizes.append(rng.randint(*size))
+            burst_colors.append(rng.choice(colors))
+        x = [center[0] - s for s in sizes]
+        y = [center[1] - s for s in sizes]
+        self.emit(x, y, vx, vy, sizes, burst_colors, fade=fade, gravity=gravity)
+
+    def emit_coin_pickup(self, center, rng=random):
+        self.emit_burst(center, 8, COIN_COLORS, (1.5, 3.0), (2, 4), 12, rng=rng)
+
+    def emit_hit(self, center, rng=random):
+        self.emit_burst(center, 6, HIT_COLORS, (2.0, 4.0), (2, 3), 20, rng=rng)
+
+    def emit_monster_death(self, center, color, rng=random):
+        self.emit_burst(center, 16, [color, (255, 255, 255)], (1.0, 4.0), (3, 6), 8, gravity=0.15, rng=rng)
+
+    # ==================== 更新与绘制 ====================
+    def update(self, dt=1.0):
+        """整列推进一步：移动、重力、淡出，透明度归零的粒子回收
+
+        容量固定且不大，空槽位也一起算，比先按 alive 筛选更快。
+        """
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.vy += self.gravity * dt
+        self.alpha -= self.fade * dt
+        self.alive &= self.alpha > 0
+        self.last_dt = dt
+
+    def draw(self, screen, alpha=1.0):
+        """绘制所有粒子；alpha < 1 时按速度往回退到上一步和当前位置之间"""
+        indices = np.flatnonzero(self.alive)
+        if not len(indices):
+            return
+        rewind = (1.0 - alpha) * self.last_dt
+        xs = self.x[indices] - self.vx[indices] * rewind
+        ys = self.y[indices] - self.vy[indices] * rewind
+        buckets = np.minimum(self.alpha[indices] * ALPHA_BUCKETS // 256, ALPHA_BUCKETS - 1).astype(np.int16)
+        get_sprite = self.sprite_cache.get
+        palette = self.palette
+        screen.blits([
+            (get_sprite(size, palette[color], bucket), (x, y))
+            for x, y, size, color, bucket in zip(
+                xs.astype(np.int32).tolist(),
+                ys.astype(np.int32).tolist(),
+                self.size[indices].tolist(),
+                self.color[indices].tolist(),
+                buckets.tolist(),
+            )
+        ], False)
+
+    def clear(self):
+        self.alive[:] = False
+
+
+# 全局共享的粒子系统
+particle_system = ParticleSystem()
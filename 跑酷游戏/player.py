@@ -1,23 +1,27 @@
 import pygame
 import os
-import glob
+
+from anim_curves import INVINCIBLE_HIDDEN
+from asset_manager import asset_manager
+from timestep import lerp
 
 
 class Player:
     def __init__(self, x, y, can_double_jump=False, player_id=1, image_folder=None, shoot_image_path=None):
         # 基本属性
         self.rect = pygame.Rect(x, y, 50, 50)
+        # 浮点纵坐标和上一步的纵坐标（绘制时插值）
+        self.y = self.prev_y = float(y)
 
         # 图像相关属性 - 使用静态图片
+        # 贴图在绘制端第一次用到时才加载（load_sprites），无界面的 World 不读图片
+        self.image_folder = image_folder
+        self.shoot_image_path = shoot_image_path
+        self.sprites_loaded = False
         self.static_frame = None    # 静态帧（动物封面）
         self.shoot_frame = None     # 射击动作帧
         self.shoot_timer = 0        # 射击计时器
         self.force_shoot_pose = False
-        
-        # 加载静态图片
-        self.load_static_image(player_id, image_folder)
-        # 加载射击图片（可选）
-        self.load_shoot_image(player_id, shoot_image_path)
 
         # 物理属性
         self.velocity_y = 0
@@ -43,12 +47,16 @@ class Player:
         self.is_jumping = False
         self.last_update_time = pygame.time.get_ticks()
 
-        print(f"角色{player_id}加载完成，使用静态图片")
-        
+    def load_sprites(self):
+        """加载静态图片和射击图片（只加载一次）"""
+        if self.sprites_loaded:
+            return
+        self.load_static_image(self.player_id, self.image_folder)
+        self.load_shoot_image(self.player_id, self.shoot_image_path)
+        self.sprites_loaded = True
+
     def load_static_image(self, player_id, folder_path):
         """加载静态图片，确保一定能加载到"""
-        print(f"开始加载角色{player_id}的图片，文件夹: {folder_path}")
-        
         # 根据角色ID确定图片文件名
         if player_id == 1:
             target_files = ['nick.png', 'fox.png', 'animal1.png', 'player1.png', 'frame1.png']
@@ -56,64 +64,48 @@ class Player:
             target_files = ['judy.png', 'rabbit.png', 'animal2.png', 'player2.png', 'frame1.png']
         
         # 先尝试从指定文件夹加载
-        if folder_path and os.path.exists(folder_path):
-            print(f"检查文件夹: {folder_path}")
+        if folder_path and asset_manager.exists(folder_path):
             # 检查文件夹内的所有文件
-            all_files = os.listdir(folder_path)
-            print(f"文件夹内容: {all_files}")
+            all_files = asset_manager.listdir(folder_path)
             
             for filename in target_files:
                 file_path = os.path.join(folder_path, filename)
-                if os.path.exists(file_path):
+                if filename in all_files:
                     try:
-                        print(f"尝试加载: {file_path}")
-                        img = pygame.image.load(file_path).convert_alpha()
-                        img = pygame.transform.scale(img, (50, 50))
-                        self.static_frame = img
-                        print(f"成功加载角色{player_id}图片: {filename}")
+                        self.static_frame = asset_manager.load(file_path, (50, 50))
                         return
                     except Exception as e:
                         print(f"加载失败 {filename}: {e}")
                         continue
         
         # 如果指定文件夹失败，尝试从gif文件夹加载
-        print("尝试从gif文件夹加载...")
         gif_folder = 'gif'
-        if os.path.exists(gif_folder):
+        gif_files = asset_manager.listdir(gif_folder)
+        if gif_files:
             for filename in target_files:
                 file_path = os.path.join(gif_folder, filename)
-                if os.path.exists(file_path):
+                if filename in gif_files:
                     try:
-                        print(f"尝试从gif加载: {file_path}")
-                        img = pygame.image.load(file_path).convert_alpha()
-                        img = pygame.transform.scale(img, (50, 50))
-                        self.static_frame = img
-                        print(f"成功从gif加载角色{player_id}图片: {filename}")
+                        self.static_frame = asset_manager.load(file_path, (50, 50))
                         return
                     except Exception as e:
                         print(f"从gif加载失败 {filename}: {e}")
                         continue
         
         # 如果都没有，尝试加载文件夹中的第一个图片
-        if folder_path and os.path.exists(folder_path):
-            print(f"尝试加载文件夹中的第一个图片: {folder_path}")
+        if folder_path and asset_manager.exists(folder_path):
             # 支持的图片格式
             image_extensions = ['*.png', '*.jpg', '*.jpeg', '*.bmp', '*.gif']
             image_files = []
             
             for ext in image_extensions:
-                pattern = os.path.join(folder_path, ext)
-                found_files = glob.glob(pattern)
+                found_files = asset_manager.glob(folder_path, ext)
                 image_files.extend(found_files)
             
             if image_files:
                 image_files.sort()
                 try:
-                    print(f"尝试加载第一个文件: {image_files[0]}")
-                    img = pygame.image.load(image_files[0]).convert_alpha()
-                    img = pygame.transform.scale(img, (50, 50))
-                    self.static_frame = img
-                    print(f"成功加载第一个图片: {os.path.basename(image_files[0])}")
+                    self.static_frame = asset_manager.load(image_files[0], (50, 50))
                     return
                 except Exception as e:
                     print(f"加载第一个图片失败: {e}")
@@ -124,11 +116,9 @@ class Player:
     
     def load_shoot_image(self, player_id, shoot_image_path):
         """加载射击图片（可选）"""
-        if shoot_image_path and os.path.exists(shoot_image_path):
+        if shoot_image_path and asset_manager.exists(shoot_image_path):
             try:
-                self.shoot_frame = pygame.image.load(shoot_image_path).convert_alpha()
-                self.shoot_frame = pygame.transform.scale(self.shoot_frame, (50, 50))
-                print(f"成功加载射击图片: {shoot_image_path}")
+                self.shoot_frame = asset_manager.load(shoot_image_path, (50, 50))
                 return
             except Exception as e:
                 print(f"加载射击图片失败: {e}")
@@ -136,7 +126,6 @@ class Player:
         # 如果射击图片未能加载，改为使用静态图片以保持一致外观
         if self.static_frame is not None:
             self.shoot_frame = self.static_frame
-            print("使用静态图片作为射击图片")
         else:
             # 如果静态图片也不存在，创建默认射击图片
             print("未提供射击图片，且静态图片不存在，创建默认射击图片")
@@ -167,7 +156,6 @@ class Player:
         
     def create_custom_animal_image(self, player_id):
         """创建自定义动物图片"""
-        print(f"为角色{player_id}创建自定义动物图片")
         image = pygame.Surface((50, 50), pygame.SRCALPHA)
         
         if player_id == 1:
@@ -213,7 +201,6 @@ class Player:
             # 尾巴
             pygame.draw.circle(image, (255, 200, 220), (40, 30), 5)
         
-        print("自定义动物图片创建完成")
         return image
 
     def jump(self):
@@ -231,56 +218,66 @@ class Player:
             return True
         return False
 
-    def update(self):
-        """更新玩家状态"""
+    def update(self, dt=1.0):
+        """更新玩家状态（dt 以 60 帧/秒的一帧为单位）"""
         # 更新射击计时器
         if self.shoot_timer > 0:
-            self.shoot_timer -= 1
+            self.shoot_timer -= dt
             
         # 应用重力
-        self.velocity_y += 0.5  # 重力加速度
+        self.velocity_y += 0.5 * dt  # 重力加速度
 
-        # 更新位置
-        self.rect.y += self.velocity_y
+        # 更新位置：按匀加速运动积分，dt 小于一帧时每帧结束的位置和原来逐帧计算的完全相同
+        # （原来是先加速度再移动一整帧，多出的 0.25 * dt * (1 - dt) 补上这个差别，dt = 1 时为 0）
+        self.prev_y = self.y
+        self.y += self.velocity_y * dt + 0.25 * dt * (1 - dt)
 
         # 检测是否到达地面 (y=400)
-        if self.rect.bottom >= 400:
-            self.rect.bottom = 400
+        if self.y + self.rect.height >= 400:
+            self.y = 400 - self.rect.height
             self.velocity_y = 0
             self.on_ground = True
             self.is_jumping = False
             self.jump_count = 0  # 重置跳跃次数
+        self.rect.y = round(self.y)
 
         if self.buff_timer > 0:
-            self.buff_timer -= 1
+            self.buff_timer -= dt
             if self.buff_timer <= 0:
                 self.is_invincible = False
                 self.speed_multiplier = 1.0
 
+    def prev_rect(self):
+        """上一步的矩形（连续碰撞检测用，见 collision.py）"""
+        return self.rect.move(0, round(self.prev_y) - self.rect.y)
+
     def reset_position(self, x, y):
         """重置玩家位置"""
         self.rect.x = x
         self.rect.y = y
+        self.y = self.prev_y = float(y)
         self.velocity_y = 0
         self.on_ground = True
         self.is_jumping = False
         self.jump_count = 0
 
-    def draw(self, screen):
-        """绘制玩家"""
+    def draw(self, screen, alpha=1.0):
+        """绘制玩家（按 alpha 在上一步和当前位置之间插值）"""
+        self.load_sprites()
         # 如果无敌状态，添加闪烁效果
-        if self.is_invincible and self.buff_timer % 10 < 5:
+        if self.is_invincible and INVINCIBLE_HIDDEN.sample(self.buff_timer):
             return  # 闪烁时不绘制
-            
+
+        draw_rect = self.rect.move(0, round(lerp(self.prev_y, self.y, alpha)) - self.rect.y)
         # 如果正在射击，绘制射击图片
         if (self.force_shoot_pose or self.shoot_timer > 0) and self.shoot_frame:
-            screen.blit(self.shoot_frame, self.rect)
+            screen.blit(self.shoot_frame, draw_rect)
         # 否则绘制静态动物图片
         elif self.static_frame:
-            screen.blit(self.static_frame, self.rect)
+            screen.blit(self.static_frame, draw_rect)
         else:
             # 如果静态图片不存在，绘制一个简单的矩形作为备份
-            pygame.draw.rect(screen, (255, 0, 0) if self.player_id == 1 else (0, 255, 0), self.rect)
+            pygame.draw.rect(screen, (255, 0, 0) if self.player_id == 1 else (0, 255, 0), draw_rect)
 
     def trigger_shooting_pose(self, duration=10):
         """在指定时间内切换到射击动作"""
@@ -0,0 +1,63 @@
+# pool.py
+"""实体对象池
+
+障碍物、金币、子弹生成得很频繁（按住 F 每 12 帧就是一颗子弹），每次都新建对象和 pygame.Rect，
+玩得越久分配和回收的对象越多。对象池把过期的实体收回来，下次生成时用 reset(...) 原地重新初始化
+（连同它的 Rect），不再分配新对象。
+
+实体类要提供 reset(...)，参数和 __init__ 相同；池用 cls(*args) 新建，用 obj.reset(*args) 复用。
+实体过期（从管理器里去掉）后调用 release 还回池里，之后不能再使用它。
+长时间运行时各个池的统计见 benchmarks/bench_pool_churn.py。
+"""
+
+
+class ObjectPool:
+    def __init__(self, cls, max_free=256):
+        self.cls = cls
+        self.max_free = max_free  # 池里最多留多少个空闲对象，多出的交给 GC
+        self.free = []
+
+        # 统计
+        self.created = 0   # 新建的对象数
+        self.reused = 0    # 从池里复用的次数
+        self.released = 0  # 还回池里的次数（包括超过 max_free 被丢弃的）
+
+    def acquire(self, *args, **kwargs):
+        """取一个对象：有空闲的就原地重置后复用，否则新建"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj):
+        self.released += 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def release_all(self, objs):
+        for obj in objs:
+            self.release(obj)
+
+    @property
+    def in_use(self):
+        """取出后还没还回来的对象数"""
+        return self.created + self.reused - self.released
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "in_use": self.in_use,
+            "free": len(self.free),
+        }
+
+    def clear(self):
+        """丢掉池里的空闲对象（交给 GC）
+
+        统计不清零：池是所有 World 共用的，取出去还没还回来的对象之后照常 release，
+        清零的话 in_use 会变成负数。
+        """
+        self.free.clear()
@@ -0,0 +1,75 @@
+# render_queue.py
+"""分层渲染队列
+
+实体管理器不再逐个调用 screen.blit，而是把 (surface, dest[, area]) 放进队列，
+flush 时按层从低到高、层内按提交顺序用 Surface.blits 一次提交。
+图集的子 Surface 会换成 (图集页, 位置, 区域)，同一层的贴图共享一张源图。
+血条之类的图形绘制用 push_draw 提交回调，同样按顺序执行。
+"""
+
+# 绘制层（数字小的先画）
+LAYER_OBSTACLES = 10
+LAYER_COINS = 20
+LAYER_ENEMIES = 30
+LAYER_BULLETS = 40
+
+
+class RenderQueue:
+    def __init__(self):
+        self.layers = {}  # 层 -> [blit 元组 或 回调函数]
+
+        # 统计（最近一次 flush）
+        self.blit_count = 0
+        self.batch_count = 0
+
+    def push(self, layer, surface, dest, area=None):
+        """提交一次 blit"""
+        parent = surface.get_parent()
+        if parent is not None:
+            # 子 Surface（例如图集中的贴图）换成对源图的区域 blit
+            offset_x, offset_y = surface.get_abs_offset()
+            if area is None:
+                area = (offset_x, offset_y, surface.get_width(), surface.get_height())
+            else:
+                area = (area[0] + offset_x, area[1] + offset_y, area[2], area[3])
+            surface = surface.get_abs_parent()
+
+        entries = self.layers.get(layer)
+        if entries is None:
+            entries = self.layers[layer] = []
+        if area is None:
+            entries.append((surface, dest))
+        else:
+            entries.append((surface, dest, area))
+
+    def push_draw(self, layer, draw_fn):
+        """提交一个绘制回调 draw_fn(screen)，与 blit 保持先后顺序"""
+        entries = self.layers.get(layer)
+        if entries is None:
+            entries = self.layers[layer] = []
+        entries.append(draw_fn)
+
+    def flush(self, screen):
+        """按层绘制并清空队列"""
+        self.blit_count = 0
+        self.batch_count = 0
+        for layer in sorted(self.layers):
+            batch = []
+            for entry in self.layers[layer]:
+                if callable(entry):
+                    self._submit(screen, batch)
+                    batch = []
+                    entry(screen)
+                else:
+                    batch.append(entry)
+            self._submit(screen, batch)
+        self.layers.clear()
+
+    def _submit(self, screen, batch):
+        if batch:
+            screen.blits(batch, doreturn=False)
+            self.blit_count += len(batch)
+            self.batch_count += 1
+
+    def clear(self):
+        self.layers.clear()
@@ -0,0 +1,293 @@
+# replay.py
+"""录像：记录每一步的输入，重放出同样的一局
+
+World 的结果只取决于开局参数、随机种子和每一步的输入（见 world.py），
+所以录像只需要存这几样，不存任何画面或位置。
+
+文件格式（小端）：
+- 文件头：魔数 b"PKRP"、版本(u8)、步频(u16)、种子(u64)、角色(u8)、开关位(u8)、生命上限(u16)、总步数(u32)
+- 输入：一串 (连续步数 varint, 输入位 u8)，输入不变的步合并成一段。
+  跑酷时大部分步什么都不按，一局几万步通常只有几 KB。
+
+输入位：INPUT_JUMP 跳跃、INPUT_SHOOT 射击、INPUT_PAUSE 这一步之前暂停过（只作记录，不影响模拟）。
+
+用法：
+- 游戏里每局自动录到 replays/last_run.rpl
+- python main.py --replay replays/last_run.rpl   按正常速度在窗口里重放
+- python replay.py replays/last_run.rpl          无界面快进到底，打印结果和速度，
+  有校验和文件（.sum，见 checksum.py）时逐步对比，报告第一次不一致的步数和子系统
+- python replay.py replays/last_run.rpl --write-sum  用当前代码重新生成校验和（有意改了玩法之后）
+- python replay.py replays/last_run.rpl --entity-store  用数组存储（见 entity_store.py）重放，校验和应该不变
+"""
+import os
+import struct
+import sys
+import time
+
+from checksum import ChecksumLog, checksum_path
+from timestep import BASE_TICK_RATE, SIM_TICK_RATE
+from world import TickInput, World
+
+REPLAY_MAGIC = b"PKRP"
+REPLAY_VERSION = 1
+REPLAY_DIR = "replays"
+LAST_RUN_PATH = os.path.join(REPLAY_DIR, "last_run.rpl")
+
+# 魔数、版本、步频、种子、角色、开关位、生命上限、总步数
+HEADER = struct.Struct("<4sBHQBBHI")
+
+INPUT_JUMP = 1
+INPUT_SHOOT = 2
+INPUT_PAUSE = 4
+
+# 开关位里的开局参数（按位的顺序）
+FLAG_NAMES = ("can_double_jump", "extra_life", "coin_double", "star_effect")
+
+
+def encode_varint(value, out):
+    """无符号整数写成 LEB128：每字节 7 位，最高位表示后面还有"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    """从 data[pos] 读一个 varint，返回 (值, 下一个位置)"""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def input_bits(tick_input, paused=False):
+    bits = 0
+    if tick_input.jump:
+        bits |= INPUT_JUMP
+    if tick_input.shoot:
+        bits |= INPUT_SHOOT
+    if paused:
+        bits |= INPUT_PAUSE
+    return bits
+
+
+class Replay:
+    """一局录像：开局参数 + 按段存的输入"""
+
+    def __init__(self, seed, tick_rate=SIM_TICK_RATE, character_id=1, max_health=100, **flags):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.character_id = character_id
+        self.max_health = max_health
+        self.flags = {name: bool(flags.get(name, False)) for name in FLAG_NAMES}
+        self.runs = []  # [[连续步数, 输入位], ...]
+        self.ticks = 0
+
+    @property
+    def dt(self):
+        return BASE_TICK_RATE / self.tick_rate
+
+    def world_config(self):
+        """重建 World 需要的开局参数"""
+        return dict(character_id=self.character_id, max_health=self.max_health,
+                    seed=self.seed, **self.flags)
+
+    def make_world(self, **kwargs):
+        """按录像的开局参数新建一局（kwargs 传图片文件夹、打怪贴图等不影响模拟的参数）"""
+        return World(**self.world_config(), **kwargs)
+
+    def append(self, bits):
+        if self.runs and self.runs[-1][1] == bits:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, bits])
+        self.ticks += 1
+
+    def iter_bits(self):
+        for count, bits in self.runs:
+            for _ in range(count):
+                yield bits
+
+    # ==================== 读写 ====================
+    def to_bytes(self):
+        flag_bits = sum(1 << i for i, name in enumerate(FLAG_NAMES) if self.flags[name])
+        out = bytearray(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.tick_rate, self.seed,
+                                    self.character_id, flag_bits, self.max_health, self.ticks))
+        for count, bits in self.runs:
+            encode_varint(count, out)
+            out.append(bits)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("录像文件不完整")
+        magic, version, tick_rate, seed, character_id, flag_bits, max_health, ticks = \
+            HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("不是录像文件")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"不支持的录像版本: {version}")
+
+        flags = {name: bool(flag_bits & (1 << i)) for i, name in enumerate(FLAG_NAMES)}
+        replay = cls(seed, tick_rate, character_id, max_health, **flags)
+        pos = HEADER.size
+        while pos < len(data):
+            count, pos = decode_varint(data, pos)
+            replay.runs.append([count, data[pos]])
+            replay.ticks += count
+            pos += 1
+        if replay.ticks != ticks:
+            raise ValueError(f"录像步数不符: 文件头 {ticks}，实际 {replay.ticks}")
+        return replay
+
+    def save(self, path=LAST_RUN_PATH):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """边玩边录：每步模拟前调用 record，模拟后调用 record_state"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.checksums = ChecksumLog()
+        self.pause_pending = False
+
+    def mark_pause(self):
+        """暂停过一次，记在下一步的输入上"""
+        self.pause_pending = True
+
+    def record(self, tick_input):
+        self.replay.append(input_bits(tick_input, self.pause_pending))
+        self.pause_pending = False
+
+    def record_state(self, world):
+        self.checksums.append(world)
+
+    def save(self, path=LAST_RUN_PATH):
+        """录像和校验和一起保存"""
+        self.replay.save(path)
+        self.checksums.save(checksum_path(path))
+
+
+class ReplayPlayer:
+    """按录像的输入推进 World
+
+    给了 expected（录像时的校验和）就每步记录校验和，结束后用 divergence() 对比。
+    """
+
+    def __init__(self, replay, world=None, expected=None):
+        self.replay = replay
+        self.world = world if world is not None else replay.make_world()
+        self.bits = replay.iter_bits()
+        self.done = False
+        self.expected = expected
+        self.checksums = ChecksumLog() if expected is not None else None
+
+    def next_input(self):
+        """下一步的输入，录像放完时返回 None"""
+        bits = next(self.bits, None)
+        if bits is None:
+            self.done = True
+            return None
+        return TickInput(jump=bool(bits & INPUT_JUMP), shoot=bool(bits & INPUT_SHOOT))
+
+    def record_state(self):
+        if self.checksums is not None:
+            self.checksums.append(self.world)
+
+    def step(self):
+        """推进一步，返回本步的事件；录像放完时返回 None"""
+        tick_input = self.next_input()
+        if tick_input is None:
+            return None
+        events = self.world.step(tick_input, self.replay.dt)
+        self.record_state()
+        return events
+
+    def divergence(self):
+        """和录像时的校验和对比，返回 (步数, [子系统]) ；一致或没有校验和时返回 None"""
+        if self.checksums is None:
+            return None
+        return self.checksums.first_divergence(self.expected)
+
+    def report(self):
+        """一句话的对比结果"""
+        if self.checksums is None:
+            return "没有校验和，未校验"
+        divergence = self.divergence()
+        if divergence is None:
+            return f"校验通过：{len(self.checksums)} 步全部一致"
+        tick, subsystems = divergence
+        return f"第 {tick} 步开始不一致：{', '.join(subsystems)}"
+
+    def fast_forward(self, max_ticks=None):
+        """不画图，尽快推进到录像结束（或 max_ticks 步），返回推进的步数"""
+        world = self.world
+        dt = self.replay.dt
+        checksums = self.checksums
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            tick_input = self.next_input()
+            if tick_input is None:
+                break
+            world.step(tick_input, dt)
+            if checksums is not None:
+                checksums.append(world)
+            ticks += 1
+        return ticks
+
+
+def main(argv):
+    args = [arg for arg in argv[1:] if not arg.startswith("--")]
+    write_sum = "--write-sum" in argv
+    entity_store = "--entity-store" in argv
+    path = args[0] if args else LAST_RUN_PATH
+    # 资源路径都相对于游戏目录
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    replay = Replay.load(path)
+    print(f"录像: {path}  种子 {replay.seed}  {replay.tick_rate} Hz  "
+          f"{replay.ticks} 步 / {len(replay.runs)} 段  {len(replay.to_bytes())} 字节")
+
+    sum_path = checksum_path(path)
+    expected = None
+    if write_sum:
+        expected = ChecksumLog()  # 只用来让 ReplayPlayer 记录校验和
+    elif os.path.exists(sum_path):
+        expected = ChecksumLog.load(sum_path)
+
+    player = ReplayPlayer(replay, world=replay.make_world(entity_store=entity_store), expected=expected)
+    start = time.perf_counter()
+    ticks = player.fast_forward()
+    elapsed = time.perf_counter() - start
+
+    world = player.world
+    print(f"结果: 第 {world.tick} 步 {world.state}  分数 {int(world.score)}  "
+          f"金币 {world.current_game_coins}  生命 {world.player_health}")
+    print(f"快进: {ticks} 步 {elapsed:.2f} 秒（{ticks / max(elapsed, 1e-9):,.0f} 步/秒，"
+          f"{ticks * replay.dt / BASE_TICK_RATE / max(elapsed, 1e-9):,.0f} 倍速）")
+
+    if write_sum:
+        player.checksums.save(sum_path)
+        print(f"已写入校验和: {sum_path}")
+    else:
+        print(player.report())
+        if player.divergence() is not None:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
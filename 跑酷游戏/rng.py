@@ -0,0 +1,24 @@
+# rng.py
+"""按子系统划分的随机数流
+
+一局游戏只有一个种子，每个子系统（障碍物、金币、敌人、星星特效……）从它派生出自己的
+random.Random。各子系统互不干扰：某个子系统多取或少取一次随机数，不会改变其他子系统的序列，
+同一个种子总能重放出同样的生成顺序。
+"""
+import random
+
+
+class RngStreams:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        self.streams = {}
+
+    def stream(self, name):
+        """获取子系统 name 的随机数流（同名返回同一个）"""
+        rng = self.streams.get(name)
+        if rng is None:
+            # 字符串种子按内容哈希，不受 PYTHONHASHSEED 影响
+            rng = self.streams[name] = random.Random(f"{self.seed}:{name}")
+        return rng
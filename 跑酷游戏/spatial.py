@@ -0,0 +1,78 @@
+# spatial.py
+"""按横坐标有序的碰撞查询
+
+障碍物、金币、绵羊都从屏幕右边生成，以同样的速度向左滚动，所以各自的列表本来就按
+rect.left 从小到大排好了。查询一个横向区间时，二分找到可能重叠的那一段，
+只检查这一段里的实体：O(log n + k)，不再每步把整个列表扫一遍。
+
+- max_width：列表里实体宽度的上限。只靠 rect.left 有序，要往左多看 max_width 才不会漏掉
+  左边伸进区间的实体。
+- slack：列表顺序允许偏离的像素数。有些实体会暂时脱离队列（比如正在播收集动画的金币停止
+  滚动），只要每个实体的 rect.left 和一个有序序列相差不超过 slack，查询结果仍然完整。
+
+查询结果是候选：可能多出几个不重叠的实体（调用方反正要逐个做精确的碰撞判断），但不会漏。
+列表很短时两次二分比直接扫描还慢（见 benchmarks/bench_collision_queries.py），
+不超过 LINEAR_SCAN_MAX 个实体时直接返回列表本身，不复制也不筛选。
+
+数组存储（entity_store.EntityStore）自己提供 overlapping，一次向量化比较出结果，不走二分。
+
+drop_expired 去掉过期的实体，同时保持这个顺序。
+"""
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+_rect_left = attrgetter("rect.left")
+
+# 最常用的判断：is_active 为 True 的实体留下
+is_active = attrgetter("is_active")
+
+# 不在列表开头的过期实体不超过这个数量时逐个删除，否则一遍重建（见 benchmarks/bench_entity_expiry.py）
+REMOVE_EACH_MAX = 4
+
+# 不超过这个数量时不二分，直接返回整个列表（每种实体 32 个左右时二分才开始比扫描快，见 benchmarks/bench_collision_queries.py）
+LINEAR_SCAN_MAX = 32
+
+
+def candidates(entities, left, right, max_width, slack=0):
+    """二分出可能和 [left, right) 重叠的一段（切片，可能多出几个，不会漏）"""
+    # 二分命中的两侧元素都比较过，乱序最多造成 2 * slack 的误差
+    start = bisect_right(entities, left - max_width - 2 * slack, key=_rect_left)
+    end = bisect_left(entities, right + 2 * slack, key=_rect_left, lo=start)
+    return entities[start:end]
+
+
+def drop_expired(entities, expired, alive):
+    """从列表里原地去掉过期的实体 expired，留下的保持原来的顺序
+
+    滚出屏幕的总是最早生成的那些，先把列表开头的一次截掉；剩下在中间的（被吃掉、打死的）
+    只有几个时逐个删除，多了就按 alive(实体) 一遍重建（见 benchmarks/bench_entity_expiry.py）。
+    """
+    head = 0
+    end = min(len(expired), len(entities))
+    while head < end and entities[head] is expired[head]:
+        head += 1
+    rest = len(expired) - head
+    if rest > REMOVE_EACH_MAX:
+        entities[:] = filter(alive, entities)
+        return
+    del entities[:head]
+    for entity in expired[head:]:
+        entities.remove(entity)
+
+
+def query_span(entities, left, right, max_width, slack=0):
+    """rect 横向可能和 [left, right) 重叠的实体（候选），保持列表原来的顺序"""
+    if isinstance(entities, list):
+        if len(entities) <= LINEAR_SCAN_MAX:
+            return entities
+        return candidates(entities, left, right, max_width, slack)
+    return entities.overlapping(left, right)
+
+
+def query_rect(entities, rect, max_width, slack=0):
+    """rect 可能和给定矩形相交的实体（候选），保持列表原来的顺序"""
+    if isinstance(entities, list):
+        if len(entities) <= LINEAR_SCAN_MAX:
+            return entities
+        return candidates(entities, rect.left, rect.right, max_width, slack)
+    return entities.overlapping(rect.left, rect.right, rect.top, rect.bottom)
@@ -0,0 +1,163 @@
+# texture_atlas.py
+"""纹理图集
+
+把小贴图按 atlas_manifest.json 的清单打包到一张（或几张）大 Surface 上，
+各模块拿到的是图集的子 Surface，绘制时都共享同一张源图，可以用 Surface.blits 批量提交。
+
+清单格式::
+
+    {
+      "page_size": [512, 512],   # 每页图集的尺寸
+      "padding": 1,              # 贴图之间的间隔
+      "sprites": [
+        {"name": "ob1", "path": "image/ob1.png", "size": [90, 90]},
+        ...
+      ]
+    }
+
+素材变化后修改清单即可，游戏启动时会按清单重新打包。
+清单里的文件不存在或无法解码时直接报错（列出所有有问题的路径），不会悄悄少打包一张。
+也可以运行 ``python texture_atlas.py`` 检查清单并把打包结果保存成图片。
+"""
+import json
+import os
+import sys
+
+import pygame
+
+ATLAS_MANIFEST = 'atlas_manifest.json'
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class TextureAtlas:
+    def __init__(self, page_size=(512, 512), padding=1):
+        self.page_size = tuple(page_size)
+        self.padding = padding
+        self.pages = []       # 图集页 Surface
+        self.regions = {}     # name -> (页序号, Rect)
+        self.lookup = {}      # (绝对路径, 尺寸) -> name
+        self.subsurfaces = {}
+
+    @classmethod
+    def from_manifest(cls, manifest_path=ATLAS_MANIFEST, loader=None):
+        """读取清单并打包；loader(path, size) 返回缩放好的 Surface，默认用资源管理器解码
+
+        有素材读不出来时抛出 FileNotFoundError。
+        """
+        if loader is None:
+            from asset_manager import asset_manager
+            loader = asset_manager.decode
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        atlas = cls(manifest.get("page_size", (512, 512)), manifest.get("padding", 1))
+        items = []
+        missing = []
+        for entry in manifest["sprites"]:
+            size = tuple(entry["size"])
+            try:
+                surface = loader(entry["path"], size)
+            except (pygame.error, OSError):
+                missing.append(entry["path"])
+                continue
+            items.append((entry["name"], entry["path"], size, surface))
+        if missing:
+            raise FileNotFoundError(f"图集清单 {manifest_path} 中的素材无法读取: {', '.join(missing)}")
+        atlas.pack(items)
+        return atlas
+
+    def pack(self, items):
+        """货架算法打包：按高度从高到低排成一行行，放不下就换行/换页"""
+        items = sorted(items, key=lambda item: item[3].get_height(), reverse=True)
+        placements = []  # (name, 页序号, Rect, surface)
+        page_count = 0
+        current_page = -1
+        shelf_x = shelf_y = shelf_height = 0
+        page_w, page_h = self.page_size
+        pad = self.padding
+
+        for name, path, size, surface in items:
+            w, h = surface.get_size()
+            if current_page >= 0 and shelf_x + w > page_w:
+                # 当前行放不下，换一行
+                shelf_x = 0
+                shelf_y += shelf_height + pad
+                shelf_height = 0
+            if current_page < 0 or shelf_y + h > page_h:
+                # 当前页放不下，换一页（比一页还大的贴图会单独占一页）
+                current_page = page_count
+                page_count += 1
+                shelf_x = shelf_y = shelf_height = 0
+            placements.append((name, path, size, current_page, pygame.Rect(shelf_x, shelf_y, w, h), surface))
+            shelf_x += w + pad
+            shelf_height = max(shelf_height, h)
+
+        # 按实际占用创建页面
+        page_sizes = [[1, 1] for _ in range(page_count)]
+        for _, _, _, page, rect, _ in placements:
+            page_sizes[page][0] = max(page_sizes[page][0], rect.right)
+            page_sizes[page][1] = max(page_sizes[page][1], rect.bottom)
+
+        self.pages = []
+        for size in page_sizes:
+            page = pygame.Surface(size, pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+            self.pages.append(page)
+
+        for name, path, size, page, rect, surface in placements:
+            # 直接复制像素（包括透明度），不做混合
+            self.pages[page].blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self.regions[name] = (page, rect)
+            self.lookup[(_path_key(path), size)] = name
+        self.subsurfaces.clear()
+
+    def get(self, name):
+        """按名字获取贴图（图集页的子 Surface）"""
+        surface = self.subsurfaces.get(name)
+        if surface is None:
+            page, rect = self.regions[name]
+            surface = self.pages[page].subsurface(rect)
+            self.subsurfaces[name] = surface
+        return surface
+
+    def find(self, path, size):
+        """按 (路径, 尺寸) 查找贴图，不在图集中时返回 None"""
+        name = self.lookup.get((_path_key(path), size))
+        return self.get(name) if name is not None else None
+
+    def blit_args(self, name, dest):
+        """返回 Surface.blits 需要的 (源图, 位置, 区域)"""
+        page, rect = self.regions[name]
+        return self.pages[page], dest, rect
+
+    def save(self, out_dir):
+        """把图集页和布局保存到目录，方便检查打包结果"""
+        os.makedirs(out_dir, exist_ok=True)
+        layout = {}
+        for i, page in enumerate(self.pages):
+            pygame.image.save(page, os.path.join(out_dir, f"atlas_{i}.png"))
+        for name, (page, rect) in self.regions.items():
+            layout[name] = {"page": page, "rect": [rect.x, rect.y, rect.w, rect.h]}
+        with open(os.path.join(out_dir, "atlas_layout.json"), 'w', encoding='utf-8') as f:
+            json.dump(layout, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    # 用法: python texture_atlas.py [清单路径] [输出目录]
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    manifest_path = sys.argv[1] if len(sys.argv) > 1 else ATLAS_MANIFEST
+    atlas = TextureAtlas.from_manifest(manifest_path)
+    for i, page in enumerate(atlas.pages):
+        print(f"第{i + 1}页: {page.get_width()}x{page.get_height()}")
+    print(f"共打包 {len(atlas.regions)} 张贴图")
+    if len(sys.argv) > 2:
+        atlas.save(sys.argv[2])
+        print(f"已保存到 {sys.argv[2]}")
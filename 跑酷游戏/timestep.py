@@ -0,0 +1,74 @@
+# timestep.py
+"""固定步长模拟
+
+游戏里的速度和计时器都是按 60 帧/秒调的（每帧滚动 8 像素、射击冷却 12 帧……）。
+模拟改为按 SIM_TICK_RATE 的固定步长推进，每一步的 dt 以“60 帧/秒的一帧”为单位：
+120Hz 时 dt = 0.5，各处按 速度 * dt 累加，手感和原来一致，也不再受渲染帧率影响。
+
+模拟时间也按帧计：一步覆盖 [t, t + dt)，步长小于一帧时几步才凑成一帧。
+移动每步都做；原来每帧一次的事情也还是每帧一次，和步频无关：
+- 计时器、生成实体、射击在“开始一帧”的那一步做（frames_started），
+  新实体随后跟着这一帧剩下的步移动，帧结束时的位置和 60 帧/秒时相同
+- 受伤、攻击、分数这些判定在“结束一帧”的那一步做（frames_ended），看的是帧结束时的状态
+同样的种子和输入（输入落在帧的第一步）在不同步频下每帧结束时的状态相同，
+结果也相同（见 benchmarks/bench_tick_rates.py）。
+
+渲染和模拟分开：每帧把经过的真实时间放进累加器，够走几步就走几步，
+剩下不足一步的部分作为插值系数 alpha，实体在 上一步位置 -> 当前位置 之间插值绘制。
+"""
+import math
+
+# 原有参数对应的帧率
+BASE_TICK_RATE = 60
+# 模拟步频
+SIM_TICK_RATE = 120
+# 每步的 dt（单位：60 帧/秒的一帧）
+TICK_DT = BASE_TICK_RATE / SIM_TICK_RATE
+# 比较模拟时间和帧边界时的容差（dt 不是 2 的负幂时累加有舍入误差）
+TIME_EPSILON = 1e-9
+# 一帧最多追赶的步数，卡顿太久时丢掉多出的时间，避免越追越慢
+MAX_TICKS_PER_FRAME = 8
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate=SIM_TICK_RATE, max_ticks=MAX_TICKS_PER_FRAME):
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+        self.dt = BASE_TICK_RATE / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0  # 还没有模拟的时间（毫秒）
+        self.ticks = 0          # 累计模拟步数
+
+    def advance(self, elapsed_ms):
+        """放入经过的时间，返回这一帧应该模拟的步数"""
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.tick_ms)
+        if steps > self.max_ticks:
+            steps = self.max_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.tick_ms
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """插值系数：0 表示上一步的位置，1 表示当前位置"""
+        return min(1.0, self.accumulator / self.tick_ms)
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+def frames_started(start, end):
+    """模拟时间从 start 走到 end 时开始了几帧，即 [start, end) 里的帧边界数"""
+    return math.floor(end - TIME_EPSILON) - math.floor(start - TIME_EPSILON)
+
+
+def frames_ended(start, end):
+    """模拟时间从 start 走到 end（单位：60 帧/秒的一帧）时结束了几帧，即 (start, end] 里的帧边界数"""
+    return math.floor(end + TIME_EPSILON) - math.floor(start + TIME_EPSILON)
+
+
+def lerp(start, end, alpha):
+    return start + (end - start) * alpha
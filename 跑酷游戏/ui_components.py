@@ -1,6 +1,9 @@
 # ui_components.py
 import pygame
 
+from asset_manager import asset_manager
+from font_cache import get_font, render_text
+
 
 class Button:
     def __init__(self, x, y, width, height, text, font_size=36):
@@ -19,8 +22,8 @@ class Button:
         pygame.draw.rect(screen, (255, 255, 255), self.rect, 2, border_radius=10)
 
         # 绘制文本
-        font = pygame.font.Font('image/STKAITI.TTF', self.font_size)
-        text_surface = font.render(self.text, True, self.text_color)
+        font = get_font(self.font_size)
+        text_surface = render_text(font, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -42,8 +45,8 @@ class TextInput:
         self.text = ""
         self.max_length = max_length
         self.active = False
-        self.font = pygame.font.Font('image/STKAITI.TTF', 32)
-        self.prompt_font = pygame.font.Font('image/STKAITI.TTF', 36)
+        self.font = get_font(32)
+        self.prompt_font = get_font(36)
         self.cursor_visible = True
         self.cursor_timer = 0
 
@@ -51,7 +54,7 @@ class TextInput:
         """绘制文本输入框"""
         # 绘制提示文字
         if self.prompt:
-            prompt_surface = self.prompt_font.render(self.prompt, True, (255, 255, 255))
+            prompt_surface = render_text(self.prompt_font, self.prompt, (255, 255, 255))
             screen.blit(prompt_surface, (self.rect.centerx - prompt_surface.get_width() // 2, self.rect.y - 50))
 
         # 绘制输入框背景和边框
@@ -64,7 +67,7 @@ class TextInput:
         if self.active and self.cursor_visible:
             text_display += "|"
 
-        text_surface = self.font.render(text_display, True, (255, 255, 255))
+        text_surface = render_text(self.font, text_display, (255, 255, 255))
         screen.blit(text_surface, (self.rect.x + 10, self.rect.centery - text_surface.get_height() // 2))
 
     def update(self, events):
@@ -103,13 +106,7 @@ class CharacterCard:
         self.selected = False
 
         # 加载角色图片
-        self.image = None
-        if image_path:
-            try:
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (80, 80))
-            except:
-                self.image = None
+        self.image = asset_manager.try_load(image_path, (80, 80)) if image_path else None
 
         # 如果没有图片，创建颜色方块
         if not self.image:
@@ -119,7 +116,7 @@ class CharacterCard:
         self.normal_color = (80, 80, 120)
         self.selected_color = (120, 120, 180)
         self.border_color = (200, 200, 255)
-        self.font = pygame.font.Font('image/STKAITI.TTF', 28)
+        self.font = get_font(28)
 
     def draw(self, screen):
         """绘制角色卡片"""
@@ -143,8 +140,8 @@ class CharacterCard:
         player_text = f"角色 {self.player_id}"
         type_text = f"({player_type})"
 
-        player_surface = self.font.render(player_text, True, (255, 255, 255))
-        type_surface = self.font.render(type_text, True, (255, 255, 200))
+        player_surface = render_text(self.font, player_text, (255, 255, 255))
+        type_surface = render_text(self.font, type_text, (255, 255, 200))
 
         player_rect = player_surface.get_rect(center=(self.rect.centerx, self.rect.bottom - 40))
         type_rect = type_surface.get_rect(center=(self.rect.centerx, self.rect.bottom - 15))
@@ -0,0 +1,341 @@
+# world.py
+"""跑酷/打怪的模拟核心
+
+World 保存一局游戏的全部玩法状态（玩家、障碍物、金币、敌人、打怪、分数、物品效果），
+每次 step 用一个 TickInput 推进一步。它不读键盘、不画图、不放声音，也不需要显示窗口或声卡，
+可以在无界面的环境里高速模拟（见 benchmarks/bench_world_ticks.py）。
+
+需要表现的事情（粒子、音效、金币飘字、游戏结束存档）以事件的形式放进 events，
+由 Game 在每步之后取走处理：
+- ("coin_pickup", 位置)                  吃到一枚金币
+- ("coins", 数量, 倍数)                  本步吃到的金币合计（已乘倍数）
+- ("hit", 位置)                          受击/命中
+- ("monster_death", 位置, 颜色)          怪物被打死
+- ("battle_start", 阈值) / ("battle_end", 是否胜利)
+- ("game_over",)
+
+所有随机数都来自本局的种子（seed，见 rng.py）：同一个种子加同样的输入序列，
+重跑一局会得到完全一样的生成顺序和结果。
+"""
+from battle_system import BattleMonster, battle_bullet_pool
+from coin import CoinManager
+from collision import sweep_reach, swept_hit
+from enemy import EnemyManager
+from obstacle import ObstacleManager
+from player import Player
+from rng import RngStreams
+from timestep import frames_ended, frames_started
+
+# 跑酷时的滚动速度（60 帧/秒时每帧的像素数）
+SCROLL_SPEED = 8
+
+
+class TickInput:
+    """一步的输入：jump 是这一步按下了跳跃，shoot 是射击键按着"""
+
+    def __init__(self, jump=False, shoot=False):
+        self.jump = jump
+        self.shoot = shoot
+
+
+class World:
+    def __init__(self, character_id=1, can_double_jump=False, image_folder='gif',
+                 extra_life=False, coin_double=False, star_effect=False,
+                 battle_assets=None, max_health=100, seed=None, entity_store=False):
+        self.battle_assets = battle_assets or {}
+
+        # 随机数：一个种子派生出各子系统的随机数流（seed 为 None 时随机取一个）
+        self.rng = RngStreams(seed)
+        self.seed = self.rng.seed
+
+        # 核心对象
+        self.player = Player(100, 250,
+                             can_double_jump=can_double_jump,
+                             player_id=character_id,
+                             image_folder=image_folder,
+                             shoot_image_path="image/player_shoot.png")
+        # entity_store：障碍物、金币、绵羊改用 NumPy 数组存储（见 entity_store.py），结果和默认的对象存储相同
+        self.obstacle_manager = ObstacleManager(rng=self.rng.stream("obstacles"), entity_store=entity_store)
+        self.coin_manager = CoinManager(self.obstacle_manager, rng=self.rng.stream("coins"),
+                                        entity_store=entity_store)
+        self.enemy_manager = EnemyManager(rng=self.rng.stream("enemies"), entity_store=entity_store)
+
+        # 状态：playing / battle / game_over
+        self.state = "playing"
+        self.tick = 0
+        self.time = 0.0  # 模拟时间（单位：60 帧/秒的一帧）
+        self.scroll_speed = SCROLL_SPEED
+        self.events = []
+
+        # 本局数据
+        self.score = 0
+        self.current_game_coins = 0
+        self.max_health = max_health
+        self.player_health = max_health
+        self.hits_taken = 0  # 玩家受击次数（额外生命挡下的也算）
+        # 这一帧开始时玩家和附近障碍物、金币的矩形（帧结束时按整帧的移动检测碰撞）
+        self.frame_start = None
+
+        # 物品效果
+        self.extra_life_active = extra_life
+        self.extra_life_used = False
+        self.coin_double_active = coin_double
+        self.star_effect_active = star_effect
+
+        # 打怪
+        self.battle_thresholds = [1000, 3000, 5000]
+        self.completed_battles = set()
+        self.current_battle_threshold = None
+        self.battle_monster = None
+        self.player_bullets = []
+        self.monster_bullets = []
+        self.player_shoot_cooldown = 0
+        self.monster_fire_interval = 45
+        self.battle_score_reward = 200
+
+    # ==================== 推进 ====================
+    def step(self, tick_input, dt=1.0):
+        """推进一步（dt 以 60 帧/秒的一帧为单位），返回本步产生的事件"""
+        self.events = []
+        if self.state == "game_over":
+            return self.events
+
+        self.tick += 1
+        start = self.time
+        self.time += dt
+        if tick_input.jump:
+            self.player.jump()
+
+        # 这一步开始和结束了几帧（见 timestep.py）：按帧计时的事在帧的第一步做，判定在帧的最后一步做
+        started = frames_started(start, self.time)
+        ended = frames_ended(start, self.time)
+        if self.state == "playing":
+            self.update_playing(tick_input, dt, started, ended)
+        elif self.state == "battle":
+            self.update_battle(tick_input, dt, started, ended)
+
+        # 收集各管理器产生的事件
+        self.events.extend(self.coin_manager.events)
+        self.events.extend(self.enemy_manager.events)
+        self.coin_manager.events.clear()
+        self.enemy_manager.events.clear()
+        return self.events
+
+    def update_playing(self, tick_input, dt, started=1, ended=1):
+        """跑酷的一步；started / ended 是这一步开始 / 结束了几帧"""
+        scroll_speed = self.scroll_speed
+
+        if started:
+            # 玩家射击冷却
+            if self.player_shoot_cooldown > 0:
+                self.player_shoot_cooldown -= started
+            if tick_input.shoot:
+                self.attempt_player_shoot()
+
+            # 生成：障碍物和金币的生成条件看的都是上一帧结束时的位置
+            self.obstacle_manager.tick_spawner(started, self.coin_manager)
+            self.coin_manager.tick_spawner(started)
+            self.enemy_manager.tick_spawner(started)
+
+            # 记下这一帧开始时的矩形。金币和障碍物的碰撞在帧的最后一步按整帧的移动检测，
+            # 和 60 帧/秒时逐帧检测完全一样（帧中间的步不检测，玩家跳跃的弧线不会因步频不同而擦边结果不同）
+            player = self.player.rect
+            reach = sweep_reach(scroll_speed * max(1.0, dt))
+            self.frame_start = (player.copy(),
+                                self.obstacle_manager.snapshot(player.left, player.right + reach),
+                                self.coin_manager.snapshot(player.left, player.right + reach))
+
+        self.player.update(dt)
+        self.obstacle_manager.step(scroll_speed, dt)
+        self.coin_manager.step(scroll_speed, dt)
+        # 绵羊攻击看的是帧结束时的位置
+        player_hit = self.enemy_manager.step(scroll_speed, self.player.rect if ended else None, dt)
+        if not ended:
+            return
+
+        # 检测金币收集
+        coin_multiplier = 2 if self.coin_double_active else 1
+        # 碰撞都按这一帧的整个移动过程检测（见 collision.py），步频低、速度快时也不会穿过去
+        player_start, obstacles_start, coins_start = self.frame_start
+        collected = self.coin_manager.check_collections(self.player.rect, player_prev_rect=player_start,
+                                                        candidates=coins_start)
+        if collected > 0:
+            # 应用金币翻倍效果
+            collected *= coin_multiplier
+            self.current_game_coins += collected
+            self.score += collected * 10
+            self.events.append(("coins", collected, coin_multiplier))
+
+        self.score += 0.1 * ended
+
+        # 检查是否需要进入战斗
+        self.try_trigger_battle()
+        if self.state == "battle":
+            return
+
+        # 检测碰撞：一帧里碰到障碍物扣一次血，步频再高也不会多扣
+        if self.obstacle_manager.check_collisions(self.player.rect, player_start, candidates=obstacles_start):
+            self.hit_player()
+            if self.extra_life_active and not self.extra_life_used:
+                self.extra_life_used = True
+            else:
+                self.apply_damage(1)
+
+        if player_hit:
+            self.hit_player()
+            self.apply_damage(1)
+
+    def update_battle(self, tick_input, dt, started=1, ended=1):
+        """打怪的一步；started / ended 是这一步开始 / 结束了几帧"""
+        if started:
+            # 玩家射击冷却（和跑酷时一样先射击再移动，子弹从这一帧开始时的位置射出）
+            if self.player_shoot_cooldown > 0:
+                self.player_shoot_cooldown -= started
+            if tick_input.shoot:
+                self.attempt_player_shoot()
+
+            # 怪物攻击节奏
+            if self.battle_monster:
+                self.battle_monster.update(started)
+                if self.battle_monster.ready_to_fire():
+                    self.fire_monster_bullet()
+                    self.battle_monster.reset_fire_cooldown(self.monster_fire_interval)
+
+        self.player.update(dt)
+        self.update_bullets(dt)
+        if self.state == "game_over":
+            return
+
+        # 检测怪物是否死亡（帧结束时，跑酷从下一帧开始时恢复）
+        if ended and self.battle_monster and not self.battle_monster.alive:
+            self.events.append(("monster_death", self.battle_monster.rect.center, (200, 80, 200)))
+            self.end_battle(True)
+
+    # ==================== 打怪 ====================
+    def try_trigger_battle(self):
+        """当分数达到阈值时进入打怪状态"""
+        for threshold in self.battle_thresholds:
+            if self.score >= threshold and threshold not in self.completed_battles:
+                self.start_battle(threshold)
+                break
+
+    def start_battle(self, threshold):
+        self.state = "battle"
+        ground_y = 400 - 80  # 与玩家同一地面高度
+        self.battle_monster = BattleMonster(600, ground_y,
+                                            image=self.battle_assets.get("monster"),
+                                            health=20)
+        self.clear_battle_bullets()
+        self.player_shoot_cooldown = 0
+        self.current_battle_threshold = threshold
+        self.player.set_force_shoot_pose(True)
+        self.events.append(("battle_start", threshold))
+
+    def end_battle(self, victory=True):
+        if victory:
+            self.score += self.battle_score_reward
+            if self.current_battle_threshold is not None:
+                self.completed_battles.add(self.current_battle_threshold)
+        self.state = "playing"
+        self.battle_monster = None
+        self.clear_battle_bullets()
+        self.player.set_force_shoot_pose(False)
+        self.events.append(("battle_end", victory))
+
+    def fire_player_bullet(self):
+        bullet = battle_bullet_pool.acquire(
+            self.player.rect.right,
+            self.player.rect.centery - 5,
+            speed=12,
+            direction="right",
+            image=self.battle_assets.get("player_bullet")
+        )
+        self.player_bullets.append(bullet)
+        self.player.trigger_shooting_pose(10)
+
+    def fire_monster_bullet(self):
+        if not self.battle_monster:
+            return
+        bullet = battle_bullet_pool.acquire(
+            self.battle_monster.rect.left - 20,
+            self.battle_monster.rect.centery - 5,
+            speed=8,
+            direction="left",
+            image=self.battle_assets.get("monster_bullet")
+        )
+        self.monster_bullets.append(bullet)
+
+    def attempt_player_shoot(self):
+        """根据当前状态尝试发射玩家子弹"""
+        if self.player_shoot_cooldown > 0:
+            return
+
+        if self.state == "battle":
+            self.fire_player_bullet()
+        elif self.state == "playing":
+            self.enemy_manager.spawn_player_bullet(self.player.rect, self.player.attack_power)
+            self.player.trigger_shooting_pose(10)
+        else:
+            return
+
+        self.player_shoot_cooldown = 12
+
+    def update_bullets(self, dt):
+        """更新战斗子弹并处理碰撞"""
+        # 连续碰撞检测（见 collision.py）：打怪时怪物不动，玩家只上下移动
+        monster = self.battle_monster
+        for bullet in self.player_bullets:
+            bullet.update(dt)
+            if monster and bullet.active and swept_hit(bullet.prev_rect(), bullet.rect, monster.rect, monster.rect,
+                                                       include_start=True):
+                monster.take_hit(bullet.damage)
+                bullet.active = False
+                self.events.append(("hit", bullet.rect.center))
+
+        player_prev = self.player.prev_rect()
+        for bullet in self.monster_bullets:
+            bullet.update(dt)
+            if bullet.active and swept_hit(bullet.prev_rect(), bullet.rect, player_prev, self.player.rect,
+                                           include_start=True):
+                bullet.active = False
+                self.hit_player()
+                self.apply_damage(1)
+
+        self.player_bullets = self.release_inactive(self.player_bullets)
+        self.monster_bullets = self.release_inactive(self.monster_bullets)
+
+    @staticmethod
+    def release_inactive(bullets):
+        """留下还在飞的子弹，其余还回对象池"""
+        alive = []
+        for bullet in bullets:
+            if bullet.active:
+                alive.append(bullet)
+            else:
+                battle_bullet_pool.release(bullet)
+        return alive
+
+    def clear_battle_bullets(self):
+        battle_bullet_pool.release_all(self.player_bullets)
+        battle_bullet_pool.release_all(self.monster_bullets)
+        self.player_bullets.clear()
+        self.monster_bullets.clear()
+
+    def release(self):
+        """一局结束、不再使用这个 World 时调用：把所有实体还回对象池"""
+        self.obstacle_manager.clear()
+        self.coin_manager.clear()
+        self.enemy_manager.reset()
+        self.clear_battle_bullets()
+
+    def hit_player(self):
+        """玩家受击：计数并发出受击事件（扣不扣血由调用方决定）"""
+        self.hits_taken += 1
+        self.events.append(("hit", self.player.rect.center))
+
+    def apply_damage(self, amount):
+        """统一的扣血逻辑"""
+        self.player_health = max(0, self.player_health - amount)
+        if self.player_health <= 0 and self.state != "game_over":
+            self.state = "game_over"
+            self.events.append(("game_over",))